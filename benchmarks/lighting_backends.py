@@ -0,0 +1,64 @@
+"""
+Compares the pygame and NumPy lightmap backends (output and timing).
+
+Usage (from the repository root):
+    python -m benchmarks.lighting_backends [--lights 5 60] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import numpy as np
+from engine.core.app import LIGHTING_BACKENDS
+from engine.graphics.camera import Camera
+from engine.graphics.lighting import LightSource, DirectionalLight
+
+WIDTH, HEIGHT = 1280, 720
+FOV = [(0, 0), (8, -3), (9, 6), (-4, 7)]
+
+def build(backend, count, weather):
+    lighting = LIGHTING_BACKENDS[backend](WIDTH, HEIGHT, (20.5, 20.5, 30.5))
+    rng = random.Random(0)
+    for i in range(count):
+        light = LightSource(f"Light{i}", radius=rng.choice([100, 150, 250]),
+                            color=rng.choice([(255, 255, 200), (255, 200, 100), (90, 90, 255)]),
+                            intensity=rng.choice([0.5, 1.0]))
+        light.position.x, light.position.y = rng.uniform(-10, 10), rng.uniform(-10, 10)
+        lighting.add_light(light)
+    lighting.set_directional_light(DirectionalLight(intensity=0.2, color=(255, 240, 220)))
+    lighting.weather_type = weather
+    return lighting
+
+def run(counts, repeat):
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    camera = Camera()
+    camera.update_viewport(WIDTH, HEIGHT)
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    
+    print(f"{'lights':>6} {'weather':<7} {'fov':<5} " + " ".join(f"{b + ' ms':>10}" for b in LIGHTING_BACKENDS) + f" {'max diff':>9}")
+    for count in counts:
+        for weather in ('CLEAR', 'FOG'):
+            for fov in (None, FOV):
+                times, outputs = [], []
+                for backend in LIGHTING_BACKENDS:
+                    lighting = build(backend, count, weather)
+                    best = float('inf')
+                    for _ in range(repeat):
+                        screen.fill((200, 180, 160))
+                        t = time.perf_counter()
+                        lighting.render(screen, camera, fov)
+                        best = min(best, time.perf_counter() - t)
+                    times.append(best * 1000.0)
+                    outputs.append(pygame.surfarray.array3d(screen).astype(np.int16))
+                diff = max(int(np.abs(outputs[0] - o).max()) for o in outputs)
+                print(f"{count:>6} {weather:<7} {str(fov is not None):<5} " + " ".join(f"{t:>10.2f}" for t in times) + f" {diff:>9}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lights", type=int, nargs="+", default=[5, 60])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    run(args.lights, args.repeat)
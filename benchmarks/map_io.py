@@ -0,0 +1,80 @@
+"""
+Map load/save: JSON (indent=4, as the editor used to write it) vs the binary .map format.
+
+Usage (from the repository root):
+    python -m benchmarks.map_io [--size 500] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from engine.assets.map_format import BinaryMap, write_binary_map
+
+def make_map(size, seed=0):
+    """size x size floor, ~10% cells with walls, ~2% with objects"""
+    rng = random.Random(seed)
+    floors = [111001000, 111001001, 111001010, 121001007, 121001009]
+    blocks, walls = [], {}
+    for y in range(size):
+        for x in range(size):
+            blocks.append({"pos": [x, y, 0], "tile_id": rng.choice(floors)})
+            r = rng.random()
+            if r < 0.1:
+                walls[f"({x}, {y})"] = rng.choice([["NE"], ["NW"], ["NE", "NW"]])
+            elif r < 0.12:
+                blocks.append({"name": f"Box_{x}_{y}", "pos": [x, y, 0], "size_z": 0.6, "color": [120, 80, 50],
+                               "zone_id": 0, "interact_type": "NONE", "tile_id": 322120008, "is_static": True})
+    return {"width": size, "height": size, "blocks": blocks, "walls": walls}
+
+def best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = make_map(args.size)
+    tmp = tempfile.mkdtemp()
+    json_path, map_path = os.path.join(tmp, "map.json"), os.path.join(tmp, "map.map")
+
+    def save_json():
+        with open(json_path, 'w') as f: json.dump(data, f, indent=4)
+    def load_json():
+        with open(json_path) as f: json.load(f)
+    def load_binary():
+        with BinaryMap(map_path) as bmap: bmap.to_dict()
+    def load_chunk():
+        with BinaryMap(map_path) as bmap:
+            bmap.chunk_tiles(3, 3).copy(); bmap.chunk_walls(3, 3).copy(); bmap.chunk_objects(3, 3)
+
+    results = [
+        ("json save (indent=4)", best_of(args.repeat, save_json)),
+        ("json load", best_of(args.repeat, load_json)),
+        ("binary save", best_of(args.repeat, lambda: write_binary_map(map_path, data))),
+        ("binary load (whole map)", best_of(args.repeat, load_binary)),
+        ("binary open + one chunk", best_of(args.repeat, load_chunk)),
+    ]
+    print(f"{args.size}x{args.size} map, {len(data['blocks'])} blocks, {len(data['walls'])} wall cells")
+    print(f"  json   {os.path.getsize(json_path) / 1e6:7.1f} MB")
+    print(f"  binary {os.path.getsize(map_path) / 1e6:7.1f} MB")
+    for name, ms in results:
+        print(f"  {name:<26}{ms:9.1f} ms")
+
+    # Round trip check
+    with BinaryMap(map_path) as bmap:
+        back = bmap.to_dict()
+    key = lambda b: (b["pos"][0], b["pos"][1], b["tile_id"])
+    same = sorted(map(key, back["blocks"])) == sorted(map(key, data["blocks"])) and back["walls"] == data["walls"]
+    print(f"  round trip {'OK' if same else 'MISMATCH'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Headless scene benchmark: frame-time percentiles and per-phase breakdown as JSON.
+
+Boots App under SDL's dummy drivers without networking, builds a synthetic scene
+(N blocks, M AI NPCs, K lights, a fixed TimeManager phase, a small HUD) and runs a fixed
+number of frames with a scripted camera path and zoom. Scripted mouse and key events are
+posted to the SDL queue and go through App's event path (InputManager, UI, scene); clicks
+on the map emit noise. Frames use a fixed dt, so runs are repeatable for a given seed.
+
+Usage (from the repository root):
+    python -m benchmarks.scene_bench --blocks 10000 --npcs 20 --lights 8 --phase NIGHT --out result.json
+    python -m benchmarks.scene_bench ... --save-baseline baseline.json
+    python -m benchmarks.scene_bench ... --baseline baseline.json [--tolerance 0.1]
+With --baseline the exit status is 1 when a metric regressed beyond the tolerance.
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import numpy as np
+import pygame
+
+from engine.core.app import App
+from engine.core.node import Node
+from engine.core.math_utils import IsoMath
+from engine.core.ai import AdvancedAIComponent
+from engine.graphics.block import Block3D
+from engine.graphics.lighting import LightSource, DirectionalLight
+from engine.physics.collision import CollisionWorld
+from engine.physics.navigation import NavigationManager
+from engine.ui.gui import Control, Panel, Label, Button
+from game.scripts.entity import GameEntity
+
+PERCENTILES = (50, 90, 95, 99)
+
+class BenchScene(Node):
+    """Synthetic scene: a square floor with random walls, wandering NPCs and scattered lights"""
+    def __init__(self, blocks, npcs, lights, phase, seed, wall_ratio=0.2):
+        super().__init__("BenchScene")
+        self.params = (blocks, npcs, lights, phase, seed, wall_ratio)
+        self.side = max(1, int(math.ceil(math.sqrt(blocks))))
+
+    def _ready(self, services):
+        blocks, npcs, lights, phase, seed, wall_ratio = self.params
+        random.seed(seed)
+        side = self.side
+        self.collision_world = CollisionWorld()
+        services["nav"] = NavigationManager(self.collision_world)
+
+        for i in range(blocks):
+            x, y = i % side, i // side
+            if random.random() < wall_ratio:
+                block = Block3D(f"Wall_{x}_{y}", size_z=random.uniform(0.5, 2.0), color=(100, 100, 110))
+                self.collision_world.add_static(block)
+            else:
+                block = Block3D(f"Tile_{x}_{y}", size_z=0.05, color=(40, 70, 40))
+            block.position.x, block.position.y = x, y
+            self.add_child(block)
+
+        for i in range(npcs):
+            npc = GameEntity(f"NPC_{i}", skin_color=(200, 150, 150), clothes_color=(100, 100, 100))
+            npc.position.x, npc.position.y = random.uniform(0, side), random.uniform(0, side)
+            npc.add_component(AdvancedAIComponent(role="CITIZEN"))
+            self.add_child(npc)
+
+        for i in range(lights):
+            light = LightSource(f"Light_{i}", radius=random.choice([150, 200, 250]), color=(255, 220, 160), intensity=0.6)
+            light.position.x, light.position.y = random.uniform(0, side), random.uniform(0, side)
+            self.add_child(light)
+
+        self.sun = DirectionalLight(name="Sun", intensity=0.05 if phase == 'NIGHT' else 0.6)
+        self.add_child(self.sun)
+        services["lighting"].set_directional_light(self.sun)
+
+        # HUD like the game's: scripted mouse events hover and click the button
+        self.clicks = 0
+        self.hud = Control(0, 0, 1, 1)
+        panel = Panel(10, 10, 220, 70)
+        self.lbl_input = Label("INPUT 0,0", 10, 8, size=18)
+        self.btn = Button("PING", 10, 36, 90, 26, on_click=self._on_click)
+        panel.add_child(self.lbl_input)
+        panel.add_child(self.btn)
+        self.hud.add_child(panel)
+        services["app"].set_ui(self.hud)
+        self.services = services
+
+        # Freeze the requested phase
+        time_manager = services["time"]
+        time_manager.current_phase_idx = time_manager.PHASE_ORDER.index(phase)
+        time_manager.phase_timer = time_manager.PHASES[phase]['duration'] / 2
+        time_manager.current_ambient = time_manager.target_ambient = time_manager.PHASES[phase]['ambient']
+        time_manager.time_scale = 0.0
+
+    def _on_click(self):
+        self.clicks += 1
+
+    def handle_event(self, event):
+        """Map clicks (those the HUD didn't consume) emit noise at the clicked cell"""
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            camera = self.services["renderer"].camera
+            gx, gy = IsoMath.iso_to_cart(*camera.screen_to_world(*event.pos))
+            self.services["interaction"].emit_noise(gx, gy, 10)
+
+    def update(self, dt, services):
+        move = services["input"].get_vector("move_left", "move_right", "move_up", "move_down")
+        self.lbl_input.set_text(f"INPUT {move[0]},{move[1]}")
+
+# Keys held in turn by the input script (one per 30-frame slot)
+SCRIPT_KEYS = (pygame.K_d, pygame.K_s, pygame.K_a, pygame.K_w)
+
+def post_input(app, frame, noise_every):
+    """Posts this frame's synthetic mouse/key events; App._handle_events delivers them"""
+    w, h = app.screen.get_size()
+    # Mouse sweeps across the screen and over the HUD button
+    pos = (int(w / 2 + math.cos(frame * 0.05) * w / 3), int(h / 2 + math.sin(frame * 0.07) * h / 3))
+    if frame % 90 < 10: pos = (60, 58)
+    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+    if noise_every and frame % noise_every == 0:
+        for kind in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+            pygame.event.post(pygame.event.Event(kind, pos=pos, button=1))
+    # Movement keys held for 20 of every 30 frames
+    key = SCRIPT_KEYS[frame // 30 % len(SCRIPT_KEYS)]
+    if frame % 30 == 0:
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+    elif frame % 30 == 20:
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+
+def script_frame(app, scene, frame, frames, zoom_range, noise_every):
+    """Scripted input for one frame: camera circles the map centre, zoom oscillates, mouse/key events"""
+    camera = app.services["renderer"].camera
+    t = frame / max(1, frames)
+    side = scene.side
+    cx = side / 2 + math.cos(t * 2 * math.pi) * side / 4
+    cy = side / 2 + math.sin(t * 2 * math.pi) * side / 4
+    camera.follow(*IsoMath.cart_to_iso(cx, cy), immediate=True)
+    lo, hi = zoom_range
+    camera.zoom = lo + (hi - lo) * (0.5 - 0.5 * math.cos(t * 2 * math.pi))
+    post_input(app, frame, noise_every)
+
+def run(args):
+    app = App(args.width, args.height, "8251Ngine Benchmark", use_network=False,
+              lighting_backend=args.lighting_backend, profile=True)
+    scene = BenchScene(args.blocks, args.npcs, args.lights, args.phase, args.seed)
+    app.set_scene(scene)
+    dt = 1.0 / 60.0
+    profiler = app.profiler
+
+    for frame in range(args.warmup):
+        script_frame(app, scene, frame, args.frames, args.zoom, args.noise_every)
+        app._handle_events()
+        app._update(dt)
+        app._draw()
+
+    profiler.reset(history=args.frames)
+    for frame in range(args.frames):
+        profiler.begin_frame()
+        script_frame(app, scene, frame, args.frames, args.zoom, args.noise_every)
+        with profiler.scope("events"):
+            app._handle_events()
+        app._update(dt)
+        app._draw()
+        profiler.end_frame()
+
+    frame_ms = np.array(profiler.frame_times)
+    result = {
+        'params': {
+            'blocks': args.blocks, 'npcs': args.npcs, 'lights': args.lights, 'phase': args.phase,
+            'frames': args.frames, 'warmup': args.warmup, 'seed': args.seed, 'size': [args.width, args.height],
+            'zoom': list(args.zoom), 'lighting_backend': args.lighting_backend
+        },
+        'environment': {
+            'python': platform.python_version(), 'pygame': pygame.version.ver,
+            'numpy': np.__version__, 'machine': platform.machine(), 'system': platform.system()
+        },
+        'frame_ms': describe(frame_ms),
+        'phases': {name: describe(np.array(samples)) for name, samples in profiler.scopes.items()}
+    }
+    pygame.quit()
+    return result
+
+def describe(samples):
+    stats = {'mean': float(samples.mean()), 'max': float(samples.max())}
+    for p in PERCENTILES:
+        stats[f'p{p}'] = float(np.percentile(samples, p))
+    return stats
+
+def compare(result, baseline, tolerance, min_delta_ms):
+    """
+    Metrics slower than baseline by more than tolerance (relative) and min_delta_ms (absolute).
+    Returns [(metric, baseline ms, current ms)].
+    """
+    regressions = []
+    metrics = [('frame_ms.' + k, baseline['frame_ms'].get(k), result['frame_ms'][k]) for k in ('mean', 'p50', 'p95', 'p99')]
+    for name, stats in result['phases'].items():
+        base = baseline.get('phases', {}).get(name)
+        if base: metrics.append((f'phases.{name}.mean', base['mean'], stats['mean']))
+    for metric, old, new in metrics:
+        if old is None: continue
+        if new - old > min_delta_ms and new > old * (1 + tolerance):
+            regressions.append((metric, old, new))
+    return regressions
+
+def print_report(result):
+    fm = result['frame_ms']
+    print(f"frame ms  mean {fm['mean']:.2f}  p50 {fm['p50']:.2f}  p95 {fm['p95']:.2f}  p99 {fm['p99']:.2f}  max {fm['max']:.2f}")
+    for name, stats in sorted(result['phases'].items(), key=lambda kv: -kv[1]['mean']):
+        print(f"  {name:<18} mean {stats['mean']:7.3f}  p95 {stats['p95']:7.3f}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=2500)
+    parser.add_argument("--npcs", type=int, default=10)
+    parser.add_argument("--lights", type=int, default=4)
+    parser.add_argument("--phase", default="NOON", choices=["DAWN", "MORNING", "NOON", "AFTERNOON", "EVENING", "NIGHT"])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--zoom", type=float, nargs=2, default=(1.0, 1.0), metavar=("MIN", "MAX"))
+    parser.add_argument("--noise-every", type=int, default=60, help="click the map (emitting noise) every N frames (0 = never)")
+    parser.add_argument("--lighting-backend", default="pygame")
+    parser.add_argument("--out", help="write the result JSON here")
+    parser.add_argument("--save-baseline", help="write the result JSON as a baseline")
+    parser.add_argument("--baseline", help="compare against this baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="relative slowdown allowed (default 0.10)")
+    parser.add_argument("--min-delta", type=float, default=0.25, help="absolute slowdown in ms ignored as noise")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    result = run(args)
+    print_report(result)
+    if args.save_baseline:
+        write_json(args.save_baseline, result)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('params') != result['params']:
+            print("[Bench] Warning: baseline was recorded with different parameters")
+        regressions = compare(result, baseline, args.tolerance, args.min_delta)
+        result['regressions'] = [{'metric': m, 'baseline': o, 'current': n} for m, o, n in regressions]
+        for metric, old, new in regressions:
+            print(f"[Bench] REGRESSION {metric}: {old:.3f} -> {new:.3f} ms ({(new / old - 1) * 100:+.1f}%)")
+        if not regressions:
+            print("[Bench] No regressions against baseline")
+
+    if args.out:
+        write_json(args.out, result)
+    return 1 if regressions else 0
+
+def write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+if __name__ == "__main__":
+    sys.exit(main())
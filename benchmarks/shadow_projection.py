@@ -0,0 +1,66 @@
+"""
+Per-node vs batched (NumPy) shadow projection.
+
+Usage (from the repository root):
+    python -m benchmarks.shadow_projection [--counts 1000 10000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+import pygame
+from engine.core.node import Node
+from engine.graphics.camera import Camera
+from engine.graphics.shadow_renderer import ShadowRenderer
+
+class Caster(Node):
+    def __init__(self, x, y, size_z):
+        super().__init__("Caster")
+        self.position.x, self.position.y = x, y
+        self.size_z = size_z
+
+def make_casters(count, seed=0):
+    rng = random.Random(seed)
+    side = int(count ** 0.5) + 1
+    return [Caster(rng.uniform(0, side), rng.uniform(0, side), rng.uniform(0.3, 2.0)) for _ in range(count)]
+
+def best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best * 1000.0
+
+def run(counts, repeat):
+    camera = Camera()
+    camera.update_viewport(1280, 720)
+    surf = pygame.Surface((640, 360), pygame.SRCALPHA)
+    sun = pygame.math.Vector2(-0.5, -0.5)
+    light = pygame.math.Vector3(10, 10, 3.0)
+    
+    print(f"{'casters':>8} {'pass':<12} {'per-node ms':>12} {'batched ms':>11} {'project-only ms':>16} {'speedup':>8}")
+    for count in counts:
+        nodes = make_casters(count)
+        
+        per_node = best_of(repeat, lambda: [ShadowRenderer.draw_directional_shadow(surf, camera, n, sun, 0.5) for n in nodes])
+        batched = best_of(repeat, lambda: ShadowRenderer.draw_directional_shadows(surf, camera, nodes, sun, 0.5))
+        def project_sun():
+            pos, h = ShadowRenderer.gather_casters(nodes)
+            ShadowRenderer.to_screen(ShadowRenderer.project_directional(pos, h, sun), camera, 0.5)
+        project = best_of(repeat, project_sun)
+        print(f"{count:>8} {'directional':<12} {per_node:>12.2f} {batched:>11.2f} {project:>16.2f} {per_node / batched:>7.1f}x")
+        
+        per_node = best_of(repeat, lambda: [ShadowRenderer.draw_shadow_volume(surf, camera, n, light, 0.5) for n in nodes])
+        batched = best_of(repeat, lambda: ShadowRenderer.draw_shadow_volumes(surf, camera, nodes, light, 0.5))
+        def project_volume():
+            pos, h = ShadowRenderer.gather_casters(nodes)
+            ShadowRenderer.to_screen(ShadowRenderer.project_volumes(pos, h, light)[0], camera, 0.5)
+        project = best_of(repeat, project_volume)
+        print(f"{count:>8} {'volume':<12} {per_node:>12.2f} {batched:>11.2f} {project:>16.2f} {per_node / batched:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.counts, args.repeat)
@@ -1,27 +1,134 @@
 import pygame
 import os
+import queue
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from engine.graphics.sprite_cache import SurfaceCache
+from engine.ui.text import TextCache
+
+class AssetPreload:
+    """Progress of one ResourceManager.preload() call (e.g. for a loading screen)"""
+    def __init__(self, total):
+        self.total = total
+        self.loaded = 0
+        self.failed = [] # (kind, key)
+        self.assets = {} # (kind, key): ready object
+
+    @property
+    def progress(self):
+        return (self.loaded + len(self.failed)) / self.total if self.total else 1.0
+
+    @property
+    def done(self):
+        return self.loaded + len(self.failed) >= self.total
 
 class ResourceManager:
-    def __init__(self):
-        self.images = {}
-        self.fonts = {}
+    def __init__(self, audio=None, image_budget=128 * 1024 * 1024):
+        # 오래 쓰지 않은 이미지는 예산을 넘으면 해제됨 (계속 쓸 에셋은 images.pin(filename))
+        self.images = SurfaceCache(image_budget)
+        # 폰트는 UI와 같은 TextCache를 공유 (키: name, size, bold)
+        self.text = TextCache.shared()
+        self.fonts = self.text.fonts
         self.base_path = "assets"
+        self.audio = audio # 사운드 preload 결과를 넣을 AudioManager
+        self._executor = None
+        self._decoded = queue.Queue() # (preload, kind, key, object or None), 워커 스레드가 채움
+        self._fonts = deque() # (preload, key): 메인 스레드에서 update()마다 하나씩 로드
+        self._active = []
 
     def get_image(self, filename):
-        if filename not in self.images:
+        image = self.images.get(filename)
+        if image is None:
             path = os.path.join(self.base_path, "images", filename)
             try:
-                self.images[filename] = pygame.image.load(path).convert_alpha()
+                image = self.images[filename] = pygame.image.load(path).convert_alpha()
             except:
                 print(f"ResourceManager: Failed to load image {path}")
                 return None
-        return self.images[filename]
+        return image
+
+    def get_font(self, name, size, bold=False):
+        return self.text.get_font(name, size, bold)
+
+    def stats(self):
+        return {'images': self.images.stats(), 'fonts': self.fonts.stats()}
 
-    def get_font(self, name, size):
-        key = (name, size)
-        if key not in self.fonts:
+    # --- Background preloading ---
+    def preload(self, manifest, workers=4):
+        """
+        Decodes images and sounds on worker threads so the first get_image/play_sfx doesn't
+        stall a frame; fonts are opened by update() on the main thread, one per call.
+        manifest: {"images": [filename], "fonts": [(name, size[, bold])], "sounds": {name: path}}.
+        Results are handed over by update() (called every frame by App); returns an AssetPreload.
+        """
+        images = [f for f in manifest.get("images", []) if f not in self.images]
+        fonts = [(key[0], key[1], bool(key[2]) if len(key) > 2 else False) for key in manifest.get("fonts", [])]
+        fonts = [key for key in fonts if key not in self.fonts]
+        sounds = manifest.get("sounds", {})
+        sounds = {name: path for name, path in sounds.items() if not (self.audio and name in self.audio.sounds)}
+        job = AssetPreload(len(images) + len(fonts) + len(sounds))
+        if job.done: return job
+
+        self._active.append(job)
+        # 폰트(SDL_ttf/FreeType)는 UI가 같은 라이브러리로 텍스트를 그리는 메인 스레드에서만 엶
+        self._fonts.extend((job, key) for key in fonts)
+        if not images and not sounds: return job
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="AssetLoader")
+        # 이미지/사운드 디코딩은 GIL을 놓으므로 병렬로 진행됨
+        for filename in images:
+            self._executor.submit(self._decode, job, 'image', filename,
+                                  pygame.image.load, os.path.join(self.base_path, "images", filename))
+        for name, path in sounds.items():
+            self._executor.submit(self._decode, job, 'sound', name, pygame.mixer.Sound, path)
+        return job
+
+    def _decode(self, job, kind, key, load, path):
+        try:
+            obj = load(path)
+        except Exception as e:
+            print(f"ResourceManager: Failed to preload {kind} {path}: {e}")
+            obj = None
+        self._decoded.put((job, kind, key, obj))
+
+    def update(self, budget_ms=2.0):
+        """
+        Main thread: opens at most one queued font, then stores decoded assets, running
+        convert_alpha on images until budget_ms is spent (the rest waits for the next frame).
+        Returns the number of assets handed over.
+        """
+        if not self._active: return 0
+        count = 0
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        if self._fonts:
+            # SysFont 조회는 느릴 수 있으므로 프레임당 하나만
+            job, key = self._fonts.popleft()
+            font = self.fonts.get(key)
+            if font is None:
+                font = self.fonts[key] = TextCache.load_font(*key)
+            job.assets[('font', key)] = font
+            job.loaded += 1
+            count += 1
+        has_display = pygame.display.get_surface() is not None
+        while time.perf_counter() < deadline:
             try:
-                self.fonts[key] = pygame.font.SysFont(name, size)
-            except:
-                self.fonts[key] = pygame.font.Font(None, size)
-        return self.fonts[key]
\ No newline at end of file
+                job, kind, key, obj = self._decoded.get_nowait()
+            except queue.Empty:
+                break
+            if obj is None:
+                job.failed.append((kind, key))
+                continue
+            if kind == 'image':
+                if key in self.images:
+                    obj = self.images[key] # 그 사이 get_image가 먼저 로드했으면 그쪽 유지
+                else:
+                    if has_display: obj = obj.convert_alpha()
+                    self.images[key] = obj
+            elif kind == 'sound' and self.audio:
+                obj = self.audio.sounds.setdefault(key, obj)
+            job.assets[(kind, key)] = obj
+            job.loaded += 1
+            count += 1
+        self._active = [job for job in self._active if not job.done]
+        return count
@@ -0,0 +1,258 @@
+"""
+Versioned binary map format (.map), readable through mmap one chunk at a time.
+
+Layout (little-endian):
+    header        HEADER (magic, version, chunk size, map size, chunk grid, section offsets)
+    chunk index   per chunk: (first object, object count) into the object table
+    chunk data    per chunk: chunk_size^2 uint32 floor tile ids, then chunk_size^2 uint8 wall bits
+    objects       OBJECT records, grouped by chunk
+    strings       uint32 count, then (uint16 length, utf-8 bytes) per string
+
+Chunks are stored row-major (cy, cx) at fixed size, so any chunk is found by arithmetic.
+Floor cells keep only their tile id: a floor block's name, size_z and color are not stored
+(floors are drawn from the tile id alone). Floor blocks above z = 0 and every other block go
+to the object table. Cell coordinates must not be negative.
+"""
+import gc
+import json
+import mmap
+import struct
+import numpy as np
+
+MAP_MAGIC = b"8251MAP\0"
+MAP_VERSION = 1
+MAP_CHUNK_SIZE = 16
+
+HEADER = struct.Struct("<8sHHIIIIIQQQQ") # magic, version, chunk, w, h, chunks x/y, objects, index/data/objects/strings offsets
+INDEX = struct.Struct("<II")
+OBJECT = struct.Struct("<4dI4BHII") # x, y, z, size_z (float64), tile id, r, g, b, flags, zone id, name, interact type
+WALL_BITS = {"NE": 1, "NW": 2}
+FLAG_STATIC = 1
+
+def _parse_cell(pos_str):
+    x, y = pos_str.strip("()[]").split(",")
+    return int(x), int(y)
+
+class BinaryMap:
+    """
+    Read-only view of a .map file. Chunk tiles and walls are NumPy views straight
+    into the mapped file; nothing is decoded until it is asked for.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.chunk_size, self.width, self.height, self.chunks_x, self.chunks_y,
+         self.object_count, self._index_offset, self._data_offset, self._objects_offset,
+         self._strings_offset) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAP_MAGIC:
+            raise ValueError(f"{path} is not a binary map")
+        if version != MAP_VERSION:
+            raise ValueError(f"{path}: unsupported map version {version} (expected {MAP_VERSION})")
+        cells = self.chunk_size * self.chunk_size
+        self._chunk_bytes = cells * 5
+        self._strings = None
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def _chunk_offset(self, cx, cy):
+        if not (0 <= cx < self.chunks_x and 0 <= cy < self.chunks_y):
+            raise IndexError(f"chunk {(cx, cy)} outside {self.chunks_x}x{self.chunks_y}")
+        return self._data_offset + (cy * self.chunks_x + cx) * self._chunk_bytes
+
+    def chunk_tiles(self, cx, cy):
+        """(chunk_size, chunk_size) uint32 floor ids indexed [y, x], 0 = empty. A view into the file."""
+        n = self.chunk_size
+        return np.frombuffer(self._mmap, np.uint32, n * n, self._chunk_offset(cx, cy)).reshape(n, n)
+
+    def chunk_walls(self, cx, cy):
+        """(chunk_size, chunk_size) uint8 wall bits (see WALL_BITS) indexed [y, x]"""
+        n = self.chunk_size
+        return np.frombuffer(self._mmap, np.uint8, n * n, self._chunk_offset(cx, cy) + n * n * 4).reshape(n, n)
+
+    def chunk_objects(self, cx, cy):
+        """Block dicts (same keys as the JSON format) of the objects in one chunk"""
+        self._chunk_offset(cx, cy) # bounds check
+        start, count = INDEX.unpack_from(self._mmap, self._index_offset + (cy * self.chunks_x + cx) * INDEX.size)
+        return [self._object(i) for i in range(start, start + count)]
+
+    def tile_at(self, x, y):
+        n = self.chunk_size
+        return int(self.chunk_tiles(x // n, y // n)[y % n, x % n])
+
+    def strings(self):
+        if self._strings is None:
+            buf, pos = self._mmap, self._strings_offset
+            count, = struct.unpack_from("<I", buf, pos)
+            pos += 4
+            strings = []
+            for _ in range(count):
+                length, = struct.unpack_from("<H", buf, pos)
+                strings.append(buf[pos + 2:pos + 2 + length].decode('utf-8'))
+                pos += 2 + length
+            self._strings = strings
+        return self._strings
+
+    def _object(self, i):
+        x, y, z, size_z, tile_id, r, g, b, flags, zone_id, name, interact = \
+            OBJECT.unpack_from(self._mmap, self._objects_offset + i * OBJECT.size)
+        strings = self.strings()
+        return {
+            "name": strings[name], "pos": [x, y, z], "size_z": size_z, "color": [r, g, b],
+            "zone_id": zone_id, "interact_type": strings[interact],
+            "tile_id": tile_id or None, "is_static": bool(flags & FLAG_STATIC)
+        }
+
+    def grids(self):
+        """Whole-map (floor ids, wall bits) arrays indexed [y, x], decoded in one pass"""
+        n = self.chunk_size
+        chunk = np.dtype([('tiles', '<u4', (n, n)), ('walls', 'u1', (n, n))])
+        chunks = np.frombuffer(self._mmap, chunk, self.chunks_x * self.chunks_y, self._data_offset)
+        shape = (self.chunks_y, self.chunks_x, n, n)
+        # (cy, cx, y, x) -> (cy, y, cx, x) -> 전체 격자
+        tiles = chunks['tiles'].reshape(shape).transpose(0, 2, 1, 3).reshape(self.chunks_y * n, self.chunks_x * n)
+        walls = chunks['walls'].reshape(shape).transpose(0, 2, 1, 3).reshape(self.chunks_y * n, self.chunks_x * n)
+        return tiles, walls
+
+    def objects(self):
+        return [self._object(i) for i in range(self.object_count)]
+
+    def to_dict(self):
+        """The whole map in the JSON layout MapLoader returns ({width, height, blocks, walls})"""
+        # 수십만 개의 dict를 만드는 동안 순환 GC가 반복 실행되지 않도록 잠시 끔
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._build_dict()
+        finally:
+            if gc_was_enabled: gc.enable()
+
+    def _build_dict(self):
+        tiles, walls = self.grids()
+        ys, xs = np.nonzero(tiles)
+        blocks = [{"pos": [x, y, 0], "tile_id": tid} for x, y, tid in zip(xs.tolist(), ys.tolist(), tiles[ys, xs].tolist())]
+        blocks.extend(self.objects())
+        ys, xs = np.nonzero(walls)
+        names = {bits: [t for t, bit in WALL_BITS.items() if bits & bit] for bits in range(4)}
+        wall_cells = {f"({x}, {y})": list(names[bits]) for x, y, bits in zip(xs.tolist(), ys.tolist(), walls[ys, xs].tolist())}
+        return {"width": self.width, "height": self.height, "blocks": blocks, "walls": wall_cells}
+
+def write_binary_map(path, data, chunk_size=MAP_CHUNK_SIZE):
+    """
+    Writes a map dict in the JSON layout ({width, height, blocks, walls}) as a .map file.
+    Raises ValueError for blocks or walls at negative cells (they have no chunk to go in).
+    """
+    width, height = int(data.get("width", 0)), int(data.get("height", 0))
+    blocks = data.get("blocks", [])
+    wall_cells = [(_parse_cell(p), types) for p, types in data.get("walls", {}).items()]
+    for block in blocks:
+        if int(block["pos"][0]) < 0 or int(block["pos"][1]) < 0:
+            raise ValueError(f"block at negative cell {block['pos'][:2]} ({block.get('name', block.get('tile_id'))})")
+    for (x, y), _ in wall_cells:
+        if x < 0 or y < 0:
+            raise ValueError(f"wall at negative cell ({x}, {y})")
+    # 맵 크기보다 바깥에 있는 블록/벽도 잃지 않도록 범위를 넓힘
+    if blocks:
+        width = max(width, max(int(b["pos"][0]) for b in blocks) + 1)
+        height = max(height, max(int(b["pos"][1]) for b in blocks) + 1)
+    if wall_cells:
+        width = max(width, max(x for (x, _), _ in wall_cells) + 1)
+        height = max(height, max(y for (_, y), _ in wall_cells) + 1)
+    n = chunk_size
+    chunks_x, chunks_y = -(-width // n), -(-height // n)
+
+    # Floor ids and wall bits over the whole (padded) map, written chunk by chunk below
+    tiles = np.zeros((chunks_y * n, chunks_x * n), np.uint32)
+    walls = np.zeros((chunks_y * n, chunks_x * n), np.uint8)
+    objects = []
+    for block in blocks:
+        tid = block.get("tile_id")
+        pos = block["pos"]
+        x, y = int(pos[0]), int(pos[1])
+        # 셀당 바닥은 하나: 같은 셀의 두 번째 바닥 블록이나 z가 0이 아닌 바닥은 오브젝트로 보관
+        if tid and str(tid)[0] == '1' and not tiles[y, x] and not (len(pos) > 2 and pos[2]):
+            tiles[y, x] = tid
+        else:
+            objects.append(block)
+    for (x, y), wall_types in wall_cells:
+        for t in wall_types:
+            walls[y, x] |= WALL_BITS[t]
+
+    strings, string_ids = [], {}
+    def string_id(s):
+        s = str(s)
+        if s not in string_ids:
+            string_ids[s] = len(strings)
+            strings.append(s)
+        return string_ids[s]
+
+    # Objects grouped by chunk so each chunk's objects are one contiguous run
+    by_chunk = {}
+    for block in objects:
+        key = (int(block["pos"][1]) // n, int(block["pos"][0]) // n)
+        by_chunk.setdefault(key, []).append(block)
+    index = bytearray()
+    records = bytearray()
+    count = 0
+    for cy in range(chunks_y):
+        for cx in range(chunks_x):
+            chunk_objects = by_chunk.get((cy, cx), [])
+            index += INDEX.pack(count, len(chunk_objects))
+            for block in chunk_objects:
+                pos = list(block["pos"]) + [0] * (3 - len(block["pos"]))
+                r, g, b = tuple(block.get("color", (100, 100, 110)))[:3]
+                flags = FLAG_STATIC if block.get("is_static", True) else 0
+                records += OBJECT.pack(pos[0], pos[1], pos[2], block.get("size_z", 0.6), block.get("tile_id") or 0,
+                                       r, g, b, flags, block.get("zone_id", 0),
+                                       string_id(block.get("name", "Object")), string_id(block.get("interact_type", "NONE")))
+            count += len(chunk_objects)
+
+    string_blob = bytearray(struct.pack("<I", len(strings)))
+    for s in strings:
+        raw = s.encode('utf-8')
+        string_blob += struct.pack("<H", len(raw)) + raw
+
+    index_offset = HEADER.size
+    data_offset = index_offset + len(index)
+    objects_offset = data_offset + chunks_x * chunks_y * n * n * 5
+    strings_offset = objects_offset + len(records)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAP_MAGIC, MAP_VERSION, n, width, height, chunks_x, chunks_y, count,
+                            index_offset, data_offset, objects_offset, strings_offset))
+        f.write(index)
+        # (cy, y, cx, x) -> (cy, cx, y, x): 청크별로 연속된 바이트
+        chunk = np.dtype([('tiles', '<u4', (n, n)), ('walls', 'u1', (n, n))])
+        chunks = np.empty(chunks_x * chunks_y, chunk)
+        chunks['tiles'] = tiles.reshape(chunks_y, n, chunks_x, n).transpose(0, 2, 1, 3).reshape(-1, n, n)
+        chunks['walls'] = walls.reshape(chunks_y, n, chunks_x, n).transpose(0, 2, 1, 3).reshape(-1, n, n)
+        f.write(chunks.tobytes())
+        f.write(records)
+        f.write(string_blob)
+
+def convert(src, dst):
+    """JSON -> .map or .map -> JSON, picked from the source extension"""
+    if src.endswith(".map"):
+        with BinaryMap(src) as bmap:
+            data = bmap.to_dict()
+        with open(dst, 'w') as f:
+            json.dump(data, f, indent=4)
+    else:
+        with open(src, 'r') as f:
+            write_binary_map(dst, json.load(f))
+    print(f"[MapFormat] Converted {src} -> {dst}")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert maps between JSON and the binary .map format")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    args = parser.parse_args()
+    convert(args.src, args.dst)
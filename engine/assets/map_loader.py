@@ -1,5 +1,6 @@
 import json
 import os
+from engine.assets.map_format import BinaryMap, write_binary_map
 
 class MapLoader:
     @staticmethod
@@ -11,12 +12,27 @@ class MapLoader:
             print(f"MapLoader: File not found {path}")
             return None
 
-        with open(path, 'r') as f:
-            data = json.load(f)
+        if path.endswith(".map"):
+            # 바이너리 청크 포맷 (engine.assets.map_format)
+            with BinaryMap(path) as bmap:
+                data = bmap.to_dict()
+        else:
+            with open(path, 'r') as f:
+                data = json.load(f)
 
         print(f"MapLoader: Successfully parsed {path}")
         return data
 
+    @staticmethod
+    def save_map_data(path, data):
+        """Writes a map dict: binary for .map paths, compact JSON otherwise"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if path.endswith(".map"):
+            write_binary_map(path, data)
+        else:
+            with open(path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+
     @staticmethod
     def save_map(path, scene, width=20, height=20):
         # 저장 로직은 EditorScene에서 사용하므로 유지
@@ -38,6 +54,4 @@ class MapLoader:
                     "tile_id": child.tile_id
                 })
         
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=4)
+        MapLoader.save_map_data(path, data)
@@ -0,0 +1,208 @@
+import inspect
+import json
+import mmap
+import os
+import threading
+import zlib
+import pygame
+
+ATLAS_VERSION = 2
+DEFAULT_PATH = "engine/data/atlas/tiles" # tiles.rgba (raw pixels) + tiles.json (index)
+ATLAS_WIDTH = 2048
+OBJECT_HEIGHTS = (0.6, 1.0) # Block3D 사물 높이 (맵 기본값 0.6)
+WALL_HEIGHTS = (1.8,) # WallNode 기본 높이
+
+def entry_key(kind, key):
+    """Index key of a baked image: kind is 'tex', 'floor', 'block' or 'wall', key the node's cache key"""
+    return f"{kind}:{key!r}"
+
+def data_signature():
+    """crc32 of everything the baked pixels depend on, generator code included; a stale atlas is ignored"""
+    from engine.assets.tile_engine import TileEngine
+    blob = json.dumps([ATLAS_VERSION, TileEngine.TEXTURE_VARIANTS,
+                       sorted((tid, data['color']) for tid, data in TileEngine.TILE_DATA.items()),
+                       sorted(bake_tile_ids()), _generator_sources()])
+    return zlib.crc32(blob.encode())
+
+def _generator_sources():
+    """Source of the functions that draw baked images, so editing them rebuilds the atlas"""
+    from engine.assets.tile_engine import TileEngine
+    from engine.graphics.geometry import IsoGeometry
+    from engine.graphics.block import Block3D
+    from engine.graphics.wall import WallNode
+    sources = []
+    for func in (TileEngine.texture_variant, TileEngine.create_texture, TileEngine.create_floor_sprite,
+                 TileEngine._generate_texture, TileEngine._blend_stains, IsoGeometry,
+                 Block3D._regen_texture, WallNode._regen_texture):
+        try:
+            sources.append(inspect.getsource(func))
+        except (OSError, TypeError):
+            sources.append(func.__qualname__) # 소스 없이 배포된 경우 (코드 변경은 ATLAS_VERSION으로)
+    return sources
+
+def _load_tileset(path="engine/data/tileset.json"):
+    if not os.path.exists(path): return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def bake_tile_ids():
+    """TILE_DATA ids, tileset.json ids and the open/closed twin of every interactive id"""
+    from engine.assets.tile_engine import TileEngine
+    ids = set(TileEngine.TILE_DATA)
+    for group in _load_tileset().values():
+        ids.update(int(tid) for tid in group)
+    for tid in list(ids):
+        sid = str(tid)
+        # 문 토글 (PxAnicScene._toggle_door): 3xx1xxxxx 의 세 번째 자리 1 <-> 2
+        if len(sid) >= 9 and sid[0] == '3' and sid[3] == '1' and sid[2] in '12':
+            ids.add(int(sid[:2] + ('2' if sid[2] == '1' else '1') + sid[3:]))
+    return ids
+
+class TextureAtlas:
+    """
+    Prebaked tile textures and Block3D/WallNode composites packed into one surface.
+    On disk the pixels are raw RGBA (memory-mapped on load, so pages are read lazily)
+    next to a JSON index of rects. get() returns subsurfaces; treat them as read-only.
+    """
+    _shared = None
+    _shared_loaded = False
+    _shared_lock = threading.Lock() # 메인 스레드와 맵 스트리밍 스레드가 동시에 처음 요청할 수 있음
+
+    def __init__(self, surface, entries, buffer=None):
+        self.surface = surface
+        self.entries = entries # key: (x, y, w, h)
+        self._buffer = buffer # mmap backing the surface pixels
+        self._subsurfaces = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        sub = self._subsurfaces.get(key)
+        if sub is None:
+            rect = self.entries.get(key)
+            if rect is None: return None
+            sub = self._subsurfaces[key] = self.surface.subsurface(rect)
+        return sub
+
+    @staticmethod
+    def shared():
+        """Atlas at DEFAULT_PATH, loaded on first use. None if it was never baked or is stale."""
+        if not TextureAtlas._shared_loaded:
+            with TextureAtlas._shared_lock:
+                if not TextureAtlas._shared_loaded:
+                    TextureAtlas._shared = TextureAtlas.load(DEFAULT_PATH)
+                    TextureAtlas._shared_loaded = True
+        return TextureAtlas._shared
+
+    @staticmethod
+    def set_shared(atlas):
+        """Replaces the shared atlas (None = always generate textures)"""
+        TextureAtlas._shared = atlas
+        TextureAtlas._shared_loaded = True
+
+    @staticmethod
+    def load(path):
+        index_path, pixels_path = path + ".json", path + ".rgba"
+        if not (os.path.exists(index_path) and os.path.exists(pixels_path)):
+            return None
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index.get('version') != ATLAS_VERSION or index.get('signature') != data_signature():
+            print(f"[TextureAtlas] {path} is out of date, re-bake it (python -m engine.assets.texture_atlas)")
+            return None
+        w, h = index['size']
+        with open(pixels_path, 'rb') as f:
+            # ACCESS_COPY: 실수로 그려도 파일은 그대로 (private copy-on-write)
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if len(buffer) != w * h * 4:
+            print(f"[TextureAtlas] {pixels_path} has the wrong size")
+            return None
+        surface = pygame.image.frombuffer(buffer, (w, h), "RGBA")
+        entries = {key: tuple(rect) for key, rect in index['entries'].items()}
+        print(f"[TextureAtlas] Mapped {path} ({w}x{h}, {len(entries)} images)")
+        return TextureAtlas(surface, entries, buffer)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path + ".rgba", 'wb') as f:
+            f.write(pygame.image.tobytes(self.surface, "RGBA"))
+        index = {
+            'version': ATLAS_VERSION, 'signature': data_signature(), 'format': "RGBA",
+            'size': list(self.surface.get_size()),
+            'entries': {key: list(rect) for key, rect in self.entries.items()}
+        }
+        with open(path + ".json", 'w') as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+
+    @staticmethod
+    def pack(images, width=ATLAS_WIDTH):
+        """Shelf-packs {key: surface} (tallest first) into one atlas"""
+        order = sorted(images, key=lambda k: (-images[k].get_height(), k))
+        entries = {}
+        x = y = shelf_h = 0
+        for key in order:
+            w, h = images[key].get_size()
+            if x + w > width:
+                x, y, shelf_h = 0, y + shelf_h, 0
+            entries[key] = (x, y, w, h)
+            x += w
+            shelf_h = max(shelf_h, h)
+        surface = pygame.Surface((width, max(1, y + shelf_h)), pygame.SRCALPHA)
+        surface.blits([(images[key], entries[key][:2]) for key in order], doreturn=False)
+        return TextureAtlas(surface, entries)
+
+def bake_atlas(path=DEFAULT_PATH, object_heights=OBJECT_HEIGHTS, wall_heights=WALL_HEIGHTS, width=ATLAS_WIDTH):
+    """
+    Renders every bakeable tile id the same way the runtime would (texture and floor
+    variants, floor diamond or object cubes, wall faces) and saves the packed atlas to path.
+    """
+    from engine.assets.tile_engine import TileEngine
+    from engine.graphics.block import Block3D, BLOCK_CACHE
+    from engine.graphics.wall import WallNode
+
+    # 이전 아틀라스나 캐시를 재사용하지 않고 새로 생성
+    TextureAtlas.set_shared(None)
+    TileEngine.clear_texture_cache()
+    BLOCK_CACHE.clear()
+    wall_ids = {int(tid) for tid in _load_tileset().get("WALLS", {})}
+
+    images = {}
+    for tid in sorted(bake_tile_ids()):
+        for variant in range(TileEngine.TEXTURE_VARIANTS):
+            images[entry_key('tex', (tid, variant))] = TileEngine.create_texture(tid, variant)
+        category = str(tid)[0]
+        if category == '1':
+            # TileMap 바닥 다이아몬드 (위치별 변형)
+            for variant in range(TileEngine.TEXTURE_VARIANTS):
+                images[entry_key('floor', (tid, variant))] = TileEngine.create_floor_sprite(tid, variant)
+        heights = [0.0] if category == '1' else object_heights
+        for size_z in heights:
+            block = Block3D(tile_id=tid, size_z=size_z)
+            images[entry_key('block', block.texture_key())] = block.cached_surf
+        if category == '2' or tid in wall_ids:
+            for size_z in wall_heights:
+                for wall_type in ("NE", "NW"):
+                    wall = WallNode(tile_id=tid, size_z=size_z, wall_type=wall_type)
+                    images[entry_key('wall', wall.texture_key())] = wall.cached_surf
+
+    atlas = TextureAtlas.pack(images, width)
+    atlas.save(path)
+    w, h = atlas.surface.get_size()
+    print(f"[TextureAtlas] Baked {len(images)} images into {path}.rgba ({w}x{h}, {w * h * 4 / 1e6:.1f} MB)")
+    return atlas
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Bake tile textures and block/wall sprites into a memory-mappable atlas")
+    parser.add_argument("--out", default=DEFAULT_PATH, help="output path without extension")
+    parser.add_argument("--heights", type=float, nargs="+", default=OBJECT_HEIGHTS, help="Block3D object heights to bake")
+    parser.add_argument("--wall-heights", type=float, nargs="+", default=WALL_HEIGHTS)
+    parser.add_argument("--width", type=int, default=ATLAS_WIDTH)
+    args = parser.parse_args()
+    # python -m 로 실행하면 이 파일은 __main__ 이므로, 엔진이 쓰는 모듈 쪽 상태를 사용
+    from engine.assets import texture_atlas
+    texture_atlas.bake_atlas(args.out, tuple(args.heights), tuple(args.wall_heights), args.width)
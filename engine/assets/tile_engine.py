@@ -1,6 +1,12 @@
 import pygame
 import random
 import math
+import threading
+import zlib
+from collections import OrderedDict
+import numpy as np
+from engine.assets.texture_atlas import TextureAtlas, entry_key
+from engine.core.math_utils import TILE_WIDTH, TILE_HEIGHT
 
 class TileEngine:
     # --- PxANIC- Color Constants ---
@@ -134,21 +140,95 @@ class TileEngine:
             return int(sid[4])
         return (tid // 100) % 10
 
+    # 텍스처는 (tid, variant)로 시드되어 실행마다 동일하게 생성되고, 크기 제한 LRU에 보관됩니다.
+    # 구워진 아틀라스(engine.assets.texture_atlas)가 있으면 생성 대신 거기서 가져옵니다.
+    TEXTURE_VARIANTS = 4 # 타일당 변형 수 (바닥 반복 패턴 완화용)
+    texture_cache_size = 512
+    _texture_cache = OrderedDict() # (tid, variant): surface
+    _cache_lock = threading.RLock() # WorldStreamer 워커 스레드도 텍스처를 만듦
+
+    @staticmethod
+    def texture_variant(x, y):
+        """Deterministic variant index for the tile at grid (x, y)"""
+        return ((int(x) * 73856093) ^ (int(y) * 19349663)) % TileEngine.TEXTURE_VARIANTS
+
+    @staticmethod
+    def clear_texture_cache():
+        with TileEngine._cache_lock:
+            TileEngine._texture_cache.clear()
+
+    @staticmethod
+    def create_texture(tid, variant=0):
+        """
+        32x32 texture for tid. Memoized per (tid, variant): the returned surface is shared,
+        so callers must copy it before drawing on it.
+        """
+        with TileEngine._cache_lock:
+            cache = TileEngine._texture_cache
+            key = (tid, variant)
+            surf = cache.get(key)
+            if surf is not None:
+                cache.move_to_end(key)
+                return surf
+            atlas = TextureAtlas.shared()
+            if atlas is not None:
+                surf = atlas.get(entry_key('tex', key))
+            if surf is None:
+                surf = TileEngine._generate_texture(tid, variant)
+            cache[key] = surf
+            if len(cache) > TileEngine.texture_cache_size:
+                cache.popitem(last=False)
+            return surf
+
+    @staticmethod
+    def create_floor_sprite(tid, variant=0):
+        """
+        Flat iso floor diamond (TILE_WIDTH x TILE_HEIGHT) built from the tile texture.
+        Memoized like create_texture; the returned surface is shared.
+        """
+        with TileEngine._cache_lock:
+            cache = TileEngine._texture_cache
+            key = ('floor', tid, variant)
+            surf = cache.get(key)
+            if surf is not None:
+                cache.move_to_end(key)
+                return surf
+            atlas = TextureAtlas.shared()
+            if atlas is not None:
+                surf = atlas.get(entry_key('floor', (tid, variant)))
+            if surf is None:
+                iso_tex = pygame.transform.smoothscale(TileEngine.create_texture(tid, variant), (TILE_WIDTH, TILE_HEIGHT))
+                top_mask = pygame.Surface((TILE_WIDTH, TILE_HEIGHT), pygame.SRCALPHA)
+                points = [(TILE_WIDTH // 2, 0), (TILE_WIDTH, TILE_HEIGHT // 2), (TILE_WIDTH // 2, TILE_HEIGHT), (0, TILE_HEIGHT // 2)]
+                pygame.draw.polygon(top_mask, (255, 255, 255, 255), points)
+                pygame.draw.polygon(top_mask, (0, 0, 0, 60), points, 1)
+                iso_tex.blit(top_mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+                surf = iso_tex
+            cache[key] = surf
+            if len(cache) > TileEngine.texture_cache_size:
+                cache.popitem(last=False)
+            return surf
+
     @staticmethod
-    def create_texture(tid):
+    def _generate_texture(tid, variant):
         s = pygame.Surface((32, 32), pygame.SRCALPHA)
         color = TileEngine.TILE_DATA.get(tid, {}).get('color', (150, 150, 150))
         sid = str(tid)
-        
+        # 전역 random 대신 타일별 시드 (str hash는 실행마다 바뀌므로 crc32 사용)
+        seed = zlib.crc32(f"{sid}:{variant}".encode())
+        rnd = random.Random(seed)
+        rng = np.random.default_rng(seed)
+
         # 기본 배경색 채우기
         s.fill(color)
-        
+
         # 1. 공통적으로 적용되는 거친 노이즈/먼지 효과 (좀보이드의 황폐한 느낌)
-        for _ in range(400): # 노이즈 밀도 증가
-            x, y = random.randint(0, 31), random.randint(0, 31)
-            var = random.randint(-30, 30) # 더 넓은 범위의 변동성
-            c = (max(0, min(255, color[0]+var)), max(0, min(255, color[1]+var)), max(0, min(255, color[2]+var)))
-            s.set_at((x, y), c)
+        #    400개 점을 한 번에 배열로 기록 (겹친 점은 마지막 값이 남음)
+        xs, ys = rng.integers(0, 32, 400), rng.integers(0, 32, 400)
+        var = rng.integers(-30, 31, (400, 1)) # 더 넓은 범위의 변동성
+        pixels = pygame.surfarray.pixels3d(s)
+        pixels[xs, ys] = np.clip(np.array(color[:3]) + var, 0, 255)
+        del pixels
 
         # 2. 타일 카테고리/ID별 상세 패턴
         # 바닥 (Category '1') - 미세한 그리드, 얼룩, 균열
@@ -158,23 +238,18 @@ class TileEngine:
                 pygame.draw.line(s, (0, 0, 0, 20), (i, 0), (i, 31), 1)
                 pygame.draw.line(s, (0, 0, 0, 20), (0, i), (31, i), 1)
             # 더 많은 얼룩과 균열
-            for _ in range(15):
-                lx, ly = random.randint(0, 31), random.randint(0, 31)
-                lw, lh = random.randint(5, 15), random.randint(5, 15)
-                temp_s = pygame.Surface((lw, lh), pygame.SRCALPHA)
-                pygame.draw.ellipse(temp_s, (0, 0, 0, random.randint(30, 80)), (0, 0, lw, lh))
-                s.blit(temp_s, (lx, ly))
+            TileEngine._blend_stains(s, rng, 15)
             # 아스팔트/도로의 균열
             if "Asphalt" in sid or tid == 111001011:
                 for _ in range(5):
-                    p1 = (random.randint(0, 31), random.randint(0, 31))
-                    p2 = (p1[0] + random.randint(-7, 7), p1[1] + random.randint(-7, 7))
+                    p1 = (rnd.randint(0, 31), rnd.randint(0, 31))
+                    p2 = (p1[0] + rnd.randint(-7, 7), p1[1] + rnd.randint(-7, 7))
                     pygame.draw.line(s, (0, 0, 0, 150), p1, p2, 1)
             # 풀밭
             elif "Grass" in sid or tid == 111001001:
                 for _ in range(25):
-                    gx, gy = random.randint(2, 28), random.randint(2, 28)
-                    pygame.draw.line(s, (20, 50, 20, 200), (gx, gy), (gx + random.randint(-1, 1), gy - random.randint(2, 4)), 1)
+                    gx, gy = rnd.randint(2, 28), rnd.randint(2, 28)
+                    pygame.draw.line(s, (20, 50, 20, 200), (gx, gy), (gx + rnd.randint(-1, 1), gy - rnd.randint(2, 4)), 1)
 
         # 벽 (Category '2') - 세로 줄무늬, 거친 질감
         elif sid.startswith('2'):
@@ -193,7 +268,7 @@ class TileEngine:
             # 나무 벽 (Wood Wall, Log Wall...)
             elif "Wood" in sid or "Log" in sid:
                 for x in range(0, 32, 8):
-                    plank_color = tuple(max(0,min(255, c + random.randint(-10,10))) for c in base_color)
+                    plank_color = tuple(max(0,min(255, c + rnd.randint(-10,10))) for c in base_color)
                     pygame.draw.line(s, plank_color, (x, 0), (x, 31), 8)
                     pygame.draw.line(s, dark_color, (x+7, 0), (x+7, 31), 1)
             
@@ -207,7 +282,31 @@ class TileEngine:
             for x in range(0, 32, 8):
                 pygame.draw.line(s, (0, 0, 0, 40), (x, 0), (x, 31), 1)
                 for _ in range(3):
-                    v = random.randint(0, 31)
-                    pygame.draw.line(s, (0, 0, 0, 30), (x + random.randint(1, 3), v), (x + random.randint(1, 3), v + random.randint(5, 15)), 1)
+                    v = rnd.randint(0, 31)
+                    pygame.draw.line(s, (0, 0, 0, 30), (x + rnd.randint(1, 3), v), (x + rnd.randint(1, 3), v + rnd.randint(5, 15)), 1)
         
         return s
+
+    # 32x32 픽셀 중심 좌표 (얼룩 마스크 계산용)
+    _GRID_X, _GRID_Y = np.meshgrid(np.arange(32) + 0.5, np.arange(32) + 0.5, indexing='ij')
+
+    @staticmethod
+    def _blend_stains(s, rng, count):
+        """
+        Dark translucent ellipses alpha-blended onto s, computed as arrays instead of
+        one temporary surface + blit per stain.
+        """
+        lx, ly = rng.integers(0, 32, (2, count, 1, 1))
+        lw, lh = rng.integers(5, 16, (2, count, 1, 1))
+        alpha = rng.integers(30, 81, (count, 1, 1)) / 255.0
+        rx, ry = lw / 2.0, lh / 2.0
+        inside = ((TileEngine._GRID_X - lx - rx) / rx) ** 2 + ((TileEngine._GRID_Y - ly - ry) / ry) ** 2 <= 1.0
+        # 검은색 (0,0,0,a)를 차례로 덮는 것 = 남는 비율의 곱
+        keep = np.prod(np.where(inside, 1.0 - alpha, 1.0), axis=0)
+
+        pixels = pygame.surfarray.pixels3d(s)
+        pixels[...] = pixels * keep[..., None]
+        del pixels
+        alphas = pygame.surfarray.pixels_alpha(s)
+        alphas[...] = 255 - (255 - alphas) * keep
+        del alphas
@@ -0,0 +1,227 @@
+import queue
+import threading
+import time
+from engine.core.node import Node
+from engine.assets.map_format import BinaryMap, WALL_BITS
+from engine.graphics.block import Block3D
+from engine.graphics.wall import WallNode
+
+DEFAULT_WALL_TILE = 212000000 # 기본 벽돌 ID (PxAnicScene과 동일)
+
+class StreamedChunk:
+    """One map chunk decoded by the loader thread, waiting to be attached on the main thread"""
+    __slots__ = ('key', 'root', 'statics', 'objects', 'tiles', 'floor_chunks')
+
+    def __init__(self, key, root=None):
+        self.key = key
+        self.root = root # 이 청크의 Block3D/WallNode를 담는 컨테이너 노드
+        self.statics = [] # 충돌 월드에 넣을 노드
+        self.objects = {} # (gx, gy): Block3D (상호작용용 block_grid)
+        self.tiles = {} # (gx, gy): floor tile id
+        self.floor_chunks = {} # TileMap (cx, cy): prebuilt surface
+
+class WorldStreamer:
+    """
+    Keeps only the part of a binary map (.map) around a focus point in the scene.
+    Chunks within radius of the focus are decoded on a daemon thread into nodes, collision
+    entries and prebuilt TileMap floor chunks; update() attaches finished chunks on the
+    main thread within budget_ms per frame and unloads chunks beyond radius + unload_margin.
+    Chunks marked with mark_modified() keep their nodes when unloaded and are re-attached
+    as they were instead of being decoded from the file again. Call stop() when done.
+    """
+    def __init__(self, path, scene, tile_map, collision_world=None, block_grid=None,
+                 radius=2, unload_margin=1, budget_ms=2.0, wall_tile_id=DEFAULT_WALL_TILE):
+        self.path = path
+        self.scene = scene
+        self.tile_map = tile_map
+        self.collision_world = collision_world
+        self.block_grid = block_grid if block_grid is not None else {}
+        self.radius = radius
+        self.unload_margin = unload_margin
+        self.budget_ms = budget_ms
+        self.wall_tile_id = wall_tile_id
+
+        with BinaryMap(path) as bmap:
+            self.chunk_size = bmap.chunk_size
+            self.chunks_x, self.chunks_y = bmap.chunks_x, bmap.chunks_y
+            self.width, self.height = bmap.width, bmap.height
+        tile_map.width, tile_map.height = self.width, self.height
+        # 맵 청크가 TileMap 청크로 나누어떨어질 때만 바닥 서피스를 미리 만듦 (아니면 보일 때 생성)
+        self._prebuild_floor = self.chunk_size % tile_map.chunk_size == 0
+        # 로드 범위의 바닥 청크가 LRU에서 밀려나 다시 그려지지 않도록
+        span = (2 * (radius + unload_margin) + 1) * max(1, self.chunk_size // tile_map.chunk_size)
+        tile_map.max_chunks = max(tile_map.max_chunks, span * span)
+
+        self.loaded = {} # (cx, cy): StreamedChunk
+        self._modified = set() # 런타임에 바뀐 청크 (파일에서 다시 읽으면 안 됨)
+        self._stashed = {} # (cx, cy): 내려간 수정 청크, 다시 올라올 때 그대로 붙임
+        self._pending = set() # 요청했지만 아직 받지 못한 청크
+        self._wanted = frozenset() # 워커가 오래된 요청을 건너뛰는 데 사용 (통째로 교체만 함)
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name="WorldStreamer", daemon=True)
+        self._thread.start()
+        print(f"[WorldStreamer] Streaming {path} ({self.width}x{self.height}, "
+              f"{self.chunks_x}x{self.chunks_y} chunks, radius {radius})")
+
+    # --- Loader thread ---
+    def _worker(self):
+        bmap = BinaryMap(self.path) # 스레드 전용 매핑
+        try:
+            while True:
+                key = self._requests.get()
+                if key is None: break
+                if key not in self._wanted:
+                    self._results.put(StreamedChunk(key)) # 취소됨: 대기 표시만 해제
+                    continue
+                try:
+                    chunk = self._decode(bmap, key)
+                except Exception as e:
+                    print(f"[WorldStreamer] Failed to decode chunk {key}: {e}")
+                    chunk = StreamedChunk(key)
+                self._results.put(chunk)
+        finally:
+            bmap.close()
+
+    def _decode(self, bmap, key):
+        cx, cy = key
+        n = self.chunk_size
+        x0, y0 = cx * n, cy * n
+        # 트리에 붙기 전이므로 add_child 대신 직접 연결 (워커에서 tree_version을 건드리지 않음)
+        root = Node(f"Chunk_{cx}_{cy}")
+        chunk = StreamedChunk(key, root)
+        def attach(node):
+            node.parent = root
+            root.children.append(node)
+
+        tiles = bmap.chunk_tiles(cx, cy)
+        ys, xs = tiles.nonzero()
+        for x, y, tid in zip(xs.tolist(), ys.tolist(), tiles[ys, xs].tolist()):
+            chunk.tiles[(x0 + x, y0 + y)] = tid
+
+        # 바닥/벽(1xx, 2xx) 이외의 블록만 사물로 생성 (PxAnicScene 전체 로드와 같은 규칙)
+        for b_data in bmap.chunk_objects(cx, cy):
+            if str(b_data.get("tile_id", ""))[0] <= '2': continue
+            node = Block3D(
+                name=b_data.get("name", "Object"), size_z=b_data.get("size_z", 0.6),
+                color=tuple(b_data.get("color", (100, 100, 110))),
+                tile_id=b_data.get("tile_id", None)
+            )
+            node.position.x, node.position.y, node.position.z = b_data["pos"]
+            attach(node)
+            chunk.objects[(int(node.position.x), int(node.position.y))] = node
+            if b_data.get("is_static", True):
+                chunk.statics.append(node)
+
+        walls = bmap.chunk_walls(cx, cy)
+        ys, xs = walls.nonzero()
+        for x, y, bits in zip(xs.tolist(), ys.tolist(), walls[ys, xs].tolist()):
+            for wall_type, bit in WALL_BITS.items():
+                if bits & bit:
+                    wall = WallNode(wall_type=wall_type, tile_id=self.wall_tile_id)
+                    wall.position.x, wall.position.y = x0 + x, y0 + y
+                    attach(wall)
+
+        if self._prebuild_floor and chunk.tiles:
+            m = self.chunk_size // self.tile_map.chunk_size
+            for ty in range(cy * m, cy * m + m):
+                for tx in range(cx * m, cx * m + m):
+                    chunk.floor_chunks[(tx, ty)] = self.tile_map.build_chunk((tx, ty), chunk.tiles)
+        return chunk
+
+    # --- Main thread ---
+    def chunk_of(self, x, y):
+        return int(x) // self.chunk_size, int(y) // self.chunk_size
+
+    def _chunks_around(self, cx, cy, radius):
+        return {(kx, ky)
+                for ky in range(max(0, cy - radius), min(self.chunks_y, cy + radius + 1))
+                for kx in range(max(0, cx - radius), min(self.chunks_x, cx + radius + 1))}
+
+    def update(self, x, y):
+        """
+        Call once per frame with the focus in grid coordinates (player position, or the
+        camera centre through IsoMath.iso_to_cart). Returns the number of chunks attached.
+        """
+        cx, cy = self.chunk_of(x, y)
+        wanted = self._chunks_around(cx, cy, self.radius)
+        keep = self._chunks_around(cx, cy, self.radius + self.unload_margin)
+        self._wanted = frozenset(keep)
+
+        # 가까운 청크부터 요청 (수정된 청크는 보관본을 바로 붙임)
+        missing = [k for k in wanted if k not in self.loaded and k not in self._pending]
+        missing.sort(key=lambda k: max(abs(k[0] - cx), abs(k[1] - cy)))
+        for key in missing:
+            stashed = self._stashed.pop(key, None)
+            if stashed is not None:
+                self._attach(stashed)
+                continue
+            self._pending.add(key)
+            self._requests.put(key)
+
+        for key in [k for k in self.loaded if k not in keep]:
+            self._unload(key)
+
+        # 프레임당 예산 안에서만 붙임 (최소 1개는 처리해서 항상 진행)
+        attached = 0
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        while True:
+            try:
+                chunk = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(chunk.key)
+            if chunk.root is not None and chunk.key in keep and chunk.key not in self.loaded:
+                self._attach(chunk)
+                attached += 1
+            if time.perf_counter() >= deadline: break
+        return attached
+
+    def _attach(self, chunk):
+        self.scene.add_child(chunk.root)
+        if self.collision_world:
+            for node in chunk.statics:
+                self.collision_world.add_static(node)
+        self.block_grid.update(chunk.objects)
+        self.tile_map.add_region(chunk.tiles, chunk.floor_chunks)
+        chunk.floor_chunks = {} # 이후로는 TileMap이 소유 (LRU로 해제될 수 있음)
+        self.loaded[chunk.key] = chunk
+
+    def mark_modified(self, x, y):
+        """Call after changing a streamed node at grid (x, y) at runtime (e.g. a door toggled)"""
+        self._modified.add(self.chunk_of(x, y))
+
+    def _unload(self, key):
+        chunk = self.loaded.pop(key)
+        if self.collision_world:
+            if key in self._modified:
+                # 다시 붙일 때도 지금의 충돌 상태를 따름 (열린 문은 빠진 채로)
+                chunk.statics = [node for node in chunk.objects.values() if self.collision_world.has_static(node)]
+            for node in chunk.statics:
+                self.collision_world.remove_static(node)
+        for pos, node in chunk.objects.items():
+            if self.block_grid.get(pos) is node:
+                del self.block_grid[pos]
+        self.scene.remove_child(chunk.root)
+        n = self.chunk_size
+        self.tile_map.remove_region(key[0] * n, key[1] * n, n, n)
+        if key in self._modified:
+            self._stashed[key] = chunk
+
+    def preload(self, x, y, timeout=5.0):
+        """Blocks until every chunk around (x, y) is attached (e.g. before the first frame)"""
+        end = time.perf_counter() + timeout
+        self.update(x, y)
+        while not self.is_idle() and time.perf_counter() < end:
+            time.sleep(0.001)
+            self.update(x, y)
+
+    def is_idle(self):
+        """True when nothing is requested or waiting to be attached"""
+        return not self._pending and self._results.empty()
+
+    def stop(self, timeout=1.0):
+        """Stops the loader thread and closes its map. Loaded chunks stay in the scene."""
+        self._wanted = frozenset()
+        self._requests.put(None)
+        self._thread.join(timeout)
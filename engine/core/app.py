@@ -6,7 +6,7 @@ import random
 global pygame
 
 from engine.graphics.renderer import Renderer
-from engine.graphics.lighting import LightingManager
+from engine.graphics.lighting import LightingManager, NumpyLightingManager
 from engine.core.time import TimeManager
 from engine.core.input import InputManager
 from engine.net.network import NetworkManager
@@ -16,12 +16,24 @@ from engine.core.interaction import InteractionManager
 from engine.systems.minigame import MinigameManager
 from engine.systems.combat import CombatManager
 from engine.ui.world_ui import WorldPopupManager
+from engine.ui.text import TextCache
+from engine.ui.gui import UICanvas
+from engine.graphics.particles import ParticleSystem
 from engine.physics.navigation import NavigationManager
+from engine.core.node import Node
+from engine.core.profiler import FrameProfiler
+
+# Lightmap compositing backends selectable with App(lighting_backend=...)
+LIGHTING_BACKENDS = {
+    "pygame": LightingManager,
+    "numpy": NumpyLightingManager
+}
 
 class App:
     instance = None
 
-    def __init__(self, width=1280, height=720, title="8251Ngine", use_network=True):
+    def __init__(self, width=1280, height=720, title="8251Ngine", use_network=True, dirty_rects=False, lighting_backend="pygame",
+                 tick_rate=None, max_fps=60, max_ticks_per_frame=5, profile=False):
         App.instance = self
         pygame.init()
         self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
@@ -30,32 +42,84 @@ class App:
         self.running = True
         self.use_network = use_network
         
+        # Per-scope frame timings (F3 toggles the overlay). No-op scopes while disabled.
+        self.profiler = FrameProfiler(enabled=profile)
+        
         # Core Engine Services
+        audio = AudioManager()
         self.services = {
             "input": InputManager(),
             "renderer": Renderer(self.screen),
-            "lighting": LightingManager(width, height),
+            "lighting": LIGHTING_BACKENDS[lighting_backend](width, height),
             "time": TimeManager(),
             "network": NetworkManager("ws://localhost:8765") if use_network else None,
-            "assets": ResourceManager(),
-            "audio": AudioManager(),
+            "assets": ResourceManager(audio),
+            "audio": audio,
             "interaction": InteractionManager(),
             "minigame": MinigameManager(),
             "combat": CombatManager(),
             "popups": WorldPopupManager(),
+            "text": TextCache.shared(),
+            "particles": ParticleSystem(),
             "nav": None,
+            "profiler": self.profiler,
             "app": self
         }
+        self.services["renderer"].profiler = self.profiler
         
         self.ui_root = None
+        self._ui_canvas = None
         self.root = None
         self.fov_polygon = None
+        
+        # Cached scene tree walk, refreshed only when Node.tree_version changes
+        self._tree_version = None
+        self._dynamic_nodes = {} # ordered set of dynamic sprite nodes
+        
+        # Dirty-rect presentation: idle frames are skipped, local changes presented with display.update(rects)
+        self.dirty_rects = dirty_rects
+        self._marked_rects = []
+        self._full_redraw = True
+        self._last_view = None
+        self._last_lighting = None
+        self._last_sprites = {} # node: (screen rect, sprite)
+        self._last_overlay_rects = []
+        self._gizmos = False # Scene root overrides draw_gizmos
+        self._gizmo_rects_known = False # Last draw_gizmos call returned the rects it drew
+        
+        # Fixed-timestep mode (tick_rate Hz): simulation runs in fixed steps, rendering at up to
+        # max_fps (0 = uncapped) interpolates dynamic nodes between the last two ticks
+        self.tick_rate = tick_rate
+        self.max_fps = max_fps
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self._accumulator = 0.0
+        self._prev_positions = {} # node: local position before the last tick
+        self._prev_camera = None # camera position before the last tick
+
+    def mark_dirty(self, rect=None):
+        """Dirty-rect mode: schedules a screen region (or the whole screen if None) for redraw"""
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._marked_rects.append(pygame.Rect(rect))
 
     def set_ui(self, ui_root):
         self.ui_root = ui_root
+        # Retained UI: repainted offscreen only where controls changed, blitted once per frame
+        self._ui_canvas = UICanvas(ui_root) if ui_root else None
+        self.mark_dirty()
 
     def set_scene(self, scene_root):
+        if self.root and self.root is not scene_root:
+            self.root._exit_tree()
         self.root = scene_root
+        self.services["renderer"].clear_static()
+        self._tree_version = None
+        self._prev_positions = {}
+        self._prev_camera = None
+        self._gizmos = scene_root is not None and type(scene_root).draw_gizmos is not Node.draw_gizmos
+        self._gizmo_rects_known = False
+        self.mark_dirty()
         if self.root:
             self.root._ready(self.services)
 
@@ -64,24 +128,36 @@ class App:
             self.services["network"].start()
             
         while self.running:
-            dt = self.clock.tick(60) / 1000.0
-            self._handle_events()
-            self._update(dt)
-            self._draw()
+            if self.tick_rate:
+                self._fixed_step()
+            else:
+                dt = self.clock.tick(self.max_fps) / 1000.0
+                self.profiler.begin_frame()
+                self._handle_events()
+                self._update(dt)
+                self._draw()
+            self.profiler.end_frame()
             
         if self.use_network and self.services["network"]:
             self.services["network"].stop()
+        if self.root: self.root._exit_tree()
+        self.services["renderer"].close()
         pygame.quit()
         sys.exit()
 
     def _handle_events(self):
         for event in pygame.event.get():
+            self.services["input"].handle_event(event)
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.VIDEORESIZE:
                 self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
                 self.services["renderer"]._update_screen(self.screen)
                 self.services["lighting"].update_resolution(event.w, event.h)
+                self.mark_dirty()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+                self.mark_dirty()
             
             # [수정됨] UI가 이벤트를 처리(소비)했으면 Scene으로 전파하지 않음
             if self.ui_root:
@@ -92,20 +168,250 @@ class App:
             if self.root and hasattr(self.root, 'handle_event'):
                 self.root.handle_event(event)
 
+    def _fixed_step(self):
+        """One rendered frame in fixed-timestep mode: zero or more simulation ticks, then an interpolated draw"""
+        step = 1.0 / self.tick_rate
+        frame_dt = self.clock.tick(self.max_fps) / 1000.0
+        self.profiler.begin_frame()
+        # Bounded catch-up after a long frame, so a slow tick can't snowball
+        self._accumulator = min(self._accumulator + frame_dt, step * self.max_ticks_per_frame)
+        self._handle_events()
+        while self._accumulator >= step:
+            self._snapshot_positions()
+            self._update(step)
+            self._accumulator -= step
+        self._draw(self._accumulator / step)
+
+    def _snapshot_positions(self):
+        """Remembers dynamic node positions (and the camera position) before a simulation tick"""
+        self._prev_positions = {node: node.position.copy() for node in self._dynamic_nodes}
+        self._prev_camera = self.services["renderer"].camera.position.copy()
+
+    def _interpolate(self, alpha):
+        """Moves dynamic nodes to prev + (current - prev) * alpha. Returns what _restore needs."""
+        saved = []
+        for node, prev in self._prev_positions.items():
+            current = node.position.copy()
+            saved.append((node.position, current))
+            node.position.update(prev.lerp(current, alpha))
+        camera = self.services["renderer"].camera
+        if self._prev_camera is not None:
+            current = camera.position.copy()
+            saved.append((camera.position, current))
+            camera.position.update(self._prev_camera.lerp(current, alpha))
+        return saved
+
+    def _restore(self, saved):
+        for vector, value in saved:
+            vector.update(value)
+
     def _update(self, dt):
-        self.services["input"].update()
-        self.services["time"].update(dt)
-        self.services["lighting"].ambient_color = self.services["time"].current_ambient
-        self.services["lighting"].update_weather(dt)
-        self.services["interaction"].update()
-        self.services["minigame"].update(dt, self.services)
-        self.services["combat"].update(dt, self.services)
-        self.services["popups"].update(dt)
+        prof = self.profiler
+        with prof.scope("input"):
+            self.services["input"].update()
+        with prof.scope("time"):
+            self.services["time"].update(dt)
+        with prof.scope("lighting"):
+            self.services["lighting"].ambient_color = self.services["time"].current_ambient
+            self.services["lighting"].update_weather(dt)
+        with prof.scope("assets"):
+            # Preloaded assets decoded by worker threads, converted in small per-frame batches
+            self.services["assets"].update()
+        with prof.scope("interaction"):
+            self.services["interaction"].update()
+        with prof.scope("minigame"):
+            self.services["minigame"].update(dt, self.services)
+        with prof.scope("combat"):
+            self.services["combat"].update(dt, self.services)
+        with prof.scope("popups"):
+            self.services["popups"].update(dt)
+        with prof.scope("particles"):
+            self.services["particles"].update(dt)
         
         if self.root:
-            self.root._update(dt, self.services)
+            with prof.scope("scene"):
+                self.root._update(dt, self.services)
+        with prof.scope("camera"):
+            # Camera smoothing steps with the simulation (once per tick in fixed-timestep mode)
+            self.services["renderer"].camera.update(dt)
+
+    def _collect_nodes(self):
+        """Walks the visible scene tree and sorts nodes into static geometry, dynamic sprites, ground layers and lights"""
+        renderer = self.services["renderer"]
+        lighting = self.services["lighting"]
+        static_nodes, dynamic_nodes, lights, ground = [], [], [], []
+        def _walk(node):
+            if not node.visible: return
+            if node.is_static:
+                static_nodes.append(node)
+            elif hasattr(node, 'get_sprite'):
+                dynamic_nodes.append(node)
+            elif hasattr(node, 'draw_ground'):
+                ground.append(node)
+            if hasattr(node, 'get_light_surface'):
+                lights.append(node)
+            for child in node.children: _walk(child)
+        _walk(self.root)
+        
+        renderer.sync_static(static_nodes)
+        renderer.ground_layers = ground
+        # Lights that left the tree (or were hidden) are dropped from the registry
+        lighting.sync_lights(lights)
+        self._dynamic_nodes = dict.fromkeys(dynamic_nodes)
+        self._tree_version = Node.tree_version
+
+    def _sync_tree(self):
+        """Brings the cached walk up to date: replays logged add/removes if that covers every change, else re-walks"""
+        if self._tree_version is not None:
+            changed = [node for version, node in Node.tree_log if version > self._tree_version]
+            if len(changed) == Node.tree_version - self._tree_version:
+                self._apply_tree_changes(changed)
+                return
+        self._collect_nodes()
+
+    def _apply_tree_changes(self, nodes):
+        """
+        Re-classifies only the subtrees of added/removed nodes, so a single add_child/remove_child
+        costs its subtree instead of a walk of the whole scene. Uses each node's current state.
+        """
+        renderer = self.services["renderer"]
+        lighting = self.services["lighting"]
+        for node in dict.fromkeys(nodes):
+            stack = [node]
+            while stack:
+                n = stack.pop()
+                if n.is_static: renderer.remove_static(n)
+                self._dynamic_nodes.pop(n, None)
+                if n in renderer.ground_layers: renderer.ground_layers.remove(n)
+                if hasattr(n, 'get_light_surface'): lighting.remove_light(n)
+                stack.extend(n.children)
+            if self._in_visible_tree(node):
+                self._add_subtree(node)
+        self._tree_version = Node.tree_version
+
+    def _in_visible_tree(self, node):
+        while node is not None:
+            if not node.visible: return False
+            if node is self.root: return True
+            node = node.parent
+        return False
 
-    def _draw(self):
+    def _add_subtree(self, node):
+        renderer = self.services["renderer"]
+        lighting = self.services["lighting"]
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if not n.visible: continue
+            if n.is_static:
+                renderer.add_static(n)
+            elif hasattr(n, 'get_sprite'):
+                self._dynamic_nodes[n] = None
+            elif hasattr(n, 'draw_ground') and n not in renderer.ground_layers:
+                renderer.ground_layers.append(n)
+            if hasattr(n, 'get_light_surface'):
+                lighting.add_light(n)
+            stack.extend(n.children)
+
+    def _draw(self, alpha=None):
+        """Draws a frame. In fixed-timestep mode alpha (0..1) is the fraction of a tick since the last one."""
+        saved = self._interpolate(alpha) if alpha is not None else None
+        try:
+            self._draw_frame()
+        finally:
+            if saved: self._restore(saved)
+
+    def _draw_frame(self):
+        renderer = self.services["renderer"]
+        prof = self.profiler
+        with prof.scope("submit"):
+            # Light positions are indexed here so they follow interpolated parents
+            self.services["lighting"].update_lights()
+            if self.root:
+                renderer.begin_frame()
+                if self._tree_version != Node.tree_version:
+                    self._sync_tree()
+                # Static nodes live in the renderer's chunk grid; only dynamic ones are submitted
+                for node in self._dynamic_nodes:
+                    renderer.submit(node)
+        
+        if not self.dirty_rects:
+            self._render_frame()
+            with prof.scope("present"):
+                pygame.display.flip()
+            return
+        
+        with prof.scope("dirty_rects"):
+            rects = self._collect_dirty_rects()
+        if rects is None:
+            self._last_overlay_rects = self._render_frame()
+            with prof.scope("present"):
+                pygame.display.flip()
+        elif rects or self._overlays_active():
+            overlay_rects = self._render_frame()
+            rects.extend(overlay_rects)
+            self._last_overlay_rects = overlay_rects
+            screen_rect = self.screen.get_rect()
+            with prof.scope("present"):
+                pygame.display.update([r.clip(screen_rect) for r in rects])
+        # Otherwise nothing changed: keep the previous frame on screen
+
+    def _overlays_active(self):
+        return bool(self.services["interaction"].noises or self.services["combat"].projectiles
+                    or self.services["popups"].popups or self.services["particles"].active()
+                    or self.profiler.show_overlay or self._gizmos)
+
+    def _collect_dirty_rects(self):
+        """
+        Returns the screen rects that changed since the last presented frame, or None when
+        a full flip is needed (camera moved, lighting changed, static geometry changed...).
+        """
+        renderer = self.services["renderer"]
+        lighting = self.services["lighting"]
+        time_manager = self.services["time"]
+        camera = renderer.camera
+        
+        view = (camera.position.x, camera.position.y, camera.zoom, camera.offset.x, camera.offset.y, self.screen.get_size())
+        sun = None
+        if time_manager.current_phase != 'NIGHT':
+            sun_dir = time_manager.sun_direction
+            sun = (round(sun_dir.x * 64), round(sun_dir.y * 64))
+        fov = tuple(self.fov_polygon) if self.fov_polygon else None
+        light_state = (lighting.get_state(camera), sun, fov)
+        
+        full = (self._full_redraw or view != self._last_view or light_state != self._last_lighting
+                or lighting.particles or renderer.chunk_cache.has_pending() or renderer.ground_pending()
+                or self.services["minigame"].current_game is not None
+                or (self._gizmos and not self._gizmo_rects_known))
+        self._last_view = view
+        self._last_lighting = light_state
+        
+        sprites = renderer.dynamic_screen_rects() if self.root else {}
+        rects = self._marked_rects
+        self._marked_rects = []
+        if self._ui_canvas:
+            # UI regions the canvas will repaint (controls mark themselves dirty)
+            ui_rects = self._ui_canvas.pending_rects(self.screen.get_size())
+            if ui_rects is None: full = True
+            else: rects.extend(ui_rects)
+        if not full:
+            for node, entry in sprites.items():
+                last = self._last_sprites.get(node)
+                if last != entry:
+                    rects.append(entry[0])
+                    if last: rects.append(last[0])
+            for node, last in self._last_sprites.items():
+                if node not in sprites: rects.append(last[0])
+            rects.extend(self._last_overlay_rects)
+        self._last_sprites = sprites
+        
+        if full:
+            self._full_redraw = False
+            return None
+        return rects
+
+    def _render_frame(self):
+        """Draws the whole frame into the screen buffer. Returns the rects of transient overlays."""
         self.screen.fill((20, 20, 25))
         renderer = self.services["renderer"]
         lighting = self.services["lighting"]
@@ -113,27 +419,33 @@ class App:
         minigame = self.services["minigame"]
         combat = self.services["combat"]
         popups = self.services["popups"]
+        particles = self.services["particles"]
+        prof = self.profiler
         
+        overlay_rects = []
         if self.root:
-            renderer.clear_queue()
-            def _collect_nodes(node):
-                if not node.visible: return
-                renderer.submit(node)
-                if hasattr(node, 'get_light_surface'):
-                    if node not in lighting.lights: lighting.add_light(node)
-                for child in node.children: _collect_nodes(child)
-            _collect_nodes(self.root)
-            
             # Draw Gizmos (Grids) BEFORE objects/shadows
-            self.root.draw_gizmos(self.screen, renderer.camera)
+            gizmo_rects = self.root.draw_gizmos(self.screen, renderer.camera)
+            # Gizmos that don't report what they drew force a full redraw in dirty-rect mode
+            self._gizmo_rects_known = gizmo_rects is not None
+            if gizmo_rects: overlay_rects.extend(gizmo_rects)
             
             renderer.flush(self.services)
-            interaction.draw(self.screen, renderer.camera)
-            combat.draw(self.screen, renderer.camera)
-            popups.draw(self.screen, renderer.camera)
-            lighting.render(self.screen, renderer.camera, self.fov_polygon)
-            minigame.draw(self.screen)
+            with prof.scope("overlays"):
+                overlay_rects.extend(interaction.draw(self.screen, renderer.camera))
+                overlay_rects.extend(combat.draw(self.screen, renderer.camera))
+                overlay_rects.extend(popups.draw(self.screen, renderer.camera))
+                overlay_rects.extend(particles.draw(self.screen, renderer.camera))
+            with prof.scope("lighting.render"):
+                lighting.render(self.screen, renderer.camera, self.fov_polygon)
+            with prof.scope("overlays"):
+                overlay_rects.extend(particles.draw(self.screen, renderer.camera, emissive=True))
+                minigame.draw(self.screen)
             
-        if self.ui_root:
-            self.ui_root.draw(self.screen, self.services)
-        pygame.display.flip()
\ No newline at end of file
+        if self._ui_canvas:
+            with prof.scope("ui"):
+                self._ui_canvas.draw(self.screen, self.services)
+        
+        profiler_rect = prof.draw_overlay(self.screen)
+        if profiler_rect: overlay_rects.append(profiler_rect)
+        return overlay_rects
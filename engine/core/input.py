@@ -12,26 +12,36 @@ class InputManager:
             "crouch": [pygame.K_LCTRL, pygame.K_RCTRL],
             "toggle_camera": [pygame.K_c],
         }
-        self._pressed_keys = None
-        self._prev_pressed_keys = None
+        self._pressed_keys = set()
+        self._prev_pressed_keys = set()
+        # 이벤트로 받은 눌린 키 (pygame.event.post로 넣은 합성 이벤트도 반영됨)
+        self._event_keys = set()
+
+    def handle_event(self, event):
+        """Called by App for every event, before the UI and the scene"""
+        if event.type == pygame.KEYDOWN:
+            self._event_keys.add(event.key)
+        elif event.type == pygame.KEYUP:
+            self._event_keys.discard(event.key)
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            self._event_keys.clear()
 
     def update(self):
         self._prev_pressed_keys = self._pressed_keys
-        self._pressed_keys = pygame.key.get_pressed()
+        state = pygame.key.get_pressed()
+        self._pressed_keys = {key for keys in self._actions.values() for key in keys if state[key]} | self._event_keys
 
     def is_action_pressed(self, action_name):
         if action_name not in self._actions: return False
         for key in self._actions[action_name]:
-            if self._pressed_keys and self._pressed_keys[key]:
+            if key in self._pressed_keys:
                 return True
         return False
 
     def is_action_just_pressed(self, action_name):
         if action_name not in self._actions: return False
         for key in self._actions[action_name]:
-            is_pressed_now = self._pressed_keys and self._pressed_keys[key]
-            is_pressed_before = self._prev_pressed_keys and self._prev_pressed_keys[key]
-            if is_pressed_now and not is_pressed_before:
+            if key in self._pressed_keys and key not in self._prev_pressed_keys:
                 return True
         return False
 
@@ -36,7 +36,9 @@ class InteractionManager:
         self.noises = [n for n in self.noises if n.update()]
 
     def draw(self, screen, camera):
+        """Draws noise rings. Returns the screen rects touched."""
         from engine.core.math_utils import IsoMath
+        rects = []
         for n in self.noises:
             # World to Screen
             ix, iy = IsoMath.cart_to_iso(n.x, n.y, 0)
@@ -48,4 +50,5 @@ class InteractionManager:
             
             s = pygame.Surface((curr_rad * 2, curr_rad * 2), pygame.SRCALPHA)
             pygame.draw.circle(s, (*n.color, n.alpha), (curr_rad, curr_rad), curr_rad, 2)
-            screen.blit(s, (sx - curr_rad, sy - curr_rad))
\ No newline at end of file
+            rects.append(screen.blit(s, (sx - curr_rad, sy - curr_rad)))
+        return rects
\ No newline at end of file
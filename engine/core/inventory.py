@@ -1,5 +1,6 @@
 import pygame
 from engine.core.component import Component
+from engine.ui.text import TextCache
 
 class Item:
     def __init__(self, id, name, desc, price=0, icon=None):
@@ -78,6 +79,5 @@ class InventoryComponent(Component):
             if count > 0:
                 pygame.draw.rect(screen, (60, 60, 70), (230 + i * 50, sh - 70, 45, 45))
                 # Text for count
-                font = pygame.font.SysFont("arial", 12)
-                txt = font.render(f"{iid[:1]} x{count}", True, (255, 255, 255))
+                txt = TextCache.shared().render(f"{iid[:1]} x{count}", 12, (255, 255, 255))
                 screen.blit(txt, (235 + i * 50, sh - 65))
@@ -1,6 +1,19 @@
+import weakref
+from collections import deque
 from pygame.math import Vector3
 
 class Node:
+    # Static nodes never move on their own, so render caches may bake them
+    is_static = False
+    # Weak references to callbacks (e.g. a Renderer's chunk cache) told when a static node's
+    # sprite or position changes. Use add_change_listener/remove_change_listener.
+    change_listeners = []
+    # Bumped on any add/remove/visibility change, so cached tree walks know when to re-run
+    tree_version = 0
+    # Recent (tree_version, node) add/remove events. A cached walk that missed only these can
+    # update just those subtrees; visibility changes (and overflow) leave a gap and force a re-walk.
+    tree_log = deque(maxlen=256)
+
     def __init__(self, name="Node"):
         self.name = name
         self.tag = name # [NEW] Tag for IDE identification
@@ -11,9 +24,20 @@ class Node:
         # Transform (3D Logic in 2.5D world)
         self.position = Vector3(0, 0, 0)
         self.scale = Vector3(1, 1, 1)
-        self.visible = True
+        self._visible = True
         self.z_index = 0
 
+    @property
+    def visible(self):
+        return self._visible
+
+    @visible.setter
+    def visible(self, value):
+        if value == self._visible: return
+        self._visible = value
+        Node.tree_version += 1
+        if self.is_static: self.notify_changed()
+
     def add_component(self, component):
         self.components.append(component)
         component._on_added(self)
@@ -30,12 +54,16 @@ class Node:
             node.parent.remove_child(node)
         node.parent = self
         self.children.append(node)
+        Node.tree_version += 1
+        Node.tree_log.append((Node.tree_version, node))
         node._ready()
 
     def remove_child(self, node):
         if node in self.children:
             self.children.remove(node)
             node.parent = None
+            Node.tree_version += 1
+            Node.tree_log.append((Node.tree_version, node))
 
     def get_global_position(self):
         """Recursively calculates global position based on parents"""
@@ -43,11 +71,38 @@ class Node:
             return self.parent.get_global_position() + self.position
         return self.position
 
+    @staticmethod
+    def add_change_listener(callback):
+        """Registers a change callback without keeping its owner alive"""
+        ref = weakref.WeakMethod(callback) if hasattr(callback, '__self__') else weakref.ref(callback)
+        Node.change_listeners.append(ref)
+
+    @staticmethod
+    def remove_change_listener(callback):
+        Node.change_listeners[:] = [ref for ref in Node.change_listeners if ref() not in (None, callback)]
+
+    def notify_changed(self):
+        """
+        Call after changing the sprite or position of a static node. Render caches bake static
+        nodes where they were, so moving one without this call leaves it drawn at the old spot.
+        """
+        dead = False
+        for ref in Node.change_listeners:
+            listener = ref()
+            if listener is None: dead = True
+            else: listener(self)
+        if dead:
+            Node.change_listeners[:] = [ref for ref in Node.change_listeners if ref() is not None]
+
     # --- Lifecycle Methods ---
     def _ready(self):
         """Called when added to the scene tree"""
         pass
 
+    def _exit_tree(self):
+        """Called on the scene root when App replaces it or quits (stop threads, close files)"""
+        pass
+
     def _update(self, dt, services):
         """Called every frame by the App loop"""
         # Update components first
@@ -76,5 +131,8 @@ class Node:
         pass
 
     def draw_gizmos(self, screen, camera):
-        """Draw debug info or editor grids. Called directly by App."""
+        """
+        Draw debug info or editor grids. Called directly by App. Return the screen rects drawn
+        (e.g. a list of blit results); returning None makes dirty-rect mode redraw everything.
+        """
         pass
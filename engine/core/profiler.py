@@ -0,0 +1,143 @@
+import csv
+import json
+import time
+from collections import deque
+import pygame
+from engine.ui.text import TextCache
+
+class _Scope:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+class _NullScope:
+    """Returned by scope() while profiling is off: entering and leaving it does nothing"""
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+NULL_SCOPE = _NullScope()
+
+class FrameProfiler:
+    """
+    Named timing scopes recorded per frame into ring buffers of `history` frames.
+    Usage:
+        with profiler.scope("lighting"): ...
+    Disabled profilers hand out a shared no-op scope, so instrumentation stays in place for free.
+    """
+    def __init__(self, history=240, enabled=False):
+        self.history = history
+        self.enabled = enabled
+        self.show_overlay = False
+        self.frame_times = deque(maxlen=history) # ms per frame
+        self.scopes = {} # name: deque of ms per frame
+        self._frame = {} # name: ms accumulated in the current frame
+        self._frame_start = None
+        self._font = None
+
+    def scope(self, name):
+        if not self.enabled: return NULL_SCOPE
+        return _Scope(self, name)
+
+    def add(self, name, ms):
+        self._frame[name] = self._frame.get(name, 0.0) + ms
+
+    def begin_frame(self):
+        if not self.enabled: return
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Pushes this frame's scope times into the ring buffers (0 for scopes that didn't run)"""
+        if not self.enabled or self._frame_start is None: return
+        self.frame_times.append((time.perf_counter() - self._frame_start) * 1000.0)
+        frame = self._frame
+        for name in frame:
+            if name not in self.scopes:
+                # Pad so every buffer lines up with frame_times
+                self.scopes[name] = deque([0.0] * (len(self.frame_times) - 1), maxlen=self.history)
+        for name, samples in self.scopes.items():
+            samples.append(frame.get(name, 0.0))
+        self._frame = {}
+        self._frame_start = None
+
+    def toggle_overlay(self):
+        """Shows/hides the overlay. Showing it also turns recording on."""
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay: self.enabled = True
+
+    def reset(self, history=None):
+        """Drops recorded frames, optionally changing how many are kept"""
+        if history: self.history = history
+        self.frame_times = deque(maxlen=self.history)
+        self.scopes = {}
+        self._frame = {}
+
+    def summary(self):
+        """{name: {'avg': ms, 'max': ms}} over the recorded history, including 'frame'"""
+        result = {}
+        for name, samples in [('frame', self.frame_times)] + list(self.scopes.items()):
+            if samples:
+                result[name] = {'avg': sum(samples) / len(samples), 'max': max(samples)}
+        return result
+
+    def export_csv(self, path):
+        """One row per recorded frame: frame ms, then one column per scope"""
+        names = list(self.scopes)
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + names)
+            for i, frame_ms in enumerate(self.frame_times):
+                writer.writerow([round(frame_ms, 4)] + [round(self.scopes[n][i], 4) for n in names])
+
+    def export_json(self, path):
+        data = {
+            'summary': self.summary(),
+            'frames': list(self.frame_times),
+            'scopes': {name: list(samples) for name, samples in self.scopes.items()}
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def draw_overlay(self, screen):
+        """Frame-time graph and per-scope averages in the top-left corner. Returns the rect drawn."""
+        if not self.show_overlay or not self.frame_times: return None
+        if self._font is None:
+            self._font = TextCache.shared().get_font("consolas", 13)
+        summary = self.summary()
+        lines = [f"frame {summary['frame']['avg']:6.2f} ms  (max {summary['frame']['max']:.2f})"]
+        for name, stats in sorted(summary.items(), key=lambda kv: -kv[1]['avg']):
+            if name != 'frame':
+                lines.append(f"{name:<18}{stats['avg']:6.2f} ms")
+
+        line_h = self._font.get_linesize()
+        graph_h = 60
+        width = 240
+        recent = list(self.frame_times)[-width:]
+        rect = pygame.Rect(8, 8, width + 16, graph_h + 16 + line_h * len(lines))
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # Frame-time graph of the last `width` frames: 33 ms at the top, 16.7 ms guide line
+        scale = graph_h / 33.3
+        base = 8 + graph_h
+        guide = base - int(16.7 * scale)
+        pygame.draw.line(panel, (80, 160, 80), (8, guide), (8 + width, guide))
+        points = [(8 + i, base - min(graph_h, int(ms * scale))) for i, ms in enumerate(recent)]
+        if len(points) > 1:
+            pygame.draw.lines(panel, (255, 210, 90), False, points)
+
+        y = base + 8
+        for line in lines:
+            panel.blit(self._font.render(line, True, (230, 230, 230)), (8, y))
+            y += line_h
+        return screen.blit(panel, rect)
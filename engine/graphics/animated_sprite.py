@@ -9,6 +9,7 @@ class AnimatedSprite(Node):
         self.offset_y = 0
         self.offset_x = 0
         self.flip_h = False # Horizontal flip
+        self._flip_cache = {} # frame: flipped frame (keeps sprite identity stable for render caches)
 
     def update(self, dt, services):
         self.anim_player.update(dt)
@@ -18,6 +19,9 @@ class AnimatedSprite(Node):
         frame = self.anim_player.get_current_frame()
         if frame:
             if self.flip_h:
-                return pygame.transform.flip(frame, True, False)
+                flipped = self._flip_cache.get(frame)
+                if flipped is None:
+                    flipped = self._flip_cache[frame] = pygame.transform.flip(frame, True, False)
+                return flipped
             return frame
         return None
@@ -3,11 +3,21 @@ from engine.core.node import Node
 from engine.graphics.geometry import IsoGeometry
 from engine.core.math_utils import TILE_WIDTH, TILE_HEIGHT, HEIGHT_SCALE
 from engine.assets.tile_engine import TileEngine
+from engine.assets.texture_atlas import TextureAtlas, entry_key
+from engine.graphics.sprite_cache import SurfaceCache
 
-# Global cache to prevent redundant surface creation
-BLOCK_CACHE = {}
+# Global cache of generated Block3D/WallNode sprites. Sprites held by live nodes are pinned;
+# the rest are evicted LRU beyond the budget (atlas subsurfaces cost nothing).
+BLOCK_CACHE_BUDGET = 64 * 1024 * 1024
+BLOCK_CACHE = SurfaceCache(BLOCK_CACHE_BUDGET)
 
 class Block3D(Node):
+    """
+    Static block baked into the renderer's chunk surfaces. After moving one (or its parent),
+    call notify_changed(); a plain position assignment keeps it drawn where it was baked.
+    """
+    is_static = True
+
     def __init__(self, name="Block", size_z=1.0, color=(150, 150, 150), zone_id=0, interact_type="NONE", tile_id=None):
         super().__init__(name)
         self.size_z = size_z # 시각적 높이
@@ -16,13 +26,37 @@ class Block3D(Node):
         self.interact_type = interact_type
         self.tile_id = tile_id
         self.cached_surf = None
+        self._cache_hold = None
         self._regen_texture()
 
+    def texture_key(self):
+        """Key of the generated sprite: only the inputs that actually change its pixels"""
+        sid = str(self.tile_id) if self.tile_id else ""
+        if sid[:1] == '1' or self.size_z < 0.1:
+            return ('floor', self.tile_id) # 바닥은 높이/색상과 무관
+        color = None if self.tile_id in TileEngine.TILE_DATA else tuple(self.color)
+        return (self.size_z, color, self.tile_id)
+
     def _regen_texture(self):
-        cache_key = (self.size_z, self.color, self.tile_id)
+        cache_key = self.texture_key()
+        # 이 노드가 쓰는 동안 캐시에서 밀려나지 않도록 고정 (새 키를 먼저 잡고 이전 키는 해제:
+        # 같은 키면 고정이 잠깐이라도 풀리지 않음)
+        old_hold, self._cache_hold = self._cache_hold, BLOCK_CACHE.hold(self, cache_key)
+        if old_hold: old_hold()
         
-        if cache_key in BLOCK_CACHE:
-            self.cached_surf = BLOCK_CACHE[cache_key]
+        cached = BLOCK_CACHE.get(cache_key)
+        if cached is not None:
+            self.cached_surf = cached
+            self.notify_changed()
+            return
+
+        # 구워진 아틀라스에 있으면 생성 생략
+        atlas = TextureAtlas.shared()
+        baked = atlas.get(entry_key('block', cache_key)) if atlas else None
+        if baked is not None:
+            BLOCK_CACHE[cache_key] = baked
+            self.cached_surf = baked
+            self.notify_changed()
             return
 
         sid = str(self.tile_id) if self.tile_id else ""
@@ -41,15 +75,7 @@ class Block3D(Node):
 
         if is_floor:
             # --- 바닥 (Flat Zomboid Style) ---
-            tile_tex = TileEngine.create_texture(self.tile_id)
-            iso_tex = pygame.transform.smoothscale(tile_tex, (TILE_WIDTH, TILE_HEIGHT))
-            
-            top_mask = pygame.Surface((TILE_WIDTH, TILE_HEIGHT), pygame.SRCALPHA)
-            points = [(TILE_WIDTH // 2, 0), (TILE_WIDTH, TILE_HEIGHT // 2), (TILE_WIDTH // 2, TILE_HEIGHT), (0, TILE_HEIGHT // 2)]
-            pygame.draw.polygon(top_mask, (255, 255, 255, 255), points)
-            pygame.draw.polygon(top_mask, (0, 0, 0, 60), points, 1) 
-            
-            iso_tex.blit(top_mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            iso_tex = TileEngine.create_floor_sprite(self.tile_id)
             surf.blit(iso_tex, (0, visual_height_px))
             
         else: # 벽 또는 사물
@@ -97,6 +123,7 @@ class Block3D(Node):
 
         BLOCK_CACHE[cache_key] = surf
         self.cached_surf = surf
+        self.notify_changed()
 
     def get_sprite(self):
         return self.cached_surf
@@ -34,15 +34,19 @@ class Camera:
     def set_bounds(self, min_x, min_y, max_x, max_y):
         self.bounds = (min_x, min_y, max_x, max_y)
 
-    def update(self):
-        # Lerp towards target
+    def update(self, dt=None):
+        """
+        Lerps towards the target. smoothing is the fraction of the gap closed per 1/60 s;
+        given dt, the step is scaled so catch-up speed doesn't depend on the update rate.
+        """
         diff = self.target_position - self.position
         
-        # If very close, snap
+        # If very close, snap (copy, so later in-place edits of one don't move the other)
         if diff.length_squared() < 1.0:
-            self.position = self.target_position
+            self.position = Vector2(self.target_position)
         else:
-            self.position += diff * self.smoothing
+            t = self.smoothing if dt is None else 1.0 - (1.0 - self.smoothing) ** (dt * 60.0)
+            self.position += diff * t
 
         # Apply Bounds
         if self.bounds:
@@ -56,6 +60,12 @@ class Camera:
         return (x - self.position.x) * self.zoom + self.offset.x, \
                (y - self.position.y) * self.zoom + self.offset.y
     
+    def get_view_rect(self, width, height, margin=0):
+        """Visible area in iso world space as (left, top, right, bottom), grown by margin screen pixels"""
+        left, top = self.screen_to_world(-margin, -margin)
+        right, bottom = self.screen_to_world(width + margin, height + margin)
+        return left, top, right, bottom
+
     def screen_to_world(self, sx, sy):
         return (sx - self.offset.x) / self.zoom + self.position.x, \
                (sy - self.offset.y) / self.zoom + self.position.y
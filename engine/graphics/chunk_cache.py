@@ -0,0 +1,173 @@
+import itertools
+import pygame
+from engine.core.math_utils import IsoMath, TILE_HEIGHT
+from engine.graphics.render_list import RenderItem
+
+# Grid cells per chunk side (16x16 tiles per baked surface)
+CHUNK_SIZE = 16
+
+class StaticChunk:
+    """
+    A square block of static nodes pre-baked into a single depth-sorted surface.
+    Chunks are painted by band (cx + cy). Sprites one tile wide standing on whole cells only
+    overlap across neighbouring bands, and then the one in the later band is always in front,
+    so a whole chunk can be painted as a unit. A dynamic node between cells breaks this within
+    one cell of the next chunk; RenderList splits the chunks around it and pulls the cells
+    behind it into its band.
+    """
+    def __init__(self, key):
+        self.key = key
+        self.band = key[0] + key[1]
+        self.nodes = set()
+        self.items = [] # Per-node render items, sorted by depth (used when the chunk is split)
+        self.unit = None # Render item for the baked surface
+        self.surface = None
+        self.bounds = None # Iso-space (left, top, right, bottom) of the baked surface
+        self.dirty = True
+        self.version = 0 # Bumped by ChunkCache on every bake, never reused
+        
+        # Baked sun shadow, valid for one quantized sun direction (see Renderer)
+        self.shadow = None
+        self.shadow_origin = None
+        self.shadow_key = None
+
+    def bake(self):
+        """Re-renders every visible node of the chunk into one surface"""
+        self.items = []
+        for node in self.nodes:
+            if not node.visible: continue
+            sprite = node.get_sprite()
+            if not sprite: continue
+            gpos = node.get_global_position()
+            iso_x, iso_y = IsoMath.cart_to_iso(gpos.x, gpos.y, gpos.z)
+            depth = IsoMath.get_depth(gpos.x, gpos.y, gpos.z)
+            self.items.append(RenderItem(self.band, depth, sprite, iso_x, iso_y, node))
+        self.items.sort(key=lambda x: x.depth)
+        self.dirty = False
+        self.shadow_key = None
+
+        if not self.items:
+            self.surface = None
+            self.unit = None
+            self.bounds = None
+            return
+
+        # Same pivot as Renderer.flush: sprite midbottom sits half a tile below the iso point
+        rects = []
+        for item in self.items:
+            rects.append(item.sprite.get_rect(midbottom=(item.x, item.y + TILE_HEIGHT // 2)))
+        bounds = rects[0].unionall(rects[1:])
+        self.bounds = (bounds.left, bounds.top, bounds.right, bounds.bottom)
+
+        self.surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        for item, rect in zip(self.items, rects):
+            self.surface.blit(item.sprite, rect.move(-bounds.x, -bounds.y))
+
+        self.unit = RenderItem(self.band, self.items[0].depth, self.surface,
+                               bounds.centerx, bounds.bottom - TILE_HEIGHT // 2)
+
+class ChunkCache:
+    """
+    Groups static nodes (Block3D, TileNode, WallNode...) into StaticChunks.
+    A chunk is re-baked only when a node inside it is added, removed or changed.
+    The chunk grid doubles as the spatial index used for viewport queries.
+    """
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.chunks = {} # (cx, cy): StaticChunk
+        self.node_chunks = {} # node: StaticChunk
+        self._dirty = set()
+        self._versions = itertools.count(1)
+
+    def chunk_key(self, x, y):
+        return (int(x // self.chunk_size), int(y // self.chunk_size))
+
+    def add(self, node):
+        """Registers a static node. Cheap no-op for nodes already cached."""
+        if node in self.node_chunks: return
+        gpos = node.get_global_position()
+        key = self.chunk_key(gpos.x, gpos.y)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = StaticChunk(key)
+        chunk.nodes.add(node)
+        self.node_chunks[node] = chunk
+        self._mark_dirty(chunk)
+
+    def remove(self, node):
+        chunk = self.node_chunks.pop(node, None)
+        if chunk is None: return
+        chunk.nodes.discard(node)
+        self._mark_dirty(chunk)
+
+    def invalidate(self, node):
+        """Re-bakes the chunk of a changed node, moving it to another chunk if its position changed"""
+        if node not in self.node_chunks: return
+        self.remove(node)
+        self.add(node)
+
+    def sync(self, nodes):
+        """Makes the cache hold exactly the given static nodes (after a scene tree walk)"""
+        nodes = set(nodes)
+        for node in [n for n in self.node_chunks if n not in nodes]:
+            self.remove(node)
+        for node in nodes:
+            self.add(node)
+
+    def clear(self):
+        self.chunks.clear()
+        self.node_chunks.clear()
+        self._dirty.clear()
+
+    def update(self):
+        """Re-bakes dirty chunks. Call once per frame before drawing."""
+        if not self._dirty: return
+        for chunk in self._dirty:
+            if chunk.nodes:
+                chunk.bake()
+                chunk.version = next(self._versions)
+            elif self.chunks.get(chunk.key) is chunk:
+                del self.chunks[chunk.key]
+        self._dirty.clear()
+
+    def has_pending(self):
+        """True if some chunk will be re-baked on the next update()"""
+        return bool(self._dirty)
+
+    def query(self, view):
+        """
+        Baked chunks whose surface intersects an iso-space view rect (left, top, right, bottom),
+        in draw order. Only chunk keys under the view are looked up, so cost follows screen size.
+        """
+        left, top, right, bottom = view
+        # Grid-space bounding box of the view (iso rect corners -> cartesian)
+        min_x, _ = IsoMath.iso_to_cart(left, top)
+        max_x, _ = IsoMath.iso_to_cart(right, bottom)
+        _, min_y = IsoMath.iso_to_cart(right, top)
+        _, max_y = IsoMath.iso_to_cart(left, bottom)
+        # One extra chunk ring: tall sprites reach above their own cells
+        kx0, ky0 = self.chunk_key(min_x, min_y)
+        kx1, ky1 = self.chunk_key(max_x, max_y)
+        kx0 -= 1; ky0 -= 1; kx1 += 1; ky1 += 1
+        
+        if (kx1 - kx0 + 1) * (ky1 - ky0 + 1) > len(self.chunks):
+            candidates = self.chunks.values()
+        else:
+            candidates = []
+            for ky in range(ky0, ky1 + 1):
+                for kx in range(kx0, kx1 + 1):
+                    chunk = self.chunks.get((kx, ky))
+                    if chunk: candidates.append(chunk)
+        
+        visible = []
+        for chunk in candidates:
+            b = chunk.bounds
+            if b and b[0] < right and b[2] > left and b[1] < bottom and b[3] > top:
+                visible.append(chunk)
+        # Same key as RenderList items, so split chunks can be merged back in
+        visible.sort(key=lambda c: (c.band, c.unit.depth))
+        return visible
+
+    def _mark_dirty(self, chunk):
+        chunk.dirty = True
+        self._dirty.add(chunk)
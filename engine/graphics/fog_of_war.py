@@ -3,18 +3,30 @@ from engine.core.node import Node
 from engine.core.math_utils import IsoMath
 
 class FogOfWar(Node):
-    def __init__(self, name="FogOfWar"):
+    def __init__(self, name="FogOfWar", resolution_scale=0.25):
         super().__init__(name)
         self.color = (20, 20, 25, 220) # 거의 불투명한 어두운 색
         self.fov_polygon_world = [] # 월드 좌표계의 시야 폴리곤
-        self.surface = None
+        self.surface = None # 업스케일된 최종 마스크 (화면 해상도)
         self.z_index = 999 # 항상 맨 위에 그려지도록
+        
+        # The mask is drawn at a fraction of the screen size and smoothscaled up,
+        # which also softens the FOV edge. It is only redrawn when the polygon or camera changes.
+        self.resolution_scale = resolution_scale
+        self._low_surface = None
+        self._fov_hash = None
+        self._mask_key = None
 
     def update_resolution(self, width, height):
         self.surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        low_size = (max(1, int(width * self.resolution_scale)), max(1, int(height * self.resolution_scale)))
+        self._low_surface = pygame.Surface(low_size, pygame.SRCALPHA)
+        self._mask_key = None
 
     def set_fov_polygon(self, polygon_world):
         self.fov_polygon_world = polygon_world
+        # Cheap change detection: hashed once here instead of compared every frame
+        self._fov_hash = hash(tuple((p[0], p[1]) for p in polygon_world)) if polygon_world else None
 
     def _draw(self, services):
         if not self.visible or not self.surface:
@@ -24,21 +36,33 @@ class FogOfWar(Node):
         if not renderer:
             return
 
+        camera = renderer.camera
+        key = (self._fov_hash, self.color, camera.position.x, camera.position.y, camera.zoom, camera.offset.x, camera.offset.y)
+        if key != self._mask_key:
+            self._rebuild_mask(camera)
+            self._mask_key = key
+
+        # 최종 결과를 화면에 블릿
+        renderer.screen.blit(self.surface, (0, 0))
+
+    def _rebuild_mask(self, camera):
+        low = self._low_surface
+        scale_x = low.get_width() / self.surface.get_width()
+        scale_y = low.get_height() / self.surface.get_height()
+        
         # 1. 화면 전체를 어둡게 덮음
-        self.surface.fill(self.color)
+        low.fill(self.color)
         
         # 2. 시야 다각형(FOV) 부분만 투명하게 뚫음
         if self.fov_polygon_world:
-            # 월드 좌표계의 폴리곤을 화면 좌표계로 변환
+            # 월드 좌표 (아이소메트릭) -> 화면 좌표 -> 저해상도 마스크 좌표
             fov_screen_points = []
             for wx, wy in self.fov_polygon_world:
-                # 월드 좌표 (아이소메트릭) -> 화면 좌표
-                sx, sy = renderer.camera.world_to_screen(wx, wy)
-                fov_screen_points.append((sx, sy))
+                sx, sy = camera.world_to_screen(wx, wy)
+                fov_screen_points.append((sx * scale_x, sy * scale_y))
 
-            # 폴리곤 영역을 완전히 투명하게 만듦 (BLEND_RGBA_MAX: 알파값을 최대로)
             if len(fov_screen_points) > 2:
-                pygame.draw.polygon(self.surface, (0, 0, 0, 0), fov_screen_points)
+                pygame.draw.polygon(low, (0, 0, 0, 0), fov_screen_points)
 
-        # 3. 최종 결과를 화면에 블릿
-        renderer.screen.blit(self.surface, (0, 0))
+        # 3. 부드러운 가장자리로 화면 해상도까지 확대
+        pygame.transform.smoothscale(low, self.surface.get_size(), self.surface)
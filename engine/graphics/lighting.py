@@ -1,8 +1,15 @@
 import pygame
-import random
 import math
+import numpy as np
+from collections import OrderedDict
 from engine.core.node import Node
 from engine.core.math_utils import IsoMath
+from engine.graphics.particles import ParticlePool, make_streak_sprite, make_dot_sprite
+
+# Iso-space size of one cell of the light spatial grid
+LIGHT_CELL = 256
+# Lightmap multiplier while weather_type == 'FOG'
+FOG_COLOR = (100, 100, 110)
 
 class LightSource(Node):
     def __init__(self, name="Light", radius=200, color=(255, 255, 200), intensity=1.0):
@@ -53,20 +60,150 @@ class LightingManager:
         self.lightmap_h = int(height * self.scale_factor)
         
         self.lightmap = pygame.Surface((self.lightmap_w, self.lightmap_h))
-        self.lights = [] # Point Lights
+        self.lights = set() # Point Lights
         self.directional_light = None # Single Sun/Moon
         
+        # Spatial grid of lights, refreshed once per frame by update_lights()
+        self._cells = {} # (cx, cy): set of lights
+        self._light_info = {} # light: (cell, global x, y, z, iso x, iso y)
+        self._max_radius = 0
+        
+        # Lightmap-resolution light sprites shared by lights with the same look
+        self._light_sprites = OrderedDict() # (radius, color, intensity, scale): surface
+        self.light_sprite_cache_size = 64
+        
         # Weather & Environment
         self.weather_type = 'CLEAR' 
         self.weather_intensity = 0.0
         self.clarity = 255 
-        self.particles = []
+        # Screen-space weather particles: kind 0 = rain streak, 1-2 = snow flakes of radius 1-2
+        self.weather_density = {'RAIN': 100, 'SNOW': 50}
+        self.particles = ParticlePool(4096, [
+            make_streak_sprite((150, 150, 200)),
+            make_dot_sprite((255, 255, 255), 1),
+            make_dot_sprite((255, 255, 255), 2)
+        ])
+        self._particle_weather = None
+        self._rng = np.random.default_rng()
 
     def set_directional_light(self, light):
         self.directional_light = light
 
     def add_light(self, light):
-        self.lights.append(light)
+        if light in self.lights: return
+        self.lights.add(light)
+        self._index_light(light)
+
+    def remove_light(self, light):
+        if light not in self.lights: return
+        self.lights.discard(light)
+        info = self._light_info.pop(light)
+        self._unbin(light, info[0])
+
+    def sync_lights(self, lights):
+        """Makes the registry hold exactly the given lights (after a scene tree walk)"""
+        lights = set(lights)
+        for light in [l for l in self.lights if l not in lights]:
+            self.remove_light(light)
+        for light in lights:
+            self.add_light(light)
+
+    def update_lights(self):
+        """Re-bins lights that moved. Call once per frame after the scene update."""
+        self._max_radius = 0
+        for light in self.lights:
+            self._index_light(light)
+
+    def query_lights(self, view, reach=None, zoom=1.0):
+        """
+        Visible lights in grid cells within reach of an iso-space view rect (left, top, right, bottom),
+        as (light, iso_x, iso_y). Radii are screen pixels, so the default reach is the largest radius / zoom.
+        Only cells under the view are looked up; callers still do the exact radius test.
+        """
+        left, top, right, bottom = view
+        if reach is None: reach = self._max_radius / zoom
+        x0, y0 = int((left - reach) // LIGHT_CELL), int((top - reach) // LIGHT_CELL)
+        x1, y1 = int((right + reach) // LIGHT_CELL), int((bottom + reach) // LIGHT_CELL)
+        
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > len(self._cells):
+            candidates = self._cells.values()
+        else:
+            candidates = [self._cells[(cx, cy)] for cy in range(y0, y1 + 1) for cx in range(x0, x1 + 1) if (cx, cy) in self._cells]
+        
+        found = []
+        for cell in candidates:
+            for light in cell:
+                if not light.visible: continue
+                info = self._light_info[light]
+                found.append((light, info[4], info[5]))
+        return found
+
+    def get_light_position(self, light):
+        """Global position of a registered light as of the last update_lights()"""
+        info = self._light_info[light]
+        return pygame.math.Vector3(info[1], info[2], info[3])
+
+    def get_light_sprite(self, light):
+        """Light circle already scaled to lightmap resolution, shared by lights with the same look"""
+        key = (light.radius, light.color, light.intensity, self.scale_factor)
+        sprite = self._light_sprites.get(key)
+        if sprite is not None:
+            self._light_sprites.move_to_end(key)
+            return sprite
+        
+        lsurf = light.get_light_surface()
+        target_w = int(lsurf.get_width() * self.scale_factor)
+        target_h = int(lsurf.get_height() * self.scale_factor)
+        if target_w < 1 or target_h < 1: return None
+        sprite = pygame.transform.smoothscale(lsurf, (target_w, target_h))
+        self._light_sprites[key] = sprite
+        if len(self._light_sprites) > self.light_sprite_cache_size:
+            self._light_sprites.popitem(last=False)
+        return sprite
+
+    def _index_light(self, light):
+        gpos = light.get_global_position()
+        iso_x, iso_y = IsoMath.cart_to_iso(gpos.x, gpos.y, gpos.z)
+        cell = (int(iso_x // LIGHT_CELL), int(iso_y // LIGHT_CELL))
+        old = self._light_info.get(light)
+        if old is None or old[0] != cell:
+            if old: self._unbin(light, old[0])
+            self._cells.setdefault(cell, set()).add(light)
+        self._light_info[light] = (cell, gpos.x, gpos.y, gpos.z, iso_x, iso_y)
+        if light.radius > self._max_radius: self._max_radius = light.radius
+
+    def _unbin(self, light, cell):
+        bucket = self._cells.get(cell)
+        if bucket is None: return
+        bucket.discard(light)
+        if not bucket: del self._cells[cell]
+
+    def _visible_lights(self, camera):
+        """(light, lightmap x, lightmap y) for lights whose circle overlaps the lightmap"""
+        # Light radius is in screen pixels, independent of zoom
+        view = camera.get_view_rect(self.width, self.height)
+        visible = []
+        for light, iso_x, iso_y in self.query_lights(view, zoom=camera.zoom):
+            sx, sy = camera.world_to_screen(iso_x, iso_y)
+            lx = int(sx * self.scale_factor)
+            ly = int(sy * self.scale_factor)
+            l_rad = light.radius * self.scale_factor
+            if not (-l_rad < lx < self.lightmap_w + l_rad and -l_rad < ly < self.lightmap_h + l_rad): continue
+            visible.append((light, lx, ly))
+        return visible
+
+    def get_state(self, camera):
+        """Hashable summary of what render() depends on (besides FOV and weather particles)"""
+        lights = []
+        for light, lx, ly in self._visible_lights(camera):
+            lights.append((lx, ly, light.radius, light.color, light.intensity))
+        lights.sort()
+        sun = self.directional_light
+        return (
+            tuple(int(c) for c in self.ambient_color),
+            (sun.color, sun.intensity) if sun else None,
+            self.weather_type, self.clarity, tuple(lights)
+        )
 
     def update_resolution(self, width, height):
         """Called when window is resized to update lightmap size"""
@@ -77,76 +214,155 @@ class LightingManager:
         self.lightmap = pygame.Surface((self.lightmap_w, self.lightmap_h))
 
     def update_weather(self, dt):
-        """Update weather particles"""
-        if self.weather_type == 'RAIN':
-            if len(self.particles) < 100:
-                self.particles.append([random.randint(0, self.width), -20, random.randint(5, 10)])
-            for p in self.particles:
-                p[1] += p[2] * 2 
-                p[0] -= p[2] * 0.5 
-                if p[1] > self.height:
-                    p[1] = -20; p[0] = random.randint(0, self.width)
-        elif self.weather_type == 'SNOW':
-            if len(self.particles) < 50:
-                self.particles.append([random.randint(0, self.width), -20, random.uniform(1, 3)])
-            for p in self.particles:
-                p[1] += p[2]
-                p[0] += math.sin(pygame.time.get_ticks() * 0.005) * 0.5
-                if p[1] > self.height:
-                    p[1] = -20; p[0] = random.randint(0, self.width)
-        else:
-            self.particles.clear()
+        """Update weather particles (vectorized; speeds are the old per-frame values at 60 fps)"""
+        pool = self.particles
+        if self.weather_type != self._particle_weather:
+            pool.clear()
+            self._particle_weather = self.weather_type
+        density = self.weather_density.get(self.weather_type, 0)
+        if not density: return
+        
+        # Spawn rate scales with density: one per frame at the default 100
+        spawn = min(max(1, density // 100), density - pool.count)
+        if spawn > 0:
+            xs = self._rng.integers(0, self.width, spawn, endpoint=True)
+            pos = np.column_stack((xs, np.full(spawn, -20.0), np.zeros(spawn)))
+            if self.weather_type == 'RAIN':
+                speed = self._rng.integers(5, 10, spawn, endpoint=True) * 60.0
+                vel = np.column_stack((-speed * 0.5, speed * 2, np.zeros(spawn)))
+                pool.emit(spawn, pos, vel, np.inf, 0)
+            else:
+                size = self._rng.uniform(1, 3, spawn)
+                vel = np.column_stack((np.zeros(spawn), size * 60.0, np.zeros(spawn)))
+                pool.emit(spawn, pos, vel, np.inf, size.astype(np.intp))
+        
+        pool.update(dt)
+        n = pool.count
+        if self.weather_type == 'SNOW':
+            pool.pos[:n, 0] += math.sin(pygame.time.get_ticks() * 0.005) * 0.5 * dt * 60.0
+        # Particles that left the bottom re-enter at the top
+        fallen = np.flatnonzero(pool.pos[:n, 1] > self.height)
+        if len(fallen):
+            pool.pos[fallen, 1] = -20
+            pool.pos[fallen, 0] = self._rng.integers(0, self.width, len(fallen), endpoint=True)
 
     def render(self, screen, camera, fov_polygon=None):
         self.lightmap.fill(self.ambient_color)
         
-        if self.directional_light and self.directional_light.intensity > 0:
-            r = int(self.directional_light.color[0] * self.directional_light.intensity)
-            g = int(self.directional_light.color[1] * self.directional_light.intensity)
-            b = int(self.directional_light.color[2] * self.directional_light.intensity)
-            self.lightmap.fill((r, g, b), special_flags=pygame.BLEND_RGB_ADD)
+        sun = self._sun_color()
+        if sun:
+            self.lightmap.fill(sun, special_flags=pygame.BLEND_RGB_ADD)
         
-        for light in self.lights:
-            if not light.visible: continue
-            gpos = light.get_global_position()
-            sx, sy = camera.world_to_screen(*IsoMath.cart_to_iso(gpos.x, gpos.y, gpos.z))
-            lx = int(sx * self.scale_factor)
-            ly = int(sy * self.scale_factor)
-            l_rad = light.radius * self.scale_factor
-            if not (-l_rad < lx < self.lightmap_w + l_rad and -l_rad < ly < self.lightmap_h + l_rad): continue
-
-            lsurf = light.get_light_surface()
-            target_w = int(lsurf.get_width() * self.scale_factor)
-            target_h = int(lsurf.get_height() * self.scale_factor)
-            if target_w < 1 or target_h < 1: continue
-            
-            scaled_light = pygame.transform.smoothscale(lsurf, (target_w, target_h))
+        for light, lx, ly in self._visible_lights(camera):
+            scaled_light = self.get_light_sprite(light)
+            if scaled_light is None: continue
             dest_rect = scaled_light.get_rect(center=(lx, ly))
             self.lightmap.blit(scaled_light, dest_rect, special_flags=pygame.BLEND_RGB_ADD)
 
-        if fov_polygon:
+        screen_poly = self._fov_lightmap_polygon(camera, fov_polygon)
+        if screen_poly:
             mask_surf = pygame.Surface((self.lightmap_w, self.lightmap_h), pygame.SRCALPHA)
-            screen_poly = []
-            for px, py in fov_polygon:
-                sx, sy = camera.world_to_screen(*IsoMath.cart_to_iso(px, py))
-                screen_poly.append((int(sx * self.scale_factor), int(sy * self.scale_factor)))
-            
-            if len(screen_poly) > 2:
-                pygame.draw.polygon(mask_surf, (255, 255, 255, self.clarity), screen_poly)
-                pygame.draw.lines(mask_surf, (255, 255, 255, self.clarity // 2), True, screen_poly, width=6)
-                self.lightmap.blit(mask_surf, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            pygame.draw.polygon(mask_surf, (255, 255, 255, self.clarity), screen_poly)
+            pygame.draw.lines(mask_surf, (255, 255, 255, self.clarity // 2), True, screen_poly, width=6)
+            self.lightmap.blit(mask_surf, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
 
         if self.weather_type == 'FOG':
             fog_surf = pygame.Surface((self.lightmap_w, self.lightmap_h))
-            fog_surf.fill((100, 100, 110))
+            fog_surf.fill(FOG_COLOR)
             self.lightmap.blit(fog_surf, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
 
         full_lightmap = pygame.transform.smoothscale(self.lightmap, (self.width, self.height))
         screen.blit(full_lightmap, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        self._draw_weather(screen)
+
+    def _sun_color(self):
+        """Directional light contribution, or None when the sun/moon is off"""
+        sun = self.directional_light
+        if not sun or sun.intensity <= 0: return None
+        return (int(sun.color[0] * sun.intensity), int(sun.color[1] * sun.intensity), int(sun.color[2] * sun.intensity))
+
+    def _fov_lightmap_polygon(self, camera, fov_polygon):
+        """FOV polygon in lightmap pixels, or None if there is nothing to mask"""
+        if not fov_polygon: return None
+        screen_poly = []
+        for px, py in fov_polygon:
+            sx, sy = camera.world_to_screen(*IsoMath.cart_to_iso(px, py))
+            screen_poly.append((int(sx * self.scale_factor), int(sy * self.scale_factor)))
+        return screen_poly if len(screen_poly) > 2 else None
+
+    def _draw_weather(self, screen):
+        self.particles.draw(screen)
+
+class NumpyLightingManager(LightingManager):
+    """
+    LightingManager backend that composites the lightmap in a preallocated uint16 buffer.
+    Ambient, sun and light terms are summed without per-blit saturation, clamped once,
+    masked by the FOV and fogged in place, then uploaded with a single surfarray.blit_array.
+    Output matches the pygame backend (saturating adds give the same result as a final clamp).
+    """
+    def __init__(self, width, height, ambient_color=(20, 20, 30)):
+        super().__init__(width, height, ambient_color)
+        self._light_arrays = {} # id(light sprite): (sprite, uint16 RGB added by the sprite)
+        self._alloc_buffers()
+
+    def update_resolution(self, width, height):
+        super().update_resolution(width, height)
+        self._alloc_buffers()
+
+    def _alloc_buffers(self):
+        size = (self.lightmap_w, self.lightmap_h)
+        self._buffer = np.zeros((size[0], size[1], 3), dtype=np.uint16)
+        self._mask_surf = pygame.Surface(size, depth=8)
+        self._full_lightmap = pygame.Surface((self.width, self.height))
+
+    def _light_array(self, sprite):
+        """RGB that blitting sprite with BLEND_RGB_ADD adds to the lightmap (cached per sprite)"""
+        entry = self._light_arrays.get(id(sprite))
+        if entry and entry[0] is sprite: return entry[1]
+        if len(self._light_arrays) > self.light_sprite_cache_size * 2:
+            self._light_arrays.clear()
+        probe = pygame.Surface(sprite.get_size())
+        probe.blit(sprite, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        arr = pygame.surfarray.array3d(probe).astype(np.uint16)
+        self._light_arrays[id(sprite)] = (sprite, arr)
+        return arr
+
+    def render(self, screen, camera, fov_polygon=None):
+        buf = self._buffer
+        base = np.array(self.ambient_color, dtype=np.int32)
+        sun = self._sun_color()
+        if sun: base += sun
+        buf[:] = np.minimum(base, 255)
+        
+        w, h = self.lightmap_w, self.lightmap_h
+        for light, lx, ly in self._visible_lights(camera):
+            sprite = self.get_light_sprite(light)
+            if sprite is None: continue
+            arr = self._light_array(sprite)
+            sw, sh = sprite.get_size()
+            x0, y0 = lx - sw // 2, ly - sh // 2
+            cx0, cy0 = max(x0, 0), max(y0, 0)
+            cx1, cy1 = min(x0 + sw, w), min(y0 + sh, h)
+            if cx0 >= cx1 or cy0 >= cy1: continue
+            buf[cx0:cx1, cy0:cy1] += arr[cx0 - x0:cx1 - x0, cy0 - y0:cy1 - y0]
+
+        np.minimum(buf, 255, out=buf)
+
+        screen_poly = self._fov_lightmap_polygon(camera, fov_polygon)
+        if screen_poly:
+            mask = self._mask_surf
+            mask.fill(0)
+            pygame.draw.polygon(mask, 1, screen_poly)
+            pygame.draw.lines(mask, 1, True, screen_poly, width=6)
+            np.multiply(buf, pygame.surfarray.pixels2d(mask)[:, :, None], out=buf, casting='unsafe')
+
+        if self.weather_type == 'FOG':
+            # Same rounding as BLEND_RGB_MULT: (a * b + 255) >> 8
+            buf *= np.array(FOG_COLOR, dtype=np.uint16)
+            buf += 255
+            buf >>= 8
 
-        if self.weather_type == 'RAIN':
-            for p in self.particles:
-                pygame.draw.line(screen, (150, 150, 200, 150), (p[0], p[1]), (p[0] - 2, p[1] + 10))
-        elif self.weather_type == 'SNOW':
-            for p in self.particles:
-                pygame.draw.circle(screen, (255, 255, 255, 180), (int(p[0]), int(p[1])), int(p[2]))
\ No newline at end of file
+        pygame.surfarray.blit_array(self.lightmap, buf)
+        pygame.transform.smoothscale(self.lightmap, (self.width, self.height), self._full_lightmap)
+        screen.blit(self._full_lightmap, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        self._draw_weather(screen)
@@ -0,0 +1,179 @@
+import pygame
+import numpy as np
+from engine.core.math_utils import TILE_WIDTH, TILE_HEIGHT, HEIGHT_SCALE
+
+def make_streak_sprite(color, dx=-2, dy=10):
+    """Rain streak: a 1px line from (0, 0) to (dx, dy), anchored at its top point"""
+    surf = pygame.Surface((abs(dx) + 1, abs(dy) + 1), pygame.SRCALPHA)
+    start = (-dx if dx < 0 else 0, 0)
+    pygame.draw.line(surf, color, start, (start[0] + dx, dy))
+    return surf, start
+
+def make_dot_sprite(color, radius):
+    """Filled circle anchored at its centre"""
+    surf = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+    pygame.draw.circle(surf, color, (radius, radius), radius)
+    return surf, (radius, radius)
+
+def _rows(value, n, row_ndim):
+    """First n rows of a per-particle argument, or the value itself if it is shared by all"""
+    return np.asarray(value)[:n] if np.ndim(value) > row_ndim else value
+
+class ParticlePool:
+    """
+    Fixed-capacity particle storage as NumPy arrays (position, velocity, life, kind).
+    Updates are vectorized; drawing is one Surface.blits call with pre-rendered sprites.
+
+    sprites: one (surface, anchor) per kind. With fade_steps > 1 each kind also gets
+    alpha-faded copies and particles fade out over their lifetime.
+    world: positions are grid coordinates (x, y, z) drawn through the camera;
+           otherwise they are screen pixels (z unused).
+    """
+    def __init__(self, capacity, sprites, world=False, gravity=0.0, drag=0.0, fade_steps=1):
+        self.capacity = capacity
+        self.world = world
+        self.gravity = gravity # Added to vz (world) or vy (screen) per second
+        self.drag = drag # Fraction of velocity lost per second
+        self.fade_steps = fade_steps
+
+        self.pos = np.zeros((capacity, 3))
+        self.vel = np.zeros((capacity, 3))
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.kind = np.zeros(capacity, dtype=np.intp)
+        self.count = 0
+        self.set_sprites(sprites)
+
+    def __len__(self):
+        return self.count
+
+    def set_sprites(self, sprites):
+        self._images = []
+        anchors = []
+        for surf, anchor in sprites:
+            for step in range(self.fade_steps):
+                img = surf
+                if step:
+                    img = surf.copy()
+                    img.fill((255, 255, 255, int(255 * (1 - step / self.fade_steps))), special_flags=pygame.BLEND_RGBA_MULT)
+                self._images.append(img)
+                anchors.append(anchor)
+        self._anchors = np.array(anchors, dtype=np.intp)
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, n, pos, vel=(0, 0, 0), life=1.0, kind=0):
+        """
+        Spawns up to n particles (fewer if the pool is full). Arguments broadcast:
+        pos/vel are (3,) or (n, 3), life/kind scalars or (n,). Returns the number spawned.
+        """
+        n = min(n, self.capacity - self.count)
+        if n <= 0: return 0
+        s = slice(self.count, self.count + n)
+        self.pos[s] = _rows(pos, n, 1)
+        self.vel[s] = _rows(vel, n, 1)
+        self.life[s] = _rows(life, n, 0)
+        self.max_life[s] = self.life[s]
+        self.kind[s] = _rows(kind, n, 0)
+        self.count += n
+        return n
+
+    def update(self, dt):
+        """Integrates motion and drops expired particles (life <= 0)"""
+        n = self.count
+        if not n: return
+        vel = self.vel[:n]
+        if self.gravity:
+            vel[:, 2 if self.world else 1] += self.gravity * dt
+        if self.drag:
+            vel *= max(0.0, 1.0 - self.drag * dt)
+        self.pos[:n] += vel * dt
+        self.life[:n] -= dt
+
+        alive = self.life[:n] > 0
+        if alive.all(): return
+        m = int(alive.sum())
+        for arr in (self.pos, self.vel, self.life, self.max_life, self.kind):
+            arr[:m] = arr[:n][alive]
+        self.count = m
+
+    def screen_positions(self, camera=None):
+        """(n, 2) screen coordinates of the live particles"""
+        pos = self.pos[:self.count]
+        if not self.world:
+            return pos[:, :2]
+        iso_x = (pos[:, 0] - pos[:, 1]) * (TILE_WIDTH / 2)
+        iso_y = (pos[:, 0] + pos[:, 1]) * (TILE_HEIGHT / 2) - pos[:, 2] * HEIGHT_SCALE
+        return np.stack(((iso_x - camera.position.x) * camera.zoom + camera.offset.x,
+                         (iso_y - camera.position.y) * camera.zoom + camera.offset.y), axis=1)
+
+    def draw(self, screen, camera=None):
+        """Blits every live particle in one Surface.blits call. Returns the screen rects touched."""
+        if not self.count: return []
+        xy = self.screen_positions(camera)
+        index = self.kind[:self.count] * self.fade_steps
+        if self.fade_steps > 1:
+            fade = 1.0 - self.life[:self.count] / self.max_life[:self.count]
+            index = index + np.minimum((fade * self.fade_steps).astype(np.intp), self.fade_steps - 1)
+
+        w, h = screen.get_size()
+        xy = xy.astype(np.intp) - self._anchors[index]
+        visible = (xy[:, 0] > -16) & (xy[:, 0] < w) & (xy[:, 1] > -16) & (xy[:, 1] < h)
+        if not visible.all():
+            xy, index = xy[visible], index[visible]
+        images = self._images
+        return screen.blits(list(zip([images[i] for i in index.tolist()], xy.tolist()))) or []
+
+class ParticleSystem:
+    """
+    Shared world-space particle effects (muzzle flashes, footstep dust).
+    Weather uses its own screen-space ParticlePool inside LightingManager.
+    """
+    def __init__(self, flash_capacity=512, dust_capacity=2048):
+        self.rng = np.random.default_rng()
+        self.pools = {
+            'flash': ParticlePool(flash_capacity, [make_dot_sprite((255, 220, 120), 2), make_dot_sprite((255, 160, 60), 1)],
+                                  world=True, drag=6.0, fade_steps=4),
+            'dust': ParticlePool(dust_capacity, [make_dot_sprite((150, 140, 120, 160), 1), make_dot_sprite((120, 110, 95, 140), 2)],
+                                 world=True, gravity=-2.0, drag=3.0, fade_steps=4)
+        }
+        # Pools drawn after the lightmap so darkness doesn't dim them
+        self.emissive = {'flash'}
+
+    def emit_muzzle_flash(self, pos, direction, count=12):
+        """Sparks fanning out along direction (grid units) from pos (x, y, z)"""
+        d = np.array((direction[0], direction[1], 0.0))
+        norm = np.linalg.norm(d)
+        if norm: d /= norm
+        spread = self.rng.normal(0.0, 0.35, (count, 3)) * (1, 1, 0.5)
+        speed = self.rng.uniform(2.0, 6.0, (count, 1))
+        vel = (d + spread) * speed
+        life = self.rng.uniform(0.05, 0.15, count)
+        kind = self.rng.integers(0, 2, count)
+        self.pools['flash'].emit(count, tuple(pos), vel, life, kind)
+
+    def emit_dust(self, x, y, count=4):
+        """Small puff at a footstep"""
+        vel = np.column_stack((self.rng.normal(0, 0.4, count), self.rng.normal(0, 0.4, count), self.rng.uniform(0.3, 0.8, count)))
+        life = self.rng.uniform(0.3, 0.6, count)
+        kind = self.rng.integers(0, 2, count)
+        self.pools['dust'].emit(count, (x, y, 0.0), vel, life, kind)
+
+    def active(self):
+        return any(pool.count for pool in self.pools.values())
+
+    def update(self, dt):
+        for pool in self.pools.values():
+            pool.update(dt)
+
+    def draw(self, screen, camera, emissive=False):
+        """
+        Draws the lit pools (before the lightmap) or the emissive ones (after it, so they glow).
+        Returns the screen rects touched.
+        """
+        rects = []
+        for name, pool in self.pools.items():
+            if (name in self.emissive) == emissive:
+                rects.extend(pool.draw(screen, camera))
+        return rects
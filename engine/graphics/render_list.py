@@ -0,0 +1,113 @@
+import bisect
+import heapq
+import itertools
+from operator import attrgetter
+
+# Painter's order: chunk band first, then depth (see StaticChunk)
+sort_key = attrgetter('band', 'depth')
+depth_key = attrgetter('depth')
+
+class RenderItem:
+    """One sprite to blit. pos (x, y) is the iso-space pivot, drawn at the sprite's midbottom."""
+    __slots__ = ('band', 'depth', 'sprite', 'x', 'y', 'node')
+
+    def __init__(self, band, depth, sprite, x, y, node=None):
+        self.band = band
+        self.depth = depth
+        self.sprite = sprite
+        self.x = x
+        self.y = y
+        self.node = node
+
+class RenderList:
+    """
+    Frame render list built on top of a ChunkCache.
+    Static chunks keep their pre-sorted items between frames; only dynamic nodes are re-inserted
+    each frame, into integer depth buckets, so sort cost follows the number of
+    moving objects rather than the size of the scene.
+    """
+    def __init__(self, chunk_cache):
+        self.chunk_cache = chunk_cache
+        self.buckets = {} # (band, int(depth)): [RenderItem]
+        self.occupied = set() # Chunk keys that hold a dynamic node this frame
+        self.pulled = {} # Chunk key: depth; its items shallower than this are drawn one band early
+        self.chunk_items = {} # Chunk key: dynamic items standing in it
+        self.dynamic_count = 0
+        self.visible_chunks = [] # Chunks in view, in draw order (set by Renderer)
+
+    def clear(self):
+        self.buckets.clear()
+        self.occupied.clear()
+        self.pulled.clear()
+        self.chunk_items.clear()
+        self.dynamic_count = 0
+        self.visible_chunks = []
+
+    def insert(self, node, sprite, gx, gy, iso_x, iso_y, depth):
+        chunk_key = self.chunk_cache.chunk_key
+        key = chunk_key(gx, gy)
+        band = key[0] + key[1]
+        self.occupied.add(key)
+        item = RenderItem(band, depth, sprite, iso_x, iso_y, node)
+        self._add(item)
+        self.chunk_items.setdefault(key, []).append(item)
+        self.dynamic_count += 1
+
+        # Within one cell of the next chunk along +x or +y, cells of that chunk behind the node
+        # overlap it but sit one band later: pull them into this band (see StaticChunk)
+        for k in (chunk_key(gx + 1, gy), chunk_key(gx, gy + 1)):
+            if k == key: continue
+            self.occupied.add(k)
+            if k not in self.pulled or depth > self.pulled[k]:
+                self.pulled[k] = depth
+
+    def _add(self, item):
+        bucket = self.buckets.get((item.band, int(item.depth)))
+        if bucket is None:
+            self.buckets[(item.band, int(item.depth))] = [item]
+        else:
+            bucket.append(item)
+
+    def _settle(self):
+        """Moves dynamic items inside a pulled region down a band, with the cells around them"""
+        for key, limit in self.pulled.items():
+            band = key[0] + key[1]
+            for item in self.chunk_items.get(key, ()):
+                if item.band == band and item.depth < limit:
+                    self.buckets[(band, int(item.depth))].remove(item)
+                    item.band = band - 1
+                    self._add(item)
+
+    def dynamic_items(self):
+        """Dynamic items in draw order"""
+        for key in sorted(self.buckets):
+            bucket = self.buckets[key]
+            if len(bucket) > 1: bucket.sort(key=sort_key)
+            yield from bucket
+
+    def dynamic_nodes(self):
+        for bucket in self.buckets.values():
+            for item in bucket:
+                yield item.node
+
+    def __iter__(self):
+        """
+        All items in draw order. Unsplit chunks are one item each; chunks that hold
+        a dynamic node contribute their pre-sorted per-node items instead.
+        """
+        if self.pulled: self._settle()
+        units = []
+        streams = [self.dynamic_items()]
+        for chunk in self.visible_chunks:
+            if chunk.key not in self.occupied:
+                units.append(chunk.unit)
+                continue
+            limit = self.pulled.get(chunk.key)
+            if limit is None:
+                streams.append(chunk.items)
+                continue
+            i = bisect.bisect_left(chunk.items, limit, key=depth_key)
+            early = [RenderItem(chunk.band - 1, it.depth, it.sprite, it.x, it.y, it.node) for it in chunk.items[:i]]
+            streams.append(itertools.chain(early, chunk.items[i:]))
+        streams.append(units)
+        return heapq.merge(*streams, key=sort_key)
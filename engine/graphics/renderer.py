@@ -1,14 +1,50 @@
+import weakref
 import pygame
 from engine.graphics.camera import Camera
-from engine.core.math_utils import IsoMath
+from engine.core.node import Node
+from engine.core.profiler import FrameProfiler
+from engine.core.math_utils import IsoMath, TILE_HEIGHT
 
 from engine.graphics.shadow_renderer import ShadowRenderer
+from engine.graphics.chunk_cache import ChunkCache, CHUNK_SIZE
+from engine.graphics.sprite_cache import ScaledSpriteCache
+from engine.graphics.render_list import RenderList
+
+# Sun direction is quantized to 1/SUN_STEPS before baking chunk shadows
+SUN_STEPS = 64
 
 class Renderer:
-    def __init__(self, screen):
+    def __init__(self, screen, chunk_size=CHUNK_SIZE, sprite_cache_budget=128 * 1024 * 1024, cull_margin=192, max_shadow_lights=4):
         self.screen = screen
         self.camera = Camera()
-        self.render_queue = []
+        
+        # Nodes whose iso bounds miss the screen grown by this many pixels are skipped entirely
+        self.cull_margin = cull_margin
+        self.view_rect = None
+        
+        # Static geometry is baked per chunk instead of queued every frame
+        self.chunk_cache = ChunkCache(chunk_size)
+        Node.add_change_listener(self.chunk_cache.invalidate)
+        self.render_list = RenderList(self.chunk_cache)
+        
+        # Zoom-scaled copies of sprites, reused while the zoom level is unchanged
+        self.sprite_cache = ScaledSpriteCache(sprite_cache_budget)
+        
+        # Flat floor layers (TileMap) drawn under shadows and objects; set by App after a tree walk
+        self.ground_layers = []
+        
+        # Soft shadow layers, reused every frame. Chunk sun shadows are re-baked lazily.
+        self.shadow_scale = 0.5
+        self.shadow_bakes_per_frame = 4
+        self._shadow_surf = None
+        self._full_shadow = None
+        
+        # Point lights casting shadow volumes per frame, and each light's cached static mask
+        self.max_shadow_lights = max_shadow_lights
+        self._light_shadows = weakref.WeakKeyDictionary() # light: [pos, chunk versions, surface, iso origin]
+        
+        # Timing scopes; App replaces this with its own profiler
+        self.profiler = FrameProfiler()
         
         # Initial viewport setup
         self.camera.update_viewport(screen.get_width(), screen.get_height())
@@ -18,90 +54,250 @@ class Renderer:
         self.screen = screen
         self.camera.update_viewport(screen.get_width(), screen.get_height())
 
+    def close(self):
+        """Stops listening for static node changes (the listener is weak, so this is only for early teardown)"""
+        Node.remove_change_listener(self.chunk_cache.invalidate)
+        self.chunk_cache.clear()
+
     def clear_queue(self):
-        self.render_queue.clear()
+        self.render_list.clear()
+
+    def begin_frame(self):
+        """Updates the culling rect from the camera, then clears the queue. Call before submit()."""
+        self.view_rect = self.camera.get_view_rect(self.screen.get_width(), self.screen.get_height(), self.cull_margin)
+        self.clear_queue()
 
     def submit(self, node):
         """
         Submits a node to be rendered.
+        Static nodes go to the chunk cache and are only re-baked when they change.
+        Dynamic nodes outside the view rect are dropped before any further work.
         """
+        if node.is_static:
+            self.chunk_cache.add(node)
+            return
+
         if hasattr(node, 'get_sprite'):
             sprite = node.get_sprite()
             if sprite:
                 gpos = node.get_global_position()
                 iso_x, iso_y = IsoMath.cart_to_iso(gpos.x, gpos.y, gpos.z)
+                if self.view_rect:
+                    left, top, right, bottom = self.view_rect
+                    w, h = sprite.get_size()
+                    foot_y = iso_y + TILE_HEIGHT // 2
+                    if iso_x + w / 2 < left or iso_x - w / 2 > right or foot_y < top or foot_y - h > bottom:
+                        return
                 depth = IsoMath.get_depth(gpos.x, gpos.y, gpos.z)
-                
-                self.render_queue.append({
-                    'depth': depth,
-                    'sprite': sprite,
-                    'pos': (iso_x, iso_y),
-                    'scale': node.scale,
-                    'node': node # Keep ref for shadow calc
-                })
+                self.render_list.insert(node, sprite, gpos.x, gpos.y, iso_x, iso_y, depth)
 
-    def flush(self, services):
-        # 1. Update Camera
-        self.camera.update()
+    def add_static(self, node):
+        self.chunk_cache.add(node)
+
+    def remove_static(self, node):
+        self.chunk_cache.remove(node)
+
+    def sync_static(self, nodes):
+        """Hands the full set of static scene nodes to the chunk cache (after a tree walk)"""
+        self.chunk_cache.sync(nodes)
+
+    def dynamic_screen_rects(self):
+        """{node: (screen rect, sprite)} for queued dynamic nodes, used for dirty-rect presentation"""
         zoom = self.camera.zoom
-        
-        # [Soft Shadow Pass]
-        shadow_scale = 0.5
-        sw = int(self.screen.get_width() * shadow_scale)
-        sh = int(self.screen.get_height() * shadow_scale)
-        shadow_surf = pygame.Surface((sw, sh), pygame.SRCALPHA)
-        
-        time_manager = services.get("time")
-        lighting_manager = services.get("lighting")
-        
-        # --- A. Directional Shadows (Sun/Moon) ---
-        if time_manager and time_manager.current_phase != 'NIGHT':
-            sun_dir = time_manager.sun_direction
-            for item in self.render_queue:
-                node = item['node']
-                ShadowRenderer.draw_directional_shadow(shadow_surf, self.camera, node, sun_dir, scale=shadow_scale)
-        
-        # --- B. Point Light Shadows ---
-        main_light = None
-        if lighting_manager:
-            for l in lighting_manager.lights:
-                if l.name == "PlayerLight": # TODO: Don't hardcode this
-                    main_light = l
-                    break
-        
-        if main_light:
-            light_pos = main_light.get_global_position()
-            if light_pos.z < 2: light_pos.z = 3.0
+        if zoom != 1.0: zoom = self.sprite_cache.quantize(zoom)
+        cam_x, cam_y = self.camera.position
+        off_x, off_y = self.camera.offset
+        rects = {}
+        for item in self.render_list.dynamic_items():
+            w, h = item.sprite.get_size()
+            rect = pygame.Rect(0, 0, int(w * zoom), int(h * zoom))
+            rect.midbottom = ((item.x - cam_x) * zoom + off_x, (item.y - cam_y) * zoom + off_y + (TILE_HEIGHT // 2) * zoom)
+            if hasattr(item.node, 'size_z'):
+                # Leave room for the node's own shadow
+                rect.inflate_ip(rect.w * 2, rect.h * 2)
+            rects[item.node] = (rect, item.sprite)
+        return rects
+
+    def ground_pending(self):
+        """True if a ground layer changed since it was last drawn"""
+        return any(layer.has_pending() for layer in self.ground_layers)
+
+    def clear_static(self):
+        """Forgets all baked static geometry (e.g. when the scene is replaced)"""
+        self.chunk_cache.clear()
+        self.ground_layers = []
+
+    def _get_shadow_surface(self):
+        """Cleared half-resolution shadow layer, reallocated only when the screen size changes"""
+        size = (int(self.screen.get_width() * self.shadow_scale), int(self.screen.get_height() * self.shadow_scale))
+        if self._shadow_surf is None or self._shadow_surf.get_size() != size:
+            self._shadow_surf = pygame.Surface(size, pygame.SRCALPHA)
+            self._full_shadow = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+        self._shadow_surf.fill((0, 0, 0, 0))
+        return self._shadow_surf
+
+    def _draw_chunk_shadows(self, shadow_surf, chunks, sun_key, sun_dir, zoom):
+        """
+        Blits each chunk's baked sun shadow, re-baking chunks whose bake is for another
+        sun direction. At most shadow_bakes_per_frame stale chunks are re-baked per frame;
+        the rest keep their previous shadow until their turn. Never-baked chunks always bake.
+        """
+        budget = self.shadow_bakes_per_frame
+        for chunk in chunks:
+            if chunk.shadow_key != sun_key and (budget > 0 or chunk.shadow_key is None):
+                chunk.shadow, chunk.shadow_origin = ShadowRenderer.bake_directional_shadows(
+                    (item.node for item in chunk.items), sun_dir, self.shadow_scale)
+                chunk.shadow_key = sun_key
+                budget -= 1
+            if not chunk.shadow: continue
             
-            for item in self.render_queue:
-                node = item['node']
-                if hasattr(node, 'size_z') and node.size_z > 0.2:
-                    ShadowRenderer.draw_shadow_volume(shadow_surf, self.camera, node, light_pos, scale=shadow_scale)
+            img = chunk.shadow
+            if zoom != 1.0:
+                img = self.sprite_cache.get(img, zoom)
+                if img is None: continue
+            sx, sy = self.camera.world_to_screen(*chunk.shadow_origin)
+            # MAX keeps overlapping shadows at one darkness, like the per-polygon writes
+            shadow_surf.blit(img, (sx * self.shadow_scale, sy * self.shadow_scale), special_flags=pygame.BLEND_RGBA_MAX)
+
+    def _select_shadow_lights(self, lighting_manager):
+        """
+        Visible lights whose radius reaches the view, nearest to the view centre first, capped at
+        max_shadow_lights. Light radii are screen pixels (see LightingManager), i.e. radius / zoom iso units.
+        """
+        left, top, right, bottom = self.view_rect
+        cx, cy = (left + right) / 2, (top + bottom) / 2
+        zoom = self.camera.zoom
+        picked = []
+        for light, ix, iy in lighting_manager.query_lights(self.view_rect, zoom=zoom):
+            r = light.radius / zoom
+            if ix + r < left or ix - r > right or iy + r < top or iy - r > bottom: continue
+            picked.append(((ix - cx) ** 2 + (iy - cy) ** 2, light, ix, iy))
+        picked.sort(key=lambda p: p[0])
+        return picked[:self.max_shadow_lights]
+
+    def _draw_light_shadows(self, shadow_surf, lighting_manager, zoom):
+        """
+        Shadow volumes for up to max_shadow_lights point lights. Static geometry casts from the
+        chunks within the light's radius, clipped to that square; dynamic nodes cast unclipped.
+        A light that moved since last frame projects the static casters directly.
+        A stationary light blits a cached mask of them instead, re-baked only when one of those
+        chunks is re-baked (or the zoom changes its reach). Both paths draw the same shadows.
+        """
+        dynamic = None
+        scale = self.shadow_scale
+        for _, light, ix, iy in self._select_shadow_lights(lighting_manager):
+            light_pos = lighting_manager.get_light_position(light)
+            if light_pos.z < 2: light_pos.z = 3.0
+            pos_key = (light_pos.x, light_pos.y, light_pos.z)
+
+            r = light.radius / self.camera.zoom
+            bounds = (ix - r, iy - r, ix + r, iy + r)
+            chunks = self.chunk_cache.query(bounds)
+            if dynamic is None: dynamic = list(self.render_list.dynamic_nodes())
+
+            entry = self._light_shadows.get(light)
+            if entry is None or entry[0] != pos_key:
+                self._light_shadows[light] = [pos_key, None, None, None]
+                sx, sy = self.camera.world_to_screen(bounds[0], bounds[1])
+                size = 2 * r * self.camera.zoom * scale
+                old_clip = shadow_surf.get_clip()
+                shadow_surf.set_clip(pygame.Rect(sx * scale, sy * scale, size + 1, size + 1).clip(old_clip))
+                nodes = [item.node for chunk in chunks for item in chunk.items]
+                ShadowRenderer.draw_shadow_volumes(shadow_surf, self.camera, nodes, light_pos, scale=scale, min_height=0.2)
+                shadow_surf.set_clip(old_clip)
+                ShadowRenderer.draw_shadow_volumes(shadow_surf, self.camera, dynamic, light_pos, scale=scale, min_height=0.2)
+                continue
+
+            key = (r, tuple((chunk.key, chunk.version) for chunk in chunks))
+            if entry[1] != key:
+                nodes = (item.node for chunk in chunks for item in chunk.items)
+                entry[1] = key
+                entry[2] = ShadowRenderer.bake_shadow_volumes(nodes, light_pos, bounds, scale=scale, min_height=0.2)
+                entry[3] = bounds[:2]
 
-        # Blit all shadows
-        full_shadow = pygame.transform.smoothscale(shadow_surf, self.screen.get_size())
-        self.screen.blit(full_shadow, (0, 0))
+            if entry[2]:
+                img = entry[2]
+                if zoom != 1.0: img = self.sprite_cache.get(img, zoom)
+                if img:
+                    sx, sy = self.camera.world_to_screen(*entry[3])
+                    shadow_surf.blit(img, (sx * scale, sy * scale), special_flags=pygame.BLEND_RGBA_MAX)
 
-        # 3. Sort by Depth
-        self.render_queue.sort(key=lambda x: x['depth'])
+            ShadowRenderer.draw_shadow_volumes(shadow_surf, self.camera, dynamic, light_pos, scale=scale, min_height=0.2)
+
+    def flush(self, services):
+        prof = self.profiler
+        
+        # 1. Query visible chunks (camera and view rect were updated in begin_frame)
+        with prof.scope("renderer.sort"):
+            if self.view_rect is None:
+                self.view_rect = self.camera.get_view_rect(self.screen.get_width(), self.screen.get_height(), self.cull_margin)
+            zoom = self.camera.zoom
+            self.chunk_cache.update()
+            visible_chunks = self.chunk_cache.query(self.view_rect)
+            self.render_list.visible_chunks = visible_chunks
+            # RenderList merges pre-sorted static chunks with depth-bucketed dynamic items
+            draw_items = list(self.render_list)
+        
+        # [Ground Pass] Only the floor chunks under the view are blitted
+        with prof.scope("renderer.ground"):
+            if self.ground_layers:
+                # Flat layers need no cull margin
+                ground_view = self.camera.get_view_rect(self.screen.get_width(), self.screen.get_height())
+                ground_zoom = zoom if zoom == 1.0 else self.sprite_cache.quantize(zoom)
+                for layer in self.ground_layers:
+                    layer.draw_ground(self.screen, self.camera, ground_view, ground_zoom, self.sprite_cache)
         
-        # 4. Draw Objects (Pass 2)
-        from engine.core.math_utils import TILE_HEIGHT
-        for item in self.render_queue:
-            sx, sy = self.camera.world_to_screen(*item['pos'])
-            img = item['sprite']
+        # [Soft Shadow Pass]
+        with prof.scope("renderer.shadows"):
+            shadow_scale = self.shadow_scale
+            shadow_surf = self._get_shadow_surface()
             
-            # [Zoom Scaling]
-            if zoom != 1.0:
-                w = int(img.get_width() * zoom)
-                h = int(img.get_height() * zoom)
-                if w < 1 or h < 1: continue
-                img = pygame.transform.scale(img, (w, h))
+            time_manager = services.get("time")
+            lighting_manager = services.get("lighting")
             
-            # [Pivot Correction]
-            offset_y = (TILE_HEIGHT // 2) * zoom
-            rect = img.get_rect(midbottom=(sx, sy + offset_y))
+            # --- A. Directional Shadows (Sun/Moon) ---
+            # Static geometry uses per-chunk bakes; only dynamic nodes are projected every frame
+            if time_manager and time_manager.current_phase != 'NIGHT':
+                sun = time_manager.sun_direction
+                sun_key = (round(sun.x * SUN_STEPS), round(sun.y * SUN_STEPS))
+                sun_dir = pygame.math.Vector2(sun_key[0] / SUN_STEPS, sun_key[1] / SUN_STEPS)
+                self._draw_chunk_shadows(shadow_surf, visible_chunks, sun_key, sun_dir, zoom)
+                ShadowRenderer.draw_directional_shadows(shadow_surf, self.camera, self.render_list.dynamic_nodes(), sun_dir, scale=shadow_scale)
             
-            # Final Screen Bound Check (Frustum Culling)
-            if self.screen.get_rect().colliderect(rect):
+            # --- B. Point Light Shadows ---
+            if lighting_manager:
+                self._draw_light_shadows(shadow_surf, lighting_manager, zoom)
+
+            # Blit all shadows
+            pygame.transform.smoothscale(shadow_surf, self.screen.get_size(), self._full_shadow)
+            self.screen.blit(self._full_shadow, (0, 0))
+
+        # 3. Draw Objects (Pass 2)
+        with prof.scope("renderer.blit"):
+            # Positions use the same quantized zoom as the cached sprites so chunk edges line up
+            if zoom != 1.0: zoom = self.sprite_cache.quantize(zoom)
+            cam_x, cam_y = self.camera.position
+            off_x, off_y = self.camera.offset
+            offset_y = (TILE_HEIGHT // 2) * zoom
+            screen_rect = self.screen.get_rect()
+            for item in draw_items:
+                sx = (item.x - cam_x) * zoom + off_x
+                sy = (item.y - cam_y) * zoom + off_y
+                img = item.sprite
+                
+                # [Pivot Correction]
+                w, h = img.get_size()
+                if zoom != 1.0:
+                    w, h = int(w * zoom), int(h * zoom)
+                    if w < 1 or h < 1: continue
+                rect = pygame.Rect(0, 0, w, h)
+                rect.midbottom = (sx, sy + offset_y)
+                
+                # Frustum Culling before any scaling work
+                if not screen_rect.colliderect(rect): continue
+                
+                # [Zoom Scaling] Cached per (sprite, zoom level)
+                if zoom != 1.0:
+                    img = self.sprite_cache.get(img, zoom)
+                    if img is None: continue
                 self.screen.blit(img, rect)
@@ -1,14 +1,22 @@
 import pygame
+import numpy as np
 from engine.core.math_utils import IsoMath, TILE_WIDTH, TILE_HEIGHT
 
+# Directional shadows are written (not blended) so overlaps keep a single darkness
+SHADOW_COLOR = (0, 0, 0, 80)
+VOLUME_COLOR = (0, 0, 0, 120)
+
+# Footprint corners (N, E, S, W) of a 1x1 caster, relative to its position
+_CORNERS = np.array([(0.0, -0.5), (0.5, 0.0), (0.0, 0.5), (-0.5, 0.0)])
+
 class ShadowRenderer:
     @staticmethod
-    def draw_directional_shadow(screen, camera, node, light_dir, scale=1.0):
+    def directional_shadow_polygon(node, light_dir):
         """
-        태양/달과 같은 전역 광원에 의한 그림자를 그립니다.
-        light_dir: 빛이 나아가는 방향 벡터
+        태양/달 그림자 폴리곤을 아이소메트릭 월드 좌표로 반환합니다 (카메라 무관).
+        그림자를 드리우지 않는 노드는 None.
         """
-        if not hasattr(node, 'size_z') or node.size_z <= 0.1: return
+        if not hasattr(node, 'size_z') or node.size_z <= 0.1: return None
         
         obj_pos = node.get_global_position()
         w_half = 0.5
@@ -22,23 +30,49 @@ class ShadowRenderer:
             (obj_pos.x - w_half, obj_pos.y, 0)
         ]
         
-        projected_points = []
+        points = []
         for bx, by, bz in base_corners:
             # 높이와 빛 방향에 따른 투영 위치 계산
             px = bx + light_dir.x * h * 2.0
             py = by + light_dir.y * h * 2.0
-            
-            iso_x, iso_y = IsoMath.cart_to_iso(px, py, 0)
+            points.append(IsoMath.cart_to_iso(px, py, 0))
+            # 바닥 지점도 추가하여 폴리곤 연결
+            points.append(IsoMath.cart_to_iso(bx, by, 0))
+        return points
+
+    @staticmethod
+    def draw_directional_shadow(screen, camera, node, light_dir, scale=1.0):
+        """
+        태양/달과 같은 전역 광원에 의한 그림자를 그립니다.
+        light_dir: 빛이 나아가는 방향 벡터
+        """
+        points = ShadowRenderer.directional_shadow_polygon(node, light_dir)
+        if not points: return
+        
+        projected_points = []
+        for iso_x, iso_y in points:
             sx, sy = camera.world_to_screen(iso_x, iso_y)
             projected_points.append((sx * scale, sy * scale))
-            
-            # 바닥 지점도 추가하여 폴리곤 연결
-            b_iso_x, b_iso_y = IsoMath.cart_to_iso(bx, by, 0)
-            bsx, bsy = camera.world_to_screen(b_iso_x, b_iso_y)
-            projected_points.append((bsx * scale, bsy * scale))
+        pygame.draw.polygon(screen, SHADOW_COLOR, projected_points)
 
-        if len(projected_points) > 2:
-            pygame.draw.polygon(screen, (0, 0, 0, 80), projected_points)
+    @staticmethod
+    def bake_directional_shadows(nodes, light_dir, scale=1.0):
+        """
+        여러 정적 노드의 태양 그림자를 하나의 서피스에 굽습니다.
+        Returns (surface, iso_origin) or (None, None). The surface is `scale` pixels per iso unit.
+        """
+        casters = ShadowRenderer.gather_casters(nodes)
+        if casters is None: return None, None
+        polygons = ShadowRenderer.project_directional(casters[0], casters[1], light_dir)
+        
+        left, top = polygons.min(axis=(0, 1))
+        right, bottom = polygons.max(axis=(0, 1))
+        w = int((right - left) * scale) + 2
+        h = int((bottom - top) * scale) + 2
+        
+        surf = pygame.Surface((w, h), pygame.SRCALPHA)
+        ShadowRenderer._draw_polygons(surf, (polygons - (left, top)) * scale, SHADOW_COLOR)
+        return surf, (float(left), float(top))
 
     @staticmethod
     def draw_shadow_volume(screen, camera, node, light_pos, scale=1.0):
@@ -78,4 +112,101 @@ class ShadowRenderer:
             projected_points.append((sx * scale, sy * scale))
             
         if len(projected_points) == 4:
-            pygame.draw.polygon(screen, (0, 0, 0, 120), projected_points)
+            pygame.draw.polygon(screen, VOLUME_COLOR, projected_points)
+
+    # --- Batched (NumPy) path: one vectorized projection for all casters ---
+    @staticmethod
+    def gather_casters(nodes, min_height=0.1):
+        """
+        Collects global positions (N, 3) and heights (N,) of nodes taller than min_height.
+        Returns None if nothing casts a shadow.
+        """
+        data = []
+        for node in nodes:
+            h = getattr(node, 'size_z', 0)
+            if h > min_height:
+                p = node.get_global_position()
+                data.append((p.x, p.y, p.z, h))
+        if not data: return None
+        arr = np.array(data, dtype=np.float64)
+        return arr[:, :3], arr[:, 3]
+
+    @staticmethod
+    def project_directional(positions, heights, light_dir):
+        """
+        Sun shadow polygons in iso world space, shape (N, 8, 2).
+        Same vertex order as directional_shadow_polygon: projected corner, base corner, ...
+        """
+        base = positions[:, None, :2] + _CORNERS[None, :, :] # (N, 4, 2)
+        offset = np.array((light_dir.x, light_dir.y)) * 2.0
+        projected = base + heights[:, None, None] * offset # (N, 4, 2)
+        cart = np.stack((projected, base), axis=2).reshape(len(positions), 8, 2)
+        return ShadowRenderer._cart_to_iso(cart)
+
+    @staticmethod
+    def project_volumes(positions, heights, light_pos):
+        """
+        Point-light shadow quads in iso world space, shape (M, 4, 2), for the casters whose
+        top is below the light. Also returns the boolean mask of those casters.
+        """
+        lx, ly, lz = light_pos.x, light_pos.y, light_pos.z
+        tops = positions[:, 2] + heights
+        mask = lz > tops
+        pos = positions[mask]
+        corners = pos[:, None, :2] + _CORNERS[None, :, :] # (M, 4, 2)
+        # Ray from the light through each top corner, intersected with the ground (z = 0)
+        t = (-lz / (tops[mask] - lz))[:, None, None]
+        ground = np.array((lx, ly)) + (corners - (lx, ly)) * t
+        return ShadowRenderer._cart_to_iso(ground), mask
+
+    @staticmethod
+    def bake_shadow_volumes(nodes, light_pos, bounds, scale=1.0, min_height=0.1):
+        """
+        한 점 광원의 그림자 볼륨을 서피스에 굽습니다 (카메라 무관).
+        bounds: iso-space (left, top, right, bottom) covered by the surface; volumes are clipped to it.
+        Returns the surface, or None if nothing casts a shadow.
+        """
+        casters = ShadowRenderer.gather_casters(nodes, min_height)
+        if casters is None: return None
+        quads, mask = ShadowRenderer.project_volumes(casters[0], casters[1], light_pos)
+        if not mask.any(): return None
+
+        left, top, right, bottom = bounds
+        surf = pygame.Surface((int((right - left) * scale) + 1, int((bottom - top) * scale) + 1), pygame.SRCALPHA)
+        ShadowRenderer._draw_polygons(surf, (quads - (left, top)) * scale, VOLUME_COLOR)
+        return surf
+
+    @staticmethod
+    def to_screen(iso_points, camera, scale=1.0):
+        """Vectorized camera.world_to_screen for an (..., 2) array, then scaled"""
+        cam = np.array((camera.position.x, camera.position.y))
+        off = np.array((camera.offset.x, camera.offset.y))
+        return ((iso_points - cam) * camera.zoom + off) * scale
+
+    @staticmethod
+    def draw_directional_shadows(screen, camera, nodes, light_dir, scale=1.0):
+        """Batched draw_directional_shadow for many nodes"""
+        casters = ShadowRenderer.gather_casters(nodes)
+        if casters is None: return
+        polygons = ShadowRenderer.project_directional(casters[0], casters[1], light_dir)
+        ShadowRenderer._draw_polygons(screen, ShadowRenderer.to_screen(polygons, camera, scale), SHADOW_COLOR)
+
+    @staticmethod
+    def draw_shadow_volumes(screen, camera, nodes, light_pos, scale=1.0, min_height=0.1):
+        """Batched draw_shadow_volume for many nodes"""
+        casters = ShadowRenderer.gather_casters(nodes, min_height)
+        if casters is None: return
+        quads, _ = ShadowRenderer.project_volumes(casters[0], casters[1], light_pos)
+        ShadowRenderer._draw_polygons(screen, ShadowRenderer.to_screen(quads, camera, scale), VOLUME_COLOR)
+
+    @staticmethod
+    def _cart_to_iso(cart):
+        """Vectorized IsoMath.cart_to_iso at z = 0"""
+        x, y = cart[..., 0], cart[..., 1]
+        return np.stack(((x - y) * (TILE_WIDTH / 2), (x + y) * (TILE_HEIGHT / 2)), axis=-1)
+
+    @staticmethod
+    def _draw_polygons(surface, polygons, color):
+        draw_polygon = pygame.draw.polygon
+        for poly in polygons.tolist():
+            draw_polygon(surface, color, poly)
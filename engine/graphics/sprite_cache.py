@@ -0,0 +1,220 @@
+import threading
+import weakref
+from collections import OrderedDict
+import pygame
+
+class ScaledSpriteCache:
+    """
+    LRU cache of zoom-scaled sprites, keyed by source surface and quantized zoom.
+    Source surfaces are held weakly: entries disappear together with their source.
+    Surfaces modified in place must be dropped with discard().
+    """
+    def __init__(self, budget_bytes=128 * 1024 * 1024, zoom_step=1 / 256):
+        self.budget_bytes = budget_bytes
+        self.zoom_step = zoom_step
+        self._entries = OrderedDict() # (id(src), zoom_level): (src_ref, scaled, nbytes)
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, zoom):
+        """Snaps a zoom factor to the cache grid so float noise doesn't cause misses"""
+        return max(1, round(zoom / self.zoom_step)) * self.zoom_step
+
+    def get(self, surface, zoom):
+        """Returns surface scaled by quantize(zoom), or None if it would be smaller than 1px"""
+        level = max(1, round(zoom / self.zoom_step))
+        key = (id(surface), level)
+        entry = self._entries.get(key)
+        if entry and entry[0]() is surface:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        q_zoom = level * self.zoom_step
+        w = int(surface.get_width() * q_zoom)
+        h = int(surface.get_height() * q_zoom)
+        if w < 1 or h < 1: return None
+        scaled = pygame.transform.scale(surface, (w, h))
+
+        nbytes = scaled.get_pitch() * h
+        if nbytes <= self.budget_bytes:
+            if entry: self._remove(key)
+            ref = weakref.ref(surface, lambda _ref, k=key: self._remove(k, _ref))
+            self._entries[key] = (ref, scaled, nbytes)
+            self.bytes_used += nbytes
+            self._evict()
+        return scaled
+
+    def discard(self, surface):
+        """Drops every scaled copy of a source surface"""
+        sid = id(surface)
+        for key in [k for k in self._entries if k[0] == sid]:
+            self._remove(key)
+
+    def set_budget(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes_used,
+            'budget': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def _remove(self, key, ref=None):
+        entry = self._entries.get(key)
+        # A dead ref callback must not remove a newer entry that reused the same id
+        if entry is None or (ref is not None and entry[0] is not ref): return
+        del self._entries[key]
+        self.bytes_used -= entry[2]
+
+    def _evict(self):
+        while self.bytes_used > self.budget_bytes and self._entries:
+            _, (_, _, nbytes) = self._entries.popitem(last=False)
+            self.bytes_used -= nbytes
+            self.evictions += 1
+
+def surface_bytes(surface):
+    """Pixel memory a surface owns (0 for subsurfaces, which share their parent's pixels)"""
+    if surface.get_parent() is not None: return 0
+    return surface.get_pitch() * surface.get_height()
+
+class SurfaceCache:
+    """
+    Keyed LRU cache of shared surfaces (or other assets) under a byte budget.
+    Surface sizes come from surface_bytes(); other values count nbytes given to put().
+    Pinned keys are never evicted. Thread-safe, since map streaming builds nodes off the main thread.
+    """
+    def __init__(self, budget_bytes=64 * 1024 * 1024, max_entries=None):
+        self.budget_bytes = budget_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # key: (value, nbytes), least recently used first
+        self._pins = {} # key: pin count
+        self._lock = threading.RLock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __getitem__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None: raise KeyError(key)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes=None):
+        if nbytes is None:
+            nbytes = surface_bytes(value) if isinstance(value, pygame.Surface) else 0
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old: self.bytes_used -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.bytes_used += nbytes
+            self._evict()
+        return value
+
+    def discard(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry: self.bytes_used -= entry[1]
+
+    def pin(self, key):
+        """Keeps key from being evicted until a matching unpin() (pins are counted)"""
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key):
+        with self._lock:
+            count = self._pins.get(key, 0) - 1
+            if count > 0:
+                self._pins[key] = count
+            else:
+                self._pins.pop(key, None)
+                self._evict()
+
+    def hold(self, owner, key):
+        """Pins key while owner is alive. Calling the returned handle releases it early."""
+        self.pin(key)
+        return weakref.finalize(owner, self.unpin, key)
+
+    def set_budget(self, budget_bytes=None, max_entries=None):
+        """Changes the byte budget and/or entry limit; a limit left as None is unchanged"""
+        with self._lock:
+            if budget_bytes is not None: self.budget_bytes = budget_bytes
+            if max_entries is not None: self.max_entries = max_entries
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def _over_budget(self, used, count):
+        return used > self.budget_bytes or (self.max_entries is not None and count > self.max_entries)
+
+    def _evict(self):
+        # 오래된 순으로 고정되지 않은 항목만 고름 (고정 항목은 순서를 바꾸지 않고 건너뜀)
+        used, count = self.bytes_used, len(self._entries)
+        if not self._over_budget(used, count): return
+        victims = []
+        for key, (_, nbytes) in self._entries.items():
+            if not self._over_budget(used, count): break
+            if key in self._pins: continue
+            victims.append(key)
+            used -= nbytes
+            count -= 1
+        for key in victims:
+            del self._entries[key]
+        self.bytes_used = used
+        self.evictions += len(victims)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes_used,
+                'budget': self.budget_bytes,
+                'pinned': sum(1 for key in self._pins if key in self._entries),
+                'pinned_bytes': sum(self._entries[key][1] for key in self._pins if key in self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0
+            }
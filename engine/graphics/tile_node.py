@@ -5,6 +5,8 @@ from engine.graphics.geometry import IsoGeometry
 from engine.core.math_utils import TILE_WIDTH, TILE_HEIGHT, HEIGHT_SCALE
 
 class TileNode(Node):
+    is_static = True
+
     def __init__(self, tid, x, y, layer=0, size_z=0.1):
         super().__init__(f"Tile_{tid}")
         self.tid = tid
@@ -59,6 +61,7 @@ class TileNode(Node):
                 h_px, 
                 draw_color
             )
+        self.notify_changed()
 
     def get_sprite(self):
         return self.sprite
@@ -1,60 +1,203 @@
 import pygame
+from collections import OrderedDict
 from engine.core.node import Node
 from engine.assets.tile_engine import TileEngine
 from engine.core.math_utils import IsoMath, TILE_WIDTH, TILE_HEIGHT
 
 class TileMap(Node):
-    def __init__(self, name="TileMap"):
+    """
+    Flat floor layer for large maps. Tiles are kept as ids only; the floor is painted
+    into fixed-size chunk surfaces that are built lazily the first time they come into view
+    and evicted LRU once more than max_chunks exist, so memory and draw cost follow the
+    screen size rather than the map size. Drawn by the Renderer under everything else.
+    """
+    def __init__(self, name="TileMap", chunk_size=8, max_chunks=96):
         super().__init__(name)
-        self.map_surface = None
-        self.map_data = None
+        self.tiles = {} # (gx, gy): tile id
         self.width = 0
         self.height = 0
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self._chunks = OrderedDict() # (cx, cy): surface, least recently drawn first
+        self._edited = set() # Built chunk surfaces repainted since the last draw (scaled copies are stale)
 
     def load_from_blocks(self, blocks, width, height):
         """
-        로드된 블록 데이터 리스트에서 바닥 타일만 추출하여 맵을 생성합니다.
+        로드된 블록 데이터 리스트에서 타일 ID만 기록합니다. 청크 서피스는 화면에 보일 때 생성됩니다.
         """
         self.width = width
         self.height = height
-        
-        # 1. 렌더링에 필요한 최종 서피스 크기 계산
-        # 맵의 (0,0)과 (width, height)를 아이소메트릭 좌표로 변환하여 전체 크기를 추정
-        iso_w = (width + height) * TILE_WIDTH // 2
-        iso_h = (width + height) * TILE_HEIGHT // 2 + TILE_HEIGHT # 추가 여유 공간
-        
-        self.map_surface = pygame.Surface((iso_w, iso_h), pygame.SRCALPHA)
-        
-        # 2. 모든 블록을 순회하며 서피스에 그리기
-        #    기존에는 바닥 타일만 필터링했으나, 이제 오브젝트 등도 렌더링하도록 변경
-        for block_data in blocks: # Removed filtering for floor_blocks
-            pos = block_data["pos"]
+        self.tiles = {}
+        for block_data in blocks:
             tid = block_data["tile_id"]
-            
             if tid:
-                # TileEngine에서 텍스처 가져오기
-                tile_tex = TileEngine.create_texture(tid)
-                if tile_tex:
-                    # Cartesian 좌표(pos)를 Isometric 화면 좌표로 변환
-                    screen_x, screen_y = IsoMath.cart_to_iso(pos[0], pos[1])
-                    
-                    # 맵의 (0,0)이 서피스의 중앙 부근에 오도록 오프셋 조정
-                    # 맵의 가장 왼쪽 꼭짓점(0, height)이 (0, iso_h/2) 근처에 오게 됨
-                    offset_x = (height) * TILE_WIDTH // 2
-                    
-                    self.map_surface.blit(tile_tex, (screen_x + offset_x, screen_y))
-        
-        print(f"[TileMap] Generated map surface ({iso_w}x{iso_h}) with {len(blocks)} blocks.") # Updated print statement
-
-    def get_sprite(self):
-        # Renderer가 이 서피스를 직접 사용하도록 반환
-        return self.map_surface
-
-    def _draw(self, services):
-        # Renderer가 get_sprite()를 사용하므로 이 메서드는 비워둘 수 있음
-        # 하지만 직접 그리기를 원할 경우를 대비해 로직 추가 가능
-        if self.visible and self.map_surface:
-            renderer = services.get("renderer")
-            if renderer:
-                # TileMap은 이미 월드 좌표계이므로, 카메라 오프셋만 적용하여 그림
-                renderer.screen.blit(self.map_surface, (-renderer.camera.position.x, -renderer.camera.position.y))
\ No newline at end of file
+                pos = block_data["pos"]
+                self.tiles[(int(pos[0]), int(pos[1]))] = tid
+        self._chunks.clear()
+        self._edited.clear()
+        print(f"[TileMap] Loaded {len(self.tiles)} floor tiles ({width}x{height}, {self.chunk_size}x{self.chunk_size} chunks)")
+
+    def chunk_bounds(self, cx, cy):
+        """Iso-space (left, top, right, bottom) of a chunk's surface"""
+        n = self.chunk_size
+        x0, y0 = cx * n, cy * n
+        left = (x0 - (y0 + n - 1)) * (TILE_WIDTH // 2) - TILE_WIDTH // 2
+        top = (x0 + y0) * (TILE_HEIGHT // 2) - TILE_HEIGHT // 2
+        return left, top, left + n * TILE_WIDTH, top + n * TILE_HEIGHT
+
+    def _tile_blit(self, gx, gy, left, top, tiles=None):
+        """(sprite, chunk-local position) of one tile, or None if the cell is empty"""
+        tid = (self.tiles if tiles is None else tiles).get((gx, gy))
+        if not tid: return None
+        sprite = TileEngine.create_floor_sprite(tid, TileEngine.texture_variant(gx, gy))
+        iso_x, iso_y = IsoMath.cart_to_iso(gx, gy)
+        # 다이아몬드 중심이 타일의 iso 좌표 (Block3D 바닥과 같은 위치)
+        return sprite, (iso_x - TILE_WIDTH // 2 - left, iso_y - TILE_HEIGHT // 2 - top)
+
+    def build_chunk(self, key, tiles=None):
+        """
+        Paints one chunk surface from self.tiles, or from the given {(gx, gy): tid} mapping.
+        With a mapping it touches no TileMap state, so a loader thread can prebuild chunks.
+        """
+        cx, cy = key
+        n = self.chunk_size
+        left, top, right, bottom = self.chunk_bounds(cx, cy)
+        surf = pygame.Surface((right - left, bottom - top), pygame.SRCALPHA)
+        blits = []
+        for gy in range(cy * n, cy * n + n):
+            for gx in range(cx * n, cx * n + n):
+                blit = self._tile_blit(gx, gy, left, top, tiles)
+                if blit: blits.append(blit)
+        surf.blits(blits, doreturn=False)
+        return surf
+
+    def set_tile(self, gx, gy, tid):
+        """
+        Changes one cell (tid None/0 clears it). If its chunk is built, only the tile's
+        diamond is repainted: the rect is cleared and the tiles overlapping it are redrawn
+        in build order, clipped to it. Returns False if the cell already held tid.
+        """
+        key = (gx, gy)
+        if self.tiles.get(key) == (tid or None): return False
+        if tid: self.tiles[key] = tid
+        else: self.tiles.pop(key, None)
+        self.width = max(self.width, gx + 1)
+        self.height = max(self.height, gy + 1)
+
+        n = self.chunk_size
+        chunk_key = (gx // n, gy // n)
+        surf = self._chunks.get(chunk_key)
+        if surf is None: return True # 아직 생성되지 않은 청크: 보일 때 새 데이터로 생성됨
+
+        left, top, _, _ = self.chunk_bounds(*chunk_key)
+        iso_x, iso_y = IsoMath.cart_to_iso(gx, gy)
+        rect = pygame.Rect(iso_x - TILE_WIDTH // 2 - left, iso_y - TILE_HEIGHT // 2 - top, TILE_WIDTH, TILE_HEIGHT)
+        # 같은 청크에서 이 다이아몬드 사각형과 겹치는 타일: 자신과 상하좌우 이웃 (빌드 순서: gy, gx)
+        blits = []
+        for nx, ny in ((gx, gy - 1), (gx - 1, gy), (gx, gy), (gx + 1, gy), (gx, gy + 1)):
+            if (nx // n, ny // n) != chunk_key: continue
+            blit = self._tile_blit(nx, ny, left, top)
+            if blit: blits.append(blit)
+        surf.fill((0, 0, 0, 0), rect)
+        surf.set_clip(rect)
+        surf.blits(blits, doreturn=False)
+        surf.set_clip(None)
+        self._edited.add(chunk_key)
+        return True
+
+    def add_region(self, tiles, chunks=None):
+        """
+        Adds streamed-in tiles ({(gx, gy): tid}) and optionally chunk surfaces already
+        built from them with build_chunk ({(cx, cy): surface}). Other built chunks the tiles
+        fall in are dropped, so they are rebuilt with the new tiles when next drawn.
+        """
+        chunks = chunks or {}
+        self.tiles.update(tiles)
+        n = self.chunk_size
+        for key in {(gx // n, gy // n) for gx, gy in tiles}:
+            if key not in chunks: self._drop_chunk(key)
+        for key, surf in chunks.items():
+            self._chunks[key] = surf
+            self._edited.add(key) # 새 바닥: 다음 프레임은 전체 다시 그리기
+
+    def remove_region(self, x0, y0, w, h):
+        """Drops the tiles in a grid rect and every chunk surface overlapping it (partly covered ones are rebuilt when drawn)"""
+        tiles = self.tiles
+        for gy in range(y0, y0 + h):
+            for gx in range(x0, x0 + w):
+                tiles.pop((gx, gy), None)
+        n = self.chunk_size
+        for cy in range(y0 // n, (y0 + h - 1) // n + 1):
+            for cx in range(x0 // n, (x0 + w - 1) // n + 1):
+                self._drop_chunk((cx, cy))
+
+    def _drop_chunk(self, key):
+        self._chunks.pop(key, None)
+        self._edited.discard(key)
+
+    def has_pending(self):
+        """True if tiles were repainted since the last draw_ground()"""
+        return bool(self._edited)
+
+    def get_chunk(self, key):
+        """Chunk surface, built on first use. Marks it as recently used."""
+        surf = self._chunks.get(key)
+        if surf is None:
+            surf = self._chunks[key] = self.build_chunk(key)
+        else:
+            self._chunks.move_to_end(key)
+        return surf
+
+    def evict(self, keep=0):
+        """Drops least recently drawn chunks beyond max_chunks (never fewer than keep)"""
+        limit = max(self.max_chunks, keep)
+        while len(self._chunks) > limit:
+            self._chunks.popitem(last=False)
+
+    def visible_chunks(self, view):
+        """Keys of the map chunks whose surface intersects an iso-space view rect"""
+        left, top, right, bottom = view
+        min_x, _ = IsoMath.iso_to_cart(left, top)
+        max_x, _ = IsoMath.iso_to_cart(right, bottom)
+        _, min_y = IsoMath.iso_to_cart(right, top)
+        _, max_y = IsoMath.iso_to_cart(left, bottom)
+        n = self.chunk_size
+        kx0, ky0 = max(0, int(min_x // n)), max(0, int(min_y // n))
+        kx1 = min((self.width - 1) // n, int(max_x // n))
+        ky1 = min((self.height - 1) // n, int(max_y // n))
+        keys = []
+        for cy in range(ky0, ky1 + 1):
+            for cx in range(kx0, kx1 + 1):
+                b = self.chunk_bounds(cx, cy)
+                if b[0] < right and b[2] > left and b[1] < bottom and b[3] > top:
+                    keys.append((cx, cy))
+        return keys
+
+    def draw_ground(self, screen, camera, view, zoom, sprite_cache=None):
+        """
+        Blits the chunks under the view (iso rect) to the screen. zoom must already be
+        quantized like the rest of the frame; scaled copies come from sprite_cache.
+        Returns the number of chunks drawn.
+        """
+        if self._edited:
+            # 수정된 청크의 확대/축소 사본은 다시 만들어야 함
+            if sprite_cache:
+                for key in self._edited:
+                    if key in self._chunks: sprite_cache.discard(self._chunks[key])
+            self._edited.clear()
+        if not self.visible or not self.tiles: return 0
+        cam_x, cam_y = camera.position
+        off_x, off_y = camera.offset
+        drawn = 0
+        keys = self.visible_chunks(view)
+        for key in keys:
+            surf = self.get_chunk(key)
+            if zoom != 1.0:
+                surf = sprite_cache.get(surf, zoom) if sprite_cache else None
+                if surf is None: continue
+            left, top, _, _ = self.chunk_bounds(*key)
+            screen.blit(surf, ((left - cam_x) * zoom + off_x, (top - cam_y) * zoom + off_y))
+            drawn += 1
+        # 화면에 보이는 청크는 최대 개수를 넘어도 유지 (줌아웃 시 매 프레임 재생성 방지)
+        self.evict(len(keys))
+        return drawn
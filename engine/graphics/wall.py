@@ -1,9 +1,14 @@
 import pygame
 from engine.core.node import Node
 from engine.assets.tile_engine import TileEngine
+from engine.assets.texture_atlas import TextureAtlas, entry_key
+from engine.graphics.block import BLOCK_CACHE
 from engine.core.math_utils import TILE_WIDTH, TILE_HEIGHT, HEIGHT_SCALE
 
 class WallNode(Node):
+    """Static wall segment; like Block3D, call notify_changed() after moving it"""
+    is_static = True
+
     def __init__(self, name="Wall", size_z=1.8, tile_id=None, color=(120, 120, 120), wall_type="NE"):
         super().__init__(name)
         self.size_z = size_z
@@ -11,9 +16,32 @@ class WallNode(Node):
         self.color = color
         self.wall_type = wall_type # "NE" or "NW"
         self.cached_surf = None
+        self._cache_hold = None
         self._regen_texture()
 
+    def texture_key(self):
+        color = None if self.tile_id in TileEngine.TILE_DATA else tuple(self.color)
+        return (self.size_z, color, self.tile_id, self.wall_type)
+
     def _regen_texture(self):
+        # 같은 모양의 벽은 BLOCK_CACHE의 서피스 하나를 공유 (Block3D 키와 겹치지 않게 'wall' 접두)
+        cache_key = ('wall',) + self.texture_key()
+        old_hold, self._cache_hold = self._cache_hold, BLOCK_CACHE.hold(self, cache_key)
+        if old_hold: old_hold() # 새 키를 고정한 뒤에 이전 키 해제
+        cached = BLOCK_CACHE.get(cache_key)
+        if cached is not None:
+            self.cached_surf = cached
+            self.notify_changed()
+            return
+
+        atlas = TextureAtlas.shared()
+        baked = atlas.get(entry_key('wall', self.texture_key())) if atlas else None
+        if baked is not None:
+            BLOCK_CACHE[cache_key] = baked
+            self.cached_surf = baked
+            self.notify_changed()
+            return
+
         visual_height_px = int(self.size_z * HEIGHT_SCALE)
         
         # 서피스 크기는 벽 전체를 담을 수 있도록 계산
@@ -49,7 +77,9 @@ class WallNode(Node):
             darker_color = tuple(max(0, c - 40) for c in base_color)
             pygame.draw.polygon(surf, darker_color, left_face_poly)
             
+        BLOCK_CACHE[cache_key] = surf
         self.cached_surf = surf
+        self.notify_changed()
 
     def get_sprite(self):
         return self.cached_surf
@@ -26,6 +26,9 @@ class CollisionWorld:
             self.static_grid[coords] = []
         self.static_grid[coords].append(entity)
 
+    def has_static(self, entity):
+        return entity in self.static_grid.get(self._get_grid_coords(entity.get_global_position()), ())
+
     def remove_static(self, entity):
         coords = self._get_grid_coords(entity.get_global_position())
         if coords in self.static_grid and entity in self.static_grid[coords]:
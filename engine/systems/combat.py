@@ -36,8 +36,11 @@ class CombatManager:
         self.projectiles = [p for p in self.projectiles if p.alive]
 
     def draw(self, screen, camera):
+        """Draws projectiles. Returns the screen rects touched."""
+        rects = []
         for p in self.projectiles:
             ix, iy = IsoMath.cart_to_iso(p.pos.x, p.pos.y, p.pos.z)
             sx, sy = camera.world_to_screen(ix, iy)
             # 탄환 그리기 (작은 노란색 점)
-            pygame.draw.circle(screen, (255, 255, 100), (int(sx), int(sy)), 3)
+            rects.append(pygame.draw.circle(screen, (255, 255, 100), (int(sx), int(sy)), 3))
+        return rects
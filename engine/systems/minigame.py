@@ -1,6 +1,7 @@
 import pygame
 import time
 import random
+from engine.ui.text import TextCache
 
 class Minigame:
     def __init__(self, type="MASHING", difficulty=1.0, callback=None):
@@ -80,8 +81,7 @@ class MinigameManager:
             prog_w = int(300 * (self.current_game.progress / self.current_game.target_val))
             pygame.draw.rect(screen, (255, 200, 50), (center_x - 150, center_y - 20, prog_w, 40))
             # Text
-            font = pygame.font.SysFont("arial", 20, bold=True)
-            txt = font.render("MASH [SPACE]!", True, (255, 255, 255))
+            txt = TextCache.shared().render("MASH [SPACE]!", 20, (255, 255, 255), bold=True)
             screen.blit(txt, (center_x - txt.get_width()//2, center_y - 50))
             
         elif self.current_game.type == "TIMING":
@@ -89,6 +89,5 @@ class MinigameManager:
             marker_x = center_x - 150 + int(300 * self.current_game.marker_pos)
             pygame.draw.rect(screen, (255, 50, 50), (marker_x - 2, center_y - 30, 4, 60))
             # Text
-            font = pygame.font.SysFont("arial", 20, bold=True)
-            txt = font.render("HIT [SPACE] AT CENTER!", True, (255, 255, 255))
+            txt = TextCache.shared().render("HIT [SPACE] AT CENTER!", 20, (255, 255, 255), bold=True)
             screen.blit(txt, (center_x - txt.get_width()//2, center_y - 50))
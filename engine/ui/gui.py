@@ -1,20 +1,94 @@
 import pygame
+from engine.ui.text import TextCache
 
 class Control:
     def __init__(self, x=0, y=0, w=100, h=50, tag=""):
-        self.rect = pygame.Rect(x, y, w, h)
-        self.visible = True
+        # 변경 추적: _dirty는 이 서브트리를 다시 그려야 함, _child_dirty는 자손 중 하나가 바뀜
+        self._dirty = True
+        self._child_dirty = False
+        self._rect = pygame.Rect(x, y, w, h)
+        self._visible = True
         self.children = []
         self.parent = None
-        self.is_hovered = False
-        self.is_focused = False
+        self._hovered = False
+        self._focused = False
         self.on_click = None
         self.tag = tag
         self.hit_test = True # [추가] 이벤트 감지 여부 설정
 
+    def mark_dirty(self):
+        """Call after changing how this control looks (or its layout); UICanvas redraws its subtree"""
+        self._dirty = True
+        if self.parent: self.parent._mark_child_dirty()
+
+    def _mark_child_dirty(self):
+        node = self
+        while node is not None and not node._child_dirty:
+            node._child_dirty = True
+            node = node.parent
+
+    def _set_state(self, name, value):
+        if getattr(self, name) != value:
+            setattr(self, name, value)
+            self.mark_dirty()
+
+    @property
+    def rect(self):
+        return self._rect
+
+    @rect.setter
+    def rect(self, value):
+        # 새 Rect를 대입하면 자동으로 다시 그림. 제자리 수정(rect.x = ...) 뒤에는 mark_dirty() 호출
+        value = pygame.Rect(value)
+        if value != self._rect:
+            self._rect = value
+            self.mark_dirty()
+
+    @property
+    def visible(self):
+        return self._visible
+
+    @visible.setter
+    def visible(self, value):
+        self._set_state('_visible', value)
+
+    @property
+    def is_hovered(self):
+        return self._hovered
+
+    @is_hovered.setter
+    def is_hovered(self, value):
+        self._set_state('_hovered', value)
+
+    @property
+    def is_focused(self):
+        return self._focused
+
+    @is_focused.setter
+    def is_focused(self, value):
+        self._set_state('_focused', value)
+
     def add_child(self, child):
         child.parent = self
         self.children.append(child)
+        self._mark_child_dirty()
+
+    def remove_child(self, child):
+        if child in self.children:
+            self.children.remove(child)
+            child.parent = None
+            self._mark_child_dirty()
+
+    def bounds(self, parent_abs_pos=(0, 0)):
+        """Screen rect covering this control and its visible descendants"""
+        rect = self.rect.move(parent_abs_pos)
+        for child in self.children:
+            if child.visible: rect.union_ip(child.bounds(rect.topleft))
+        return rect
+
+    def _clear_dirty(self):
+        self._dirty = self._child_dirty = False
+        for child in self.children: child._clear_dirty()
 
     def handle_event(self, event, parent_abs_pos=(0, 0)):
         if not self.visible: return False
@@ -64,14 +138,32 @@ class Control:
 class Label(Control):
     def __init__(self, text, x, y, size=20, color=(255, 255, 255), **kwargs):
         super().__init__(x, y, 1, 1, **kwargs)
-        self.text = text; self.color = color; self.size = size
-        self.font = pygame.font.SysFont("arial", size, bold=True)
+        self.text = text; self._color = color; self.size = size
         self.hit_test = False # [추가] 라벨은 기본적으로 클릭 이벤트를 받지 않음
         self._render_text()
 
     def _render_text(self):
-        self.surf = self.font.render(self.text, True, self.color)
+        self.surf = TextCache.shared().render(self.text, self.size, self._color, bold=True)
         self.rect.size = self.surf.get_size()
+        self.mark_dirty()
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        if value == self._color: return
+        self._color = value
+        self._render_text()
+
+    def set_text(self, text, color=None):
+        """Changes the text (and color, if given); re-renders only if either actually changed"""
+        text = str(text)
+        if color is None: color = self._color
+        if text == self.text and color == self._color: return
+        self.text = text; self._color = color
+        self._render_text()
 
     def _draw_self(self, screen, services, abs_pos):
         screen.blit(self.surf, abs_pos)
@@ -79,12 +171,46 @@ class Label(Control):
 class Panel(Control):
     def __init__(self, x, y, w, h, color=(50, 50, 60, 200), **kwargs):
         super().__init__(x, y, w, h, **kwargs)
-        self.color = color
+        self._color = color
+
+    @property
+    def color(self):
+        return self._color
+
+    @color.setter
+    def color(self, value):
+        self._set_state('_color', value)
 
     def _draw_self(self, screen, services, abs_pos):
-        pygame.draw.rect(screen, self.color, (*abs_pos, *self.rect.size))
+        # 화면에 직접 그릴 때처럼 불투명하게 (UICanvas의 SRCALPHA 서피스에서는 알파가 그대로 기록됨)
+        pygame.draw.rect(screen, self._color[:3], (*abs_pos, *self.rect.size))
         pygame.draw.rect(screen, (100, 100, 110), (*abs_pos, *self.rect.size), 2)
 
+class ProgressBar(Control):
+    def __init__(self, x, y, w, h, color=(50, 200, 50), bg_color=(30, 30, 35), progress=1.0, **kwargs):
+        super().__init__(x, y, w, h, **kwargs)
+        self.color = color
+        self.bg_color = bg_color
+        self._progress = max(0.0, min(1.0, progress))
+        self.hit_test = False
+
+    @property
+    def progress(self):
+        return self._progress
+
+    @progress.setter
+    def progress(self, value):
+        # 매 프레임 같은 값이 들어와도 다시 그리지 않음
+        self._set_state('_progress', max(0.0, min(1.0, value)))
+
+    def _draw_self(self, screen, services, abs_pos):
+        w, h = self.rect.size
+        pygame.draw.rect(screen, self.bg_color, (*abs_pos, w, h))
+        fill_w = int(w * self._progress)
+        if fill_w > 0:
+            pygame.draw.rect(screen, self.color, (*abs_pos, fill_w, h))
+        pygame.draw.rect(screen, (100, 100, 110), (*abs_pos, w, h), 1)
+
 class Button(Control):
     def __init__(self, text, x, y, w, h, color=(70, 70, 80), on_click=None, **kwargs):
         # Control.__init__ does not accept 'on_click', so we handle it here.
@@ -147,11 +273,13 @@ class LineEdit(Control):
             if event.key == pygame.K_BACKSPACE:
                 self.text = self.text[:-1]
                 self.last_input_time = now
+                self.mark_dirty()
             elif event.key == pygame.K_RETURN:
                 self.is_focused = False
             elif event.unicode.isprintable():
                 self.text += event.unicode
                 self.last_input_time = now
+                self.mark_dirty()
             return True
         return False
 
@@ -160,6 +288,94 @@ class LineEdit(Control):
         pygame.draw.rect(screen, bg, (*abs_pos, *self.rect.size))
         pygame.draw.rect(screen, (120, 120, 130), (*abs_pos, *self.rect.size), 1)
         
-        font = pygame.font.SysFont("arial", 18)
-        text_surf = font.render(self.text, True, (220, 220, 230))
+        text_surf = TextCache.shared().render(self.text, 18, (220, 220, 230))
         screen.blit(text_surf, (abs_pos[0] + 5, abs_pos[1] + self.rect.h / 2 - text_surf.get_height() / 2))
+
+class UICanvas:
+    """
+    Retained-mode drawing of a UI root. Controls are painted into an offscreen surface and
+    only the regions of top-level subtrees that were marked dirty (text, color, rect, hover,
+    focus, progress, add/remove, visibility) or moved are repainted; an unchanged UI costs one
+    blit per top-level control. Changes made in place or without going through a Control
+    property (e.g. control.rect.x = ...) need control.mark_dirty().
+    """
+    def __init__(self, root):
+        self.root = root
+        self.surface = None
+        self._drawn = {} # top-level control: (screen bounds, rect) when last painted
+        self._areas = [] # screen rects blitted each frame
+        self._root_rect = None
+
+    def invalidate(self):
+        self.surface = None
+
+    def pending_rects(self, size):
+        """Screen rects the next draw() will repaint: [] if nothing changed, None for everything"""
+        root = self.root
+        if (self.surface is None or self.surface.get_size() != size or root._dirty
+                or tuple(root.rect) != self._root_rect):
+            return None
+        rects = []
+        origin = root.rect.topleft
+        for child in root.children:
+            drawn = self._drawn.get(child)
+            if drawn is None or child._dirty or child._child_dirty or tuple(child.rect) != drawn[1]:
+                if drawn: rects.append(drawn[0])
+                if child.visible: rects.append(child.bounds(origin))
+        children = set(root.children)
+        rects.extend(drawn[0] for child, drawn in self._drawn.items() if child not in children)
+        return rects
+
+    def draw(self, screen, services):
+        """Repaints what changed and blits the UI onto screen. Returns the screen rects repainted."""
+        size = screen.get_size()
+        rects = self.pending_rects(size)
+        root = self.root
+        if rects is None:
+            if self.surface is None or self.surface.get_size() != size:
+                self.surface = pygame.Surface(size, pygame.SRCALPHA)
+            self.surface.fill((0, 0, 0, 0))
+            root.draw(self.surface, services)
+            rects = [self.surface.get_rect()]
+        elif rects:
+            surf = self.surface
+            origin = root.rect.topleft
+            for rect in rects:
+                # 영역을 비우고, 그 영역에 겹치는 최상위 컨트롤만 잘라서 다시 그림
+                surf.set_clip(rect)
+                surf.fill((0, 0, 0, 0), rect)
+                if root.visible:
+                    root._draw_self(surf, services, origin)
+                    for child in root.children:
+                        if child.visible and child.bounds(origin).colliderect(rect):
+                            child.draw(surf, services, origin)
+            surf.set_clip(None)
+        if rects:
+            origin = root.rect.topleft
+            self._drawn = {child: (child.bounds(origin), tuple(child.rect)) for child in root.children}
+            self._root_rect = tuple(root.rect)
+            root._clear_dirty()
+            # 화면 전체 알파 블릿 대신 컨트롤이 있는 영역만 (겹치는 영역은 합침)
+            areas = [drawn[0] for child, drawn in self._drawn.items() if child.visible]
+            if root.visible and type(root)._draw_self is not Control._draw_self:
+                areas = [root.rect.copy()]
+            self._areas = self._merge(areas)
+        for area in self._areas:
+            screen.blit(self.surface, area, area)
+        return rects
+
+    @staticmethod
+    def _merge(rects):
+        """Overlapping rects merged into their unions, so no pixel is blitted twice"""
+        merged = []
+        for rect in rects:
+            rect = rect.copy()
+            i = 0
+            while i < len(merged):
+                if merged[i].colliderect(rect):
+                    rect.union_ip(merged.pop(i))
+                    i = 0
+                else:
+                    i += 1
+            merged.append(rect)
+        return merged
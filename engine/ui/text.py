@@ -0,0 +1,49 @@
+import pygame
+from engine.graphics.sprite_cache import SurfaceCache
+
+class TextCache:
+    """
+    Shared fonts, keyed by (name, size, bold), and rendered text surfaces, keyed by
+    (text, font, color, antialias), both LRU-evicted. SysFont lookups are slow, so every
+    UI draw path should get its fonts and text from here. Returned surfaces are shared:
+    restore anything you change on them (e.g. set_alpha) after blitting.
+    """
+    _shared = None
+
+    def __init__(self, max_fonts=32, budget_bytes=16 * 1024 * 1024):
+        self.fonts = SurfaceCache(max_entries=max_fonts)
+        self.surfaces = SurfaceCache(budget_bytes)
+
+    @staticmethod
+    def shared():
+        if TextCache._shared is None:
+            TextCache._shared = TextCache()
+        return TextCache._shared
+
+    @staticmethod
+    def load_font(name, size, bold=False):
+        """Uncached font lookup (falls back to pygame's default font)"""
+        try:
+            return pygame.font.SysFont(name, size, bold=bold)
+        except:
+            return pygame.font.Font(None, size)
+
+    def get_font(self, name="arial", size=20, bold=False):
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = TextCache.load_font(name, size, bold)
+        return font
+
+    def render(self, text, size=20, color=(255, 255, 255), name="arial", bold=False, antialias=True):
+        key = (text, name, size, bold, tuple(color), antialias)
+        surf = self.surfaces.get(key)
+        if surf is None:
+            surf = self.surfaces[key] = self.get_font(name, size, bold).render(text, antialias, color)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        return {'fonts': self.fonts.stats(), 'surfaces': self.surfaces.stats()}
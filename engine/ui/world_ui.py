@@ -1,6 +1,7 @@
 import pygame
 import time
 from engine.core.math_utils import IsoMath
+from engine.ui.text import TextCache
 
 class Popup:
     def __init__(self, text, x, y, z, color=(255, 255, 255), duration=1.5):
@@ -30,7 +31,10 @@ class WorldPopupManager:
         self.popups = [p for p in self.popups if p.update(dt)]
 
     def draw(self, screen, camera):
-        font = pygame.font.SysFont("arial", 14, bold=True)
+        """Draws floating texts. Returns the screen rects touched."""
+        rects = []
+        if not self.popups: return rects
+        text = TextCache.shared()
         for p in self.popups:
             ix, iy = IsoMath.cart_to_iso(p.pos[0], p.pos[1], p.pos[2])
             sx, sy = camera.world_to_screen(ix, iy)
@@ -39,6 +43,8 @@ class WorldPopupManager:
             elapsed = time.time() - p.start_time
             alpha = int(255 * (1.0 - (elapsed / p.duration)))
             
-            txt_surf = font.render(p.text, True, p.color)
+            txt_surf = text.render(p.text, 14, p.color, bold=True)
             txt_surf.set_alpha(alpha)
-            screen.blit(txt_surf, (sx - txt_surf.get_width() // 2, sy))
+            rects.append(screen.blit(txt_surf, (sx - txt_surf.get_width() // 2, sy)))
+            txt_surf.set_alpha(255) # 캐시된 서피스는 공유되므로 원래대로
+        return rects
@@ -6,9 +6,13 @@ from engine.core.math_utils import IsoMath, TILE_WIDTH, TILE_HEIGHT
 from engine.graphics.tilemap import TileMap
 from engine.graphics.wall import WallNode
 from engine.graphics.block import Block3D
+from engine.assets.map_loader import MapLoader
 from engine.ui.gui import Panel, Button, Label, LineEdit, Control
 
 class EditorScene(Node):
+    MAP_PATH = "assets/maps/new_edge_map.map"
+    LEGACY_MAP_PATH = "assets/maps/new_edge_map.json"
+
     def __init__(self):
         super().__init__("EditorScene")
         self.is_initialized = False
@@ -111,9 +115,20 @@ class EditorScene(Node):
         self.camera.position.y = map_center_y
 
     def _load_map(self):
-        path = "assets/maps/new_edge_map.json"
+        # 바이너리 맵 우선, 예전 JSON 맵도 읽음
+        path = next((p for p in (self.MAP_PATH, self.LEGACY_MAP_PATH) if os.path.exists(p)), self.MAP_PATH)
         if os.path.exists(path):
-            with open(path, "r") as f: self.map_data = json.load(f)
+            data = MapLoader.load_map_data(path)
+            # 편집은 셀 단위 dict 기준: blocks {(x, y): {...}}, walls {"(x, y)": [types]}
+            blocks = data.get("blocks", [])
+            if isinstance(blocks, list):
+                data["blocks"] = {(int(b["pos"][0]), int(b["pos"][1])): {"tile_id": b["tile_id"]} for b in blocks}
+            walls = {}
+            for pos_str, wall_types in data.get("walls", {}).items():
+                x, y = map(int, pos_str.strip("()[]").split(","))
+                walls[self._wall_key(x, y)] = list(wall_types)
+            data["walls"] = walls
+            self.map_data = data
             self.is_initialized = True
             self._setup_ui()
             self._rebuild_map_visuals()
@@ -226,16 +241,8 @@ class EditorScene(Node):
             pass
 
     def _rebuild_map_visuals(self):
-        print("\n--- DEBUG: _rebuild_map_visuals called ---") # Debug print statement to confirm execution
-        for node in list(self.wall_nodes.values()): # Only iterate wall_nodes now
-            if node.parent: self.remove_child(node)
-        self.wall_nodes.clear()
-        
-        if "walls" in self.map_data:
-            for pos_str, wall_types in self.map_data["walls"].items():
-                pos = tuple(map(int, pos_str.strip("()[]").split(",")))
-                for wall_type in wall_types:
-                    self._add_wall_node(pos[0], pos[1], wall_type)
+        """Full sync after a new map or a load. Brush edits use _paint_floor/_set_cell_walls instead."""
+        self._sync_walls()
 
         blocks_for_tilemap = []
         if "blocks" in self.map_data:
@@ -246,16 +253,78 @@ class EditorScene(Node):
 
         print(f"Rebuilt visuals: {len(self.wall_nodes)} walls.")
 
+    @staticmethod
+    def _wall_key(x, y):
+        return f"({x}, {y})"
+
+    def _sync_walls(self, cells=None):
+        """
+        Diffs map_data["walls"] against the existing WallNodes and only adds/removes the
+        difference. cells limits the diff to those (x, y) cells; None checks the whole map.
+        """
+        walls = self.map_data.get("walls", {})
+        if cells is None:
+            wanted = set()
+            for pos_str, wall_types in walls.items():
+                x, y = map(int, pos_str.strip("()[]").split(","))
+                wanted.update((x, y, t) for t in wall_types)
+            current = set(self.wall_nodes)
+        else:
+            wanted = {(x, y, t) for x, y in cells for t in walls.get(self._wall_key(x, y), [])}
+            current = {(x, y, t) for x, y in cells for t in ("NE", "NW") if (x, y, t) in self.wall_nodes}
+        for key in current - wanted:
+            node = self.wall_nodes.pop(key)
+            if node.parent: self.remove_child(node)
+        for x, y, wall_type in wanted - current:
+            self._add_wall_node(x, y, wall_type)
+
+    def _add_wall_node(self, x, y, wall_type):
+        # 맵 포맷은 벽 종류만 저장하므로 PxAnicScene과 같은 기본 벽돌 ID 사용
+        wall = WallNode(name=f"Wall_{x}_{y}_{wall_type}", tile_id=212000000, wall_type=wall_type)
+        wall.position.x, wall.position.y = x, y
+        self.add_child(wall)
+        self.wall_nodes[(x, y, wall_type)] = wall
+
+    def _handle_map_click(self, button):
+        """Brush stroke on the cell under the mouse: left paints, right erases. Cost is per cell."""
+        grid_pos = self.services["input"].get_mouse_grid_pos(self.camera)
+        gx, gy = round(grid_pos.x), round(grid_pos.y)
+        if not (0 <= gx < self.map_data["width"] and 0 <= gy < self.map_data["height"]): return
+
+        if self.mode == "FLOOR":
+            self._paint_floor(gx, gy, self.brush_tile_id if button == 1 else None)
+        elif self.mode == "WALL":
+            # 타일 중심 기준으로 더 가까운 모서리: NE는 y가 작은 쪽, NW는 x가 작은 쪽
+            wall_type = "NE" if grid_pos.y - gy <= grid_pos.x - gx else "NW"
+            self._set_cell_walls(gx, gy, wall_type, button == 1)
+
+    def _paint_floor(self, gx, gy, tid):
+        blocks = self.map_data["blocks"]
+        if tid: blocks[(gx, gy)] = {"tile_id": tid}
+        else: blocks.pop((gx, gy), None)
+        self.tile_map.set_tile(gx, gy, tid)
+
+    def _set_cell_walls(self, gx, gy, wall_type, present):
+        walls = self.map_data.setdefault("walls", {})
+        key = self._wall_key(gx, gy)
+        types = walls.get(key, [])
+        if (wall_type in types) == present: return
+        types = types + [wall_type] if present else [t for t in types if t != wall_type]
+        if types: walls[key] = types
+        else: walls.pop(key, None)
+        self._sync_walls([(gx, gy)])
+
     def _save_map(self):
-        path = "assets/maps/new_edge_map.json"
+        path = self.MAP_PATH
         blocks_list = []
         for (gx, gy), data in self.map_data["blocks"].items():
             blocks_list.append({"pos": [gx, gy, 0], "tile_id": data["tile_id"]})
-        self.map_data["blocks"] = blocks_list
+        # map_data는 편집용 dict 그대로 두고 저장용 사본만 리스트로 변환
+        data = dict(self.map_data, blocks=blocks_list)
 
-        with open(path, "w") as f: json.dump(self.map_data, f, indent=4)
+        MapLoader.save_map_data(path, data)
         print(f"Saved map to {path}")
 
     def draw_gizmos(self, screen, camera):
-        if not self.is_initialized: return
-        w, h = self.map_data["width"], self.map_data["height"]
\ No newline at end of file
+        # Draws nothing yet; an empty list keeps dirty-rect mode from redrawing the whole screen
+        return []
@@ -1,8 +1,10 @@
+import os
 import pygame
 from engine.core.app import App
 from engine.core.node import Node
 from engine.physics.collision import CollisionWorld
 from engine.assets.map_loader import MapLoader
+from engine.assets.world_streamer import WorldStreamer
 from engine.graphics.tilemap import TileMap
 from engine.graphics.block import Block3D
 from engine.graphics.wall import WallNode # WallNode 임포트
@@ -14,6 +16,11 @@ from engine.ui.gui import Control, Label, Panel, ProgressBar
 from engine.graphics.fog_of_war import FogOfWar
 
 class PxAnicScene(Node):
+    MAP_PATH = "engine/assets/pxanic_edge_map.json"
+    # 바이너리 맵이 있으면 전체를 올리지 않고 플레이어 주변 청크만 스트리밍
+    STREAM_MAP_PATH = "engine/assets/pxanic_edge_map.map"
+    STREAM_RADIUS = 2 # 청크 단위
+
     def _ready(self, services):
         print("--- PxANIC! Zomboid Style Renderer ---")
         app = services.get("app")
@@ -22,6 +29,8 @@ class PxAnicScene(Node):
         self.player = None
         self.move_target = None 
         self.block_grid = {}
+        self.step_timer = 0.0
+        self.streamer = None
 
         # 1. 시야 시스템(FogOfWar) 추가
         self.fog_of_war = FogOfWar(name="FogOfWar")
@@ -29,8 +38,14 @@ class PxAnicScene(Node):
         self.add_child(self.fog_of_war)
 
         # 2. 맵 로드 및 노드 생성 (경계 기반)
-        map_path = "engine/assets/pxanic_edge_map.json"
-        map_data = MapLoader.load_map_data(map_path)
+        map_data = None
+        if os.path.exists(self.STREAM_MAP_PATH):
+            floor_map = TileMap(name="FloorMap")
+            self.add_child(floor_map)
+            self.streamer = WorldStreamer(self.STREAM_MAP_PATH, self, floor_map, self.collision_world,
+                                          self.block_grid, radius=self.STREAM_RADIUS)
+        else:
+            map_data = MapLoader.load_map_data(self.MAP_PATH)
         
         if map_data:
             metadata = {
@@ -81,6 +96,8 @@ class PxAnicScene(Node):
         self.player.status.hp, self.player.status.max_hp = 8, 10
         self.player.status.ap, self.player.status.max_ap = 10, 10
         self.add_child(self.player)
+        if self.streamer:
+            self.streamer.preload(self.player.position.x, self.player.position.y)
         self.player_light = LightSource("PlayerLight", radius=250)
         self.player.add_child(self.player_light)
         
@@ -141,6 +158,11 @@ class PxAnicScene(Node):
             else: 
                 popups.add_popup("Nothing", gx, gy, block.position.z, (150, 150, 150), 0.5)
 
+    def _exit_tree(self):
+        if self.streamer:
+            self.streamer.stop()
+            self.streamer = None
+
     def _toggle_door(self, block, gx, gy):
         sid = list(str(block.tile_id))
         if len(sid) < 9: return
@@ -156,6 +178,9 @@ class PxAnicScene(Node):
         if new_id in TileEngine.TILE_DATA:
             block.color = TileEngine.TILE_DATA[new_id]['color']
         block._regen_texture()
+        if self.streamer:
+            # 청크가 내려갔다 다시 올라와도 열린/닫힌 상태가 유지되도록
+            self.streamer.mark_modified(gx, gy)
 
     def update(self, dt, services):
         time_manager = services["time"]; lighting_manager = services["lighting"]
@@ -190,6 +215,12 @@ class PxAnicScene(Node):
                 noise_radius = 10 if is_running else 5
                 interaction.emit_noise(self.player.position.x, self.player.position.y, noise_radius)
                 
+                # 발걸음 먼지
+                self.step_timer -= dt
+                if self.step_timer <= 0:
+                    services["particles"].emit_dust(self.player.position.x, self.player.position.y, 6 if is_running else 3)
+                    self.step_timer = 0.18 if is_running else 0.28
+                
                 if pygame.time.get_ticks() % 15 == 0:
                     popups.add_popup("", self.player.position.x, self.player.position.y, 
                                      0, (255, 255, 255, 100), 0.5)
@@ -205,6 +236,10 @@ class PxAnicScene(Node):
         elif self.player:
             self.player.is_moving = False
 
+        # 플레이어 주변 청크 스트리밍
+        if self.streamer and self.player:
+            self.streamer.update(self.player.position.x, self.player.position.y)
+
         # FOV 및 카메라 업데이트
         if self.player:
             ix, iy = IsoMath.cart_to_iso(self.player.position.x, self.player.position.y, 0)
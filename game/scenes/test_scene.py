@@ -144,10 +144,10 @@ class TestScene(Node):
         if self.camera_follow and self.player:
             ix, iy = IsoMath.cart_to_iso(self.player.position.x, self.player.position.y, 0)
             renderer.camera.follow(ix, iy)
-            self.lbl_cam.set_text("Cam: Following"); self.lbl_cam.color = (100, 255, 100)
+            self.lbl_cam.set_text("Cam: Following", color=(100, 255, 100))
         else:
             renderer.camera.stop_following()
-            self.lbl_cam.set_text("Cam: Free"); self.lbl_cam.color = (255, 100, 100)
+            self.lbl_cam.set_text("Cam: Free", color=(255, 100, 100))
     
     def _update_environment(self, time_manager, lighting_manager, state_str):
         self.lbl_time.set_text(f"Day {time_manager.day_count} - {int(time_manager.phase_timer)}s")
@@ -105,6 +105,8 @@ class GameEntity(AnimatedSprite):
             spawn_pos = self.position.copy()
             spawn_pos.z += 1.5
             combat.spawn_bullet(spawn_pos, direction, 20, self.client_id)
+            particles = services.get("particles")
+            if particles: particles.emit_muzzle_flash(spawn_pos, direction)
             # 소음 발생
             services["interaction"].emit_noise(self.position.x, self.position.y, 15, (255, 100, 50))
             return True
@@ -0,0 +1,70 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from engine.core.math_utils import IsoMath, TILE_WIDTH, TILE_HEIGHT
+from engine.graphics.block import Block3D
+from engine.graphics.chunk_cache import ChunkCache
+from engine.graphics.render_list import RenderList
+
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+def build(blocks, x, y):
+    """Chunk cache holding the given (x, y, size_z) blocks, plus one dynamic sprite at (x, y)"""
+    cache = ChunkCache()
+    nodes = []
+    for bx, by, size_z in blocks:
+        b = Block3D(f"B{bx}_{by}", size_z=size_z)
+        b.position.x, b.position.y = bx, by
+        cache.add(b)
+        nodes.append(b)
+    cache.update()
+    render_list = RenderList(cache)
+    render_list.visible_chunks = cache.query((-10000, -10000, 10000, 10000))
+    sprite = pygame.Surface((TILE_WIDTH, TILE_HEIGHT + 40), pygame.SRCALPHA)
+    iso_x, iso_y = IsoMath.cart_to_iso(x, y)
+    render_list.insert("entity", sprite, x, y, iso_x, iso_y, IsoMath.get_depth(x, y))
+    return render_list, nodes
+
+def draw_order(render_list):
+    """Nodes in paint order; an unsplit chunk stands for all of its nodes"""
+    units = {id(c.unit): c for c in render_list.visible_chunks}
+    order = []
+    for item in render_list:
+        chunk = units.get(id(item))
+        if chunk:
+            order.extend(i.node for i in chunk.items)
+        else:
+            order.append(item.node)
+    return order
+
+def test_entity_at_chunk_corner_drawn_over_block_behind():
+    # Block (16, 15) sits in the next chunk band but is behind the entity (depth 310 < 318)
+    render_list, (block,) = build([(16, 15, 1.0)], 15.9, 15.9)
+    order = draw_order(render_list)
+    assert order.index(block) < order.index("entity")
+
+def test_entity_at_chunk_corner_drawn_under_block_in_front():
+    render_list, (behind, front) = build([(16, 15, 1.0), (16, 16, 1.0)], 15.9, 15.9)
+    order = draw_order(render_list)
+    assert order.index(behind) < order.index("entity") < order.index(front)
+
+def test_entity_on_chunk_edge_between_blocks_of_two_bands():
+    # (16, 4) is behind the entity in the next chunk, (15, 6) in front of it in its own chunk
+    render_list, (behind, front) = build([(16, 4, 2.0), (15, 6, 2.0)], 15.6, 5.2)
+    order = draw_order(render_list)
+    assert order.index(behind) < order.index("entity") < order.index(front)
+
+def test_entity_in_front_of_tall_block_in_later_band():
+    # The tall block (16, 14) hangs over the entity's chunk from band 1 but stands behind it
+    render_list, (block,) = build([(16, 14, 3.0)], 15.5, 14.9)
+    order = draw_order(render_list)
+    assert order.index(block) < order.index("entity")
+
+def test_static_overlap_follows_band_order():
+    # Overlapping blocks in neighbouring chunks: the one in the later band is the one in front
+    render_list, (behind, front) = build([(15, 15, 3.0), (16, 15, 3.0)], 2.0, 2.0)
+    order = draw_order(render_list)
+    assert order.index(behind) < order.index(front)